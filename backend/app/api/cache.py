@@ -0,0 +1,257 @@
+"""
+Response Cache - 路由回應快取
+
+熱門端點 (公司目錄、排行榜、同步狀態、列表首頁) 只在同步後改變。
+`response_cache` 將路由回應序列化後的 bytes 存入行程內 LRU，快取鍵為
+(路徑, 正規化查詢參數, 資料世代)；命中時直接回傳 bytes，不進入 threadpool、
+不查詢 SQLite。資料世代改變時整個快取清空。
+
+各項目另保存 brotli / gzip 預壓縮版本 (依客戶端 Accept-Encoding 首次需要時壓縮)，
+之後的命中直接回傳壓縮後的 bytes，不必每次重新壓縮。
+
+用法 (放在 @router.get 與函式之間):
+
+    @router.get("/catalog", response_model=List[CompanyCatalogItem])
+    @response_cache()
+    def read_company_catalog(session: SessionDep): ...
+"""
+import functools
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.middleware.compression import compress, select_encoding
+from app.middleware.profiling import measure_serialization
+from app.services.generation_service import get_generation
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, Tuple[Tuple[str, Tuple[str, ...]], ...]]
+
+
+class CacheEntry:
+    """序列化後的回應與其預壓縮版本 ({編碼: bytes})"""
+    __slots__ = ("body", "variants")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.variants: Dict[str, bytes] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(data) for data in self.variants.values())
+
+
+class ResponseCache:
+    """以 bytes 總量 (含預壓縮版本) 與筆數為上限的 LRU"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._generation: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey, generation: int) -> Optional[CacheEntry]:
+        with self._lock:
+            if generation != self._generation:
+                self._clear_locked()
+                self._generation = generation
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: CacheKey, generation: int, body: bytes) -> CacheEntry:
+        entry = CacheEntry(body)
+        if len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            # 計算期間若世代已變，結果可能是舊資料，不寫入
+            if generation != self._generation:
+                return entry
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._evict_locked()
+        return entry
+
+    def add_variant(self, key: CacheKey, generation: int, entry: CacheEntry, encoding: str, data: bytes):
+        """保存項目的預壓縮版本 (項目已被淘汰或世代已變時只更新 entry 本身)"""
+        with self._lock:
+            if encoding in entry.variants:
+                return
+            entry.variants[encoding] = data
+            if generation == self._generation and self._entries.get(key) is entry:
+                self._bytes += len(data)
+                self._evict_locked()
+
+    def _evict_locked(self):
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    def clear(self):
+        with self._lock:
+            self._clear_locked()
+
+    def _clear_locked(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+
+cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+)
+
+
+def make_cache_key(request: Request) -> CacheKey:
+    """
+    正規化快取鍵: 查詢參數依名稱排序，同名參數保留原順序 (sort=a&sort=b 與
+    sort=b&sort=a 意義不同)。
+    """
+    params: Dict[str, List[str]] = {}
+    for name, value in request.query_params.multi_items():
+        params.setdefault(name, []).append(value)
+    return request.url.path, tuple((name, tuple(params[name])) for name in sorted(params))
+
+
+def is_leading_page(request: Request) -> bool:
+    """列表端點只快取前幾頁 (RESPONSE_CACHE_MAX_PAGE)，避免深分頁擠掉熱門項目"""
+    if "cursor" in request.query_params:
+        return False
+    try:
+        page = int(request.query_params.get("page", 1))
+    except ValueError:
+        return False
+    return page <= settings.RESPONSE_CACHE_MAX_PAGE
+
+
+_adapters: Dict[int, TypeAdapter] = {}
+
+
+def _serialize(request: Request, content) -> bytes:
+    """依路由的 response_model 序列化 (與 FastAPI 的輸出一致)"""
+    with measure_serialization():
+        return _serialize_content(request, content)
+
+
+def _serialize_content(request: Request, content) -> bytes:
+    route = request.scope.get("route")
+    response_model = getattr(route, "response_model", None)
+    if response_model is None:
+        return TypeAdapter(type(content)).dump_json(content)
+    adapter = _adapters.get(id(route))
+    if adapter is None:
+        adapter = _adapters[id(route)] = TypeAdapter(response_model)
+    value = adapter.validate_python(content, from_attributes=True)
+    return adapter.dump_json(value, by_alias=True)
+
+
+def response_cache(condition: Optional[Callable[[Request], bool]] = None):
+    """
+    路由回應快取 decorator。
+
+    Args:
+        condition: 判斷此請求是否可快取 (e.g. is_leading_page)；None 表示全部快取
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        request_param = next(
+            (p.name for p in signature.parameters.values() if p.annotation is Request), None
+        )
+        is_coroutine = inspect.iscoroutinefunction(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs[request_param] if request_param else kwargs.pop("request")
+            if condition is not None and not condition(request):
+                return await _call(func, is_coroutine, args, kwargs)
+
+            generation, _ = get_generation()
+            key = make_cache_key(request)
+            entry = cache.get(key, generation)
+            if entry is not None:
+                return await _cached_response(request, key, generation, entry, "HIT")
+
+            content = await _call(func, is_coroutine, args, kwargs)
+            if isinstance(content, Response):
+                # 已序列化的 JSON 回應 (e.g. fields= 投影) 直接快取其 body
+                if content.status_code != 200 or content.media_type != "application/json":
+                    return content
+                body = bytes(content.body)
+            else:
+                body = _serialize(request, content)
+            entry = cache.set(key, generation, body)
+            return await _cached_response(request, key, generation, entry, "MISS")
+
+        if request_param is None:
+            # 讓 FastAPI 注入 Request
+            params = list(signature.parameters.values())
+            params.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+            wrapper.__signature__ = signature.replace(parameters=params)
+        return wrapper
+
+    return decorator
+
+
+async def _cached_response(request: Request, key: CacheKey, generation: int, entry: CacheEntry, status: str) -> Response:
+    """依 Accept-Encoding 回傳原始或預壓縮的 bytes (預壓縮版本首次需要時建立)"""
+    headers = {"X-Cache": status}
+    encoding = select_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is None or len(entry.body) < settings.COMPRESSION_MINIMUM_SIZE:
+        # 未壓縮的回應由 CompressionMiddleware 加上 Vary
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    data = entry.variants.get(encoding)
+    if data is None:
+        data = await run_in_threadpool(compress, entry.body, encoding, True)
+        cache.add_variant(key, generation, entry, encoding, data)
+    headers["Content-Encoding"] = encoding
+    headers["Vary"] = "Accept-Encoding"
+    return Response(content=data, media_type="application/json", headers=headers)
+
+
+async def _call(func, is_coroutine: bool, args, kwargs):
+    if is_coroutine:
+        return await func(*args, **kwargs)
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
+async def warm_up(app, paths: List[str]):
+    """啟動時預先請求設定的路徑，填入快取"""
+    if not paths:
+        return
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+        for path in paths:
+            try:
+                response = await client.get(path)
+                logger.info(f"Cache warm-up {path}: {response.status_code}")
+            except Exception as e:
+                logger.error(f"Cache warm-up failed for {path}: {e}")
@@ -1,6 +1,7 @@
 from typing import Annotated
 from fastapi import Depends
 from sqlmodel import Session
-from app.db.session import get_session
+from app.db.session import get_session, get_slow_query_session
 
 SessionDep = Annotated[Session, Depends(get_session)]
+SlowQuerySessionDep = Annotated[Session, Depends(get_slow_query_session)]
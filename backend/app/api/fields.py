@@ -0,0 +1,65 @@
+"""
+Sparse fieldsets - `fields=` 欄位投影的回應組裝
+
+列表端點指定 fields 時，paginate 只 SELECT 指定欄位並回傳 dict；
+這些部分物件無法通過路由 response_model 的驗證，因此直接序列化為 JSONResponse
+(response_cache 同樣會快取這類回應)。
+
+    GET /api/v1/violations?fields=company_code,penalty_date,fine_amount
+"""
+import json
+from typing import List, Optional, Sequence
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.db.pagination import InvalidFieldsError, split_fields
+from app.schemas.company import PaginatedResponse
+
+FIELDS_DESCRIPTION = "只回傳指定欄位 (可重複或以逗號分隔，e.g. fields=company_code,fine_amount)"
+
+
+def paginated_response(
+    items: list,
+    fields: Optional[Sequence[str]],
+    page: int,
+    size: int,
+    total: Optional[int] = None,
+    total_pages: Optional[int] = None,
+    next_cursor: Optional[str] = None,
+):
+    """未指定 fields 時回傳 PaginatedResponse (經 response_model 驗證)，否則直接輸出投影後的 dict"""
+    projected = bool(split_fields(fields))
+    response = PaginatedResponse(
+        items=[] if projected else items,
+        total=total,
+        page=page,
+        size=size,
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+    )
+    if not projected:
+        return response
+    content = response.model_dump()
+    content["items"] = items
+    return JSONResponse(content=jsonable_encoder(content))
+
+
+def parse_document_fields(schema: type[BaseModel], fields: Optional[Sequence[str]]) -> Optional[List[str]]:
+    """解析文件型回應 (e.g. profile) 的頂層欄位，只接受 schema 的欄位"""
+    names = split_fields(fields)
+    if not names:
+        return None
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def project_document(document: bytes, fields: List[str]) -> bytes:
+    """只保留 JSON 文件的指定頂層欄位"""
+    data = json.loads(document)
+    return json.dumps(
+        {name: data[name] for name in fields if name in data}, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.routes import companies, violations, mops, aggregation, system, environmental_violations, leaderboard
+from app.api.routes import companies, violations, mops, aggregation, system, environmental_violations, leaderboard, search, industries, analytics
 
 api_router = APIRouter()
 
@@ -12,3 +12,6 @@ api_router.include_router(environmental_violations.router, prefix="/environmenta
 api_router.include_router(mops.router, prefix="/mops", tags=["mops"])
 api_router.include_router(system.router, prefix="/system", tags=["system"])
 api_router.include_router(leaderboard.router, prefix="/leaderboards", tags=["leaderboards"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(industries.router, prefix="/industries", tags=["industries"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
@@ -0,0 +1,43 @@
+"""
+Fast JSON Response - 大型回應的序列化捷徑
+
+FastAPI 預設流程會以 response_model 再驗證一次路由回傳值，然後用 jsonable_encoder +
+標準庫 json 編碼。對已經驗證過 (或由 SQL 直接組成) 的大型回應 (公司目錄、排行榜、
+yearly-summary include=all) 這兩步都是多餘的。
+
+路由回傳 FastJSONResponse 時 FastAPI 不再套用 response_model (仍保留於 OpenAPI 文件)：
+- pydantic 模型: 以 model_dump_json 直接序列化 (不重新驗證)
+- dict / list 等原始資料: 以 orjson 編碼 (date / datetime 原生支援，巢狀模型經 default 轉換)
+
+僅用於輸出格式已與 response_model 一致的路由 (opt-in)。
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.middleware.profiling import measure_serialization
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """序列化為 JSON bytes (與 FastJSONResponse 相同)"""
+    with measure_serialization():
+        if isinstance(content, BaseModel):
+            return content.model_dump_json(by_alias=True).encode("utf-8")
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
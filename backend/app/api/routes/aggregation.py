@@ -2,109 +2,156 @@
 公司聚合 API Routes
 
 Endpoints:
+- GET /companies/profiles - 多家公司完整資料 (比較 / 批次)
 - GET /companies/{company_code}/profile - 單一公司完整資料
+- GET /companies/{company_code}/violations - 單一公司勞動違規紀錄 (游標分頁)
+- GET /companies/{company_code}/environmental-violations - 單一公司環境違規紀錄 (游標分頁)
 - GET /companies/yearly-summary - 公司年度摘要列表
 """
+import json
 import math
 from typing import List, Optional
-from datetime import date
 
-from fastapi import APIRouter, Query, HTTPException
-from sqlmodel import select, col, func
-from sqlalchemy import extract, case, literal
+from fastapi import APIRouter, Query, HTTPException, Response
+from sqlmodel import select
 
 from app.api.deps import SessionDep
+from app.api.fields import FIELDS_DESCRIPTION, paginated_response, parse_document_fields, project_document
+from app.api.responses import FastJSONResponse
+from app.core.config import settings
+from app.db.pagination import paginate, split_fields
 from app.models.company import Company
 from app.models.violation import Violation
-from app.models.employee_benefit import EmployeeBenefit
-from app.models.non_manager_salary import NonManagerSalary
-from app.models.welfare_policy import WelfarePolicy
-from app.models.salary_adjustment import SalaryAdjustment
 from app.models.environmental_violation import EnvironmentalViolation
 from app.schemas.aggregation import (
     CompanyProfileResponse,
+    CompanyProfilesResponse,
     YearlySummaryItem,
     YearlySummaryResponse,
 )
-from app.schemas.company import CompanyResponse
+from app.schemas.company import PaginatedResponse
+from app.schemas.environmental_violation import EnvironmentalViolationPublic
 from app.schemas.violation import ViolationPublic
-from app.schemas.mops import (
-    EmployeeBenefitResponse,
-    NonManagerSalaryResponse,
-    WelfarePolicyResponse,
-    SalaryAdjustmentResponse,
-)
+from app.services.profile_service import ProfileService
+from app.services.yearly_summary_service import YearlySummaryService
 
 router = APIRouter()
 
 
 # ========== Company Profile ==========
+@router.get("/profiles", response_model=CompanyProfilesResponse)
+def get_company_profiles(
+    session: SessionDep,
+    company_code: List[str] = Query(..., description="公司代號 (可重複或以逗號分隔)"),
+    include: Optional[List[str]] = Query(None, description="只回傳指定區塊 (e.g. include=company,violation_summary)"),
+):
+    """
+    一次取得多家公司的完整資料 (比較頁 / 批次使用)
+
+    物化文件以一次 IN 查詢讀取；尚未物化的公司每個資料表一次 IN 查詢批次組裝，
+    查詢數與公司數無關。公司數上限為 PROFILE_BATCH_MAX_SIZE。
+    """
+    codes = split_fields(company_code)
+    if len(codes) > settings.PROFILE_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.PROFILE_BATCH_MAX_SIZE} companies per request",
+        )
+    include = parse_document_fields(CompanyProfileResponse, include)
+
+    documents = ProfileService().get_documents(session, codes)
+    items = []
+    for code in codes:
+        document = documents.get(code)
+        if document is not None:
+            items.append(project_document(document, include) if include is not None else document)
+    not_found = [code for code in codes if code not in documents]
+
+    # 直接拼接各公司的 JSON 文件，不重新解析
+    body = b'{"items":[' + b",".join(items) + b'],"not_found":' + json.dumps(not_found, separators=(",", ":")).encode("utf-8") + b"}"
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("/{company_code}/profile", response_model=CompanyProfileResponse)
 def get_company_profile(
     company_code: str,
     session: SessionDep,
+    fields: Optional[List[str]] = Query(None, description="只回傳指定區塊 (e.g. fields=company,violation_summary)"),
 ):
     """
     取得單一公司的完整資料（公司基本資料 + 所有關聯資料）
+
+    直接回傳同步後物化的 JSON 文件 (一次主鍵查詢)；尚未物化時即時組裝。
+    違規紀錄只附最新 N 筆與年度統計，完整紀錄請用 /{company_code}/violations
+    與 /{company_code}/environmental-violations 分頁取得。
     """
-    # 查詢公司
-    company = session.exec(
-        select(Company).where(Company.code == company_code)
-    ).first()
-    
-    if not company:
+    fields = parse_document_fields(CompanyProfileResponse, fields)
+    document = ProfileService().get_document(session, company_code)
+    if document is None:
         raise HTTPException(status_code=404, detail=f"Company {company_code} not found")
-    
-    # 查詢違規
-    violations = session.exec(
-        select(Violation)
-        .where(Violation.company_code == company_code)
-        .order_by(Violation.penalty_date.desc())
-    ).all()
-    
-    # 查詢員工福利
-    employee_benefits = session.exec(
-        select(EmployeeBenefit)
-        .where(EmployeeBenefit.company_code == company_code)
-        .order_by(EmployeeBenefit.year.desc())
-    ).all()
-    
-    # 查詢非主管薪資
-    non_manager_salaries = session.exec(
-        select(NonManagerSalary)
-        .where(NonManagerSalary.company_code == company_code)
-        .order_by(NonManagerSalary.year.desc())
-    ).all()
-    
-    # 查詢福利政策
-    welfare_policies = session.exec(
-        select(WelfarePolicy)
-        .where(WelfarePolicy.company_code == company_code)
-        .order_by(WelfarePolicy.year.desc())
-    ).all()
-    
-    # 查詢調薪
-    salary_adjustments = session.exec(
-        select(SalaryAdjustment)
-        .where(SalaryAdjustment.company_code == company_code)
-        .order_by(SalaryAdjustment.year.desc())
-    ).all()
-    
-    # 查詢環境違規
-    environmental_violations = session.exec(
-        select(EnvironmentalViolation)
-        .where(EnvironmentalViolation.company_code == company_code)
-        .order_by(EnvironmentalViolation.penalty_date.desc())
-    ).all()
-    
-    return CompanyProfileResponse(
-        company=company,
-        violations=violations,
-        employee_benefits=employee_benefits,
-        non_manager_salaries=non_manager_salaries,
-        welfare_policies=welfare_policies,
-        salary_adjustments=salary_adjustments,
-        environmental_violations=environmental_violations,
+    if fields is not None:
+        document = project_document(document, fields)
+    return Response(content=document, media_type="application/json")
+
+
+def _ensure_company(session, company_code: str):
+    if session.get(Company, company_code) is None:
+        raise HTTPException(status_code=404, detail=f"Company {company_code} not found")
+
+
+@router.get("/{company_code}/violations", response_model=PaginatedResponse[ViolationPublic])
+def get_company_violations(
+    company_code: str,
+    session: SessionDep,
+    size: int = Query(20, ge=1, le=100, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="分頁游標 (上一頁回傳的 next_cursor)"),
+    sort: Optional[List[str]] = Query(None, description="排序欄位 (預設 -penalty_date)"),
+    include_total: bool = Query(False, description="是否計算總筆數 (profile 已附統計)"),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """
+    單一公司的勞動違規紀錄 (profile 只附最新 N 筆，其餘由此分頁取得)
+    """
+    _ensure_company(session, company_code)
+    query = select(Violation).where(Violation.company_code == company_code)
+    items, total, total_pages, next_cursor = paginate(
+        session, query, Violation,
+        size=size, sorts=sort,
+        default_sort=("-penalty_date", "-id"),
+        cursor=cursor, include_total=include_total, fields=fields,
+    )
+    return paginated_response(
+        items, fields,
+        page=1, size=size, total=total,
+        total_pages=total_pages, next_cursor=next_cursor,
+    )
+
+
+@router.get("/{company_code}/environmental-violations", response_model=PaginatedResponse[EnvironmentalViolationPublic])
+def get_company_environmental_violations(
+    company_code: str,
+    session: SessionDep,
+    size: int = Query(20, ge=1, le=100, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="分頁游標 (上一頁回傳的 next_cursor)"),
+    sort: Optional[List[str]] = Query(None, description="排序欄位 (預設 -penalty_date)"),
+    include_total: bool = Query(False, description="是否計算總筆數 (profile 已附統計)"),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """
+    單一公司的環境違規紀錄 (profile 只附最新 N 筆，其餘由此分頁取得)
+    """
+    _ensure_company(session, company_code)
+    query = select(EnvironmentalViolation).where(EnvironmentalViolation.company_code == company_code)
+    items, total, total_pages, next_cursor = paginate(
+        session, query, EnvironmentalViolation,
+        size=size, sorts=sort,
+        default_sort=("-penalty_date", "-id"),
+        cursor=cursor, include_total=include_total, fields=fields,
+    )
+    return paginated_response(
+        items, fields,
+        page=1, size=size, total=total,
+        total_pages=total_pages, next_cursor=next_cursor,
     )
 
 
@@ -113,7 +160,7 @@ def get_company_profile(
 def get_yearly_summary(
     session: SessionDep,
     page: int = Query(1, ge=1, description="頁碼 (從 1 開始)"),
-    size: int = Query(20, le=100, description="每頁筆數"),
+    size: int = Query(20, ge=1, le=100, description="每頁筆數"),
     sort: Optional[List[str]] = Query(None, description="排序欄位"),
     year: Optional[List[int]] = Query(None, description="民國年過濾"),
     company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
@@ -121,8 +168,9 @@ def get_yearly_summary(
     industry: Optional[List[str]] = Query(None, description="產業過濾"),
     include: Optional[List[str]] = Query(
         None, 
-        description="要包含的資料：violations, employee_benefit, non_manager_salary, welfare_policy, salary_adjustment, all"
+        description="要包含的資料：violations, env_violations, employee_benefit, non_manager_salary, welfare_policy, salary_adjustment, all"
     ),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """
     取得公司年度摘要列表（公司×年份矩陣）
@@ -130,232 +178,46 @@ def get_yearly_summary(
     include 參數說明：
     - 不設定：只回傳公司基本資料 + year
     - violations：加入違規統計
+    - env_violations：加入環境違規統計
     - employee_benefit：加入員工福利完整資料
     - non_manager_salary：加入非主管薪資完整資料
     - welfare_policy：加入福利政策完整資料
     - salary_adjustment：加入調薪完整資料
     - all：包含所有資料
+
+    過濾、排序 (NULL 排最後) 與分頁皆在 SQL 完成，只載入回傳頁的資料。
+    fields 只保留項目的指定欄位 (套用在 include 之後)。
     """
-    # 解析 include 參數
-    include_set = set(include) if include else set()
-    include_all = "all" in include_set
-    include_violations = include_all or "violations" in include_set
-    include_env_violations = include_all or "env_violations" in include_set
-    include_employee_benefit = include_all or "employee_benefit" in include_set
-    include_non_manager_salary = include_all or "non_manager_salary" in include_set
-    include_welfare_policy = include_all or "welfare_policy" in include_set
-    include_salary_adjustment = include_all or "salary_adjustment" in include_set
-    
-    # Step 1: 取得所有年份（從 employee_benefit 和 non_manager_salary）
-    years_query = select(EmployeeBenefit.year).distinct()
-    if year:
-        years_query = years_query.where(col(EmployeeBenefit.year).in_(year))
-    available_years = [r for r in session.exec(years_query).all()]
-    
-    if not available_years:
-        return YearlySummaryResponse(items=[], total=0, page=page, size=size, total_pages=0)
-    
-    # Step 2: 取得公司列表
-    companies_query = select(Company)
-    if company_code:
-        companies_query = companies_query.where(col(Company.code).in_(company_code))
-    if market_type:
-        companies_query = companies_query.where(col(Company.market_type).in_(market_type))
-    if industry:
-        companies_query = companies_query.where(col(Company.industry).in_(industry))
-    
-    companies = session.exec(companies_query).all()
-    
-    if not companies:
-        return YearlySummaryResponse(items=[], total=0, page=page, size=size, total_pages=0)
-    
-    # Step 3: 建立公司代號集合
-    company_codes = [c.code for c in companies]
-    company_map = {c.code: c for c in companies}
-    
-    # Step 4: 預先查詢關聯資料（根據 include 參數）
-    violations_total = {}
-    violations_by_year = {}
-    if include_violations:
-        # 違規 - 歷年累計
-        violations_total_query = session.exec(
-            select(
-                Violation.company_code,
-                func.count(Violation.id).label("count"),
-                func.sum(Violation.fine_amount).label("fine")
-            )
-            .where(col(Violation.company_code).in_(company_codes))
-            .group_by(Violation.company_code)
-        ).all()
-        for row in violations_total_query:
-            violations_total[row[0]] = {"count": row[1], "fine": row[2] or 0}
-        
-        # 違規 - 按年度
-        violations_year_query = session.exec(
-            select(
-                Violation.company_code,
-                extract('year', Violation.penalty_date).label("year"),
-                func.count(Violation.id).label("count"),
-                func.sum(Violation.fine_amount).label("fine")
-            )
-            .where(col(Violation.company_code).in_(company_codes))
-            .group_by(Violation.company_code, extract('year', Violation.penalty_date))
-        ).all()
-        for row in violations_year_query:
-            key = (row[0], int(row[1]) - 1911 if row[1] else None)  # 西元轉民國
-            violations_by_year[key] = {"count": row[2], "fine": row[3] or 0}
-            
-    # 環境違規
-    env_violations_total = {}
-    env_violations_by_year = {}
-    if include_env_violations:
-        # 環境違規 - 歷年累計
-        env_violations_total_query = session.exec(
-            select(
-                EnvironmentalViolation.company_code,
-                func.count(EnvironmentalViolation.id).label("count"),
-                func.sum(EnvironmentalViolation.fine_amount).label("fine")
-            )
-            .where(col(EnvironmentalViolation.company_code).in_(company_codes))
-            .group_by(EnvironmentalViolation.company_code)
-        ).all()
-        for row in env_violations_total_query:
-            env_violations_total[row[0]] = {"count": row[1], "fine": row[2] or 0}
-        
-        # 環境違規 - 按年度
-        env_violations_year_query = session.exec(
-            select(
-                EnvironmentalViolation.company_code,
-                extract('year', EnvironmentalViolation.penalty_date).label("year"),
-                func.count(EnvironmentalViolation.id).label("count"),
-                func.sum(EnvironmentalViolation.fine_amount).label("fine")
-            )
-            .where(col(EnvironmentalViolation.company_code).in_(company_codes))
-            .group_by(EnvironmentalViolation.company_code, extract('year', EnvironmentalViolation.penalty_date))
-        ).all()
-        for row in env_violations_year_query:
-            key = (row[0], int(row[1]) - 1911 if row[1] else None)  # 西元轉民國
-            env_violations_by_year[key] = {"count": row[2], "fine": row[3] or 0}
-    
-    # 員工福利（必須查詢用於判斷資料是否存在）
-    benefits_map = {}
-    benefits = session.exec(
-        select(EmployeeBenefit)
-        .where(col(EmployeeBenefit.company_code).in_(company_codes))
-    ).all()
-    for b in benefits:
-        benefits_map[(b.company_code, b.year)] = b
-    
-    # 非主管薪資
-    salaries_map = {}
-    salaries = session.exec(
-        select(NonManagerSalary)
-        .where(col(NonManagerSalary.company_code).in_(company_codes))
-    ).all()
-    for s in salaries:
-        salaries_map[(s.company_code, s.year)] = s
-    
-    # 福利政策
-    policies_map = {}
-    policies = session.exec(
-        select(WelfarePolicy)
-        .where(col(WelfarePolicy.company_code).in_(company_codes))
-    ).all()
-    for p in policies:
-        policies_map[(p.company_code, p.year)] = p
-    
-    # 調薪
-    adjustments_map = {}
-    adjustments = session.exec(
-        select(SalaryAdjustment)
-        .where(col(SalaryAdjustment.company_code).in_(company_codes))
-    ).all()
-    for a in adjustments:
-        adjustments_map[(a.company_code, a.year)] = a
-    
-    # Step 5: 組合結果
-    items = []
-    for y in sorted(available_years, reverse=True):
-        for code in company_codes:
-            company = company_map.get(code)
-            if not company:
-                continue
-            
-            # 檢查是否有該年度資料
-            benefit = benefits_map.get((code, y))
-            salary = salaries_map.get((code, y))
-            policy = policies_map.get((code, y))
-            adjustment = adjustments_map.get((code, y))
-            
-            # 如果沒有任何資料，跳過
-            if not benefit and not salary and not policy and not adjustment:
-                continue
-            
-            # 建立基本資料
-            item = YearlySummaryItem(
-                company_code=code,
-                company_name=company.name,
-                market_type=company.market_type,
-                industry=company.industry,
-                year=y,
-            )
-            
-            # 加入違規統計
-            if include_violations:
-                vio_year = violations_by_year.get((code, y), {"count": 0, "fine": 0})
-                vio_total = violations_total.get(code, {"count": 0, "fine": 0})
-                item.violations_year_count = vio_year["count"]
-                item.violations_year_fine = vio_year["fine"]
-                item.violations_total_count = vio_total["count"]
-                item.violations_total_fine = vio_total["fine"]
-                
-             # 加入環境違規統計
-            if include_env_violations:
-                env_year = env_violations_by_year.get((code, y), {"count": 0, "fine": 0})
-                env_total = env_violations_total.get(code, {"count": 0, "fine": 0})
-                item.env_violations_year_count = env_year["count"]
-                item.env_violations_year_fine = env_year["fine"]
-                item.env_violations_total_count = env_total["count"]
-                item.env_violations_total_fine = env_total["fine"]
-            
-            # 加入 MOPS 完整物件
-            if include_employee_benefit and benefit:
-                item.employee_benefit = EmployeeBenefitResponse.model_validate(benefit)
-            
-            if include_non_manager_salary and salary:
-                item.non_manager_salary = NonManagerSalaryResponse.model_validate(salary)
-            
-            if include_welfare_policy and policy:
-                item.welfare_policy = WelfarePolicyResponse.model_validate(policy)
-            
-            if include_salary_adjustment and adjustment:
-                item.salary_adjustment = SalaryAdjustmentResponse.model_validate(adjustment)
-            
-            items.append(item)
-    
-    # Step 6: 排序
-    if sort:
-        for sort_field in reversed(sort):
-            desc_order = sort_field.startswith("-")
-            field_name = sort_field.lstrip("-")
-            if hasattr(YearlySummaryItem, field_name):
-                items.sort(
-                    key=lambda x: (getattr(x, field_name) is None, getattr(x, field_name) or 0),
-                    reverse=desc_order
-                )
-    
-    # Step 7: 分頁
-    total = len(items)
-    start = (page - 1) * size
-    end = start + size
-    items = items[start:end]
+    fields = parse_document_fields(YearlySummaryItem, fields)
+    service = YearlySummaryService()
+    filters = {
+        "year": year,
+        "company_code": company_code,
+        "market_type": market_type,
+        "industry": industry,
+    }
+
+    items, total = service.get_yearly_summary(
+        session=session,
+        page=page,
+        size=size,
+        sorts=sort,
+        filters=filters,
+        include=set(include) if include else None,
+    )
     total_pages = math.ceil(total / size) if size > 0 else 0
-    
-    return YearlySummaryResponse(
+
+    if fields is not None:
+        return paginated_response(
+            [item.model_dump(mode="json", include=set(fields)) for item in items], fields,
+            page=page, size=size, total=total, total_pages=total_pages,
+        )
+
+    # 項目已在服務中建立為 YearlySummaryItem (include=all 時很大)，直接序列化不再驗證
+    return FastJSONResponse(YearlySummaryResponse(
         items=items,
         total=total,
         page=page,
         size=size,
         total_pages=total_pages,
-    )
-
+    ))
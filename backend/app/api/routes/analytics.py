@@ -0,0 +1,85 @@
+"""
+Analytics API Routes (欄式快照)
+
+Endpoints:
+- GET /api/v1/analytics/top - 任意指標的 Top-K 排名
+- GET /api/v1/analytics/percentiles - 任意指標的分布統計
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.responses import FastJSONResponse
+from app.schemas.analytics import (
+    AnalyticsMetric,
+    AnalyticsPercentilesResponse,
+    AnalyticsTopResponse,
+    SortOrder,
+)
+from app.services.analytics_service import AnalyticsService, AnalyticsSnapshot
+
+router = APIRouter()
+
+DEFAULT_PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def _get_snapshot() -> AnalyticsSnapshot:
+    snapshot = AnalyticsService().get_snapshot()
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Analytics snapshot not built yet (run `materialize`)")
+    return snapshot
+
+
+@router.get("/top", response_model=AnalyticsTopResponse)
+def get_top(
+    metric: AnalyticsMetric = Query(..., description="排名指標"),
+    k: int = Query(10, ge=1, le=1000, description="名次數"),
+    order: SortOrder = Query(SortOrder.desc, description="desc: 由高至低；asc: 由低至高"),
+    year: Optional[List[int]] = Query(None, description="民國年過濾"),
+    industry: Optional[List[str]] = Query(None, description="產業別過濾"),
+    market_type: Optional[List[str]] = Query(None, description="市場別過濾"),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+):
+    """
+    任意指標的 Top-K 排名 (每家公司每年度一筆，無資料者不列入)
+    """
+    snapshot = _get_snapshot()
+    matched, items = snapshot.top_k(
+        metric.value, k, ascending=order == SortOrder.asc,
+        years=year, industries=industry, market_types=market_type, company_codes=company_code,
+    )
+    return FastJSONResponse({
+        "metric": metric.value,
+        "order": order.value,
+        "matched": matched,
+        "items": items,
+        "snapshot_built_at": snapshot.built_at,
+    })
+
+
+@router.get("/percentiles", response_model=AnalyticsPercentilesResponse)
+def get_percentiles(
+    metric: AnalyticsMetric = Query(..., description="統計指標"),
+    q: List[float] = Query(DEFAULT_PERCENTILES, description="百分位 (0-100)"),
+    year: Optional[List[int]] = Query(None, description="民國年過濾"),
+    industry: Optional[List[str]] = Query(None, description="產業別過濾"),
+    market_type: Optional[List[str]] = Query(None, description="市場別過濾"),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+):
+    """
+    任意指標的分布統計 (筆數、平均數與指定百分位數)
+    """
+    if any(not 0 <= value <= 100 for value in q):
+        raise HTTPException(status_code=400, detail="Percentiles must be between 0 and 100")
+    snapshot = _get_snapshot()
+    count, mean, values = snapshot.percentiles(
+        metric.value, q,
+        years=year, industries=industry, market_types=market_type, company_codes=company_code,
+    )
+    return FastJSONResponse({
+        "metric": metric.value,
+        "count": count,
+        "mean": mean,
+        "percentiles": {f"p{value:g}": result for value, result in zip(q, values)},
+        "snapshot_built_at": snapshot.built_at,
+    })
@@ -1,18 +1,25 @@
 from typing import List, Optional
 from fastapi import APIRouter, Query, Depends
+from app.api.cache import response_cache, is_leading_page
 from app.api.deps import SessionDep
+from app.api.fields import FIELDS_DESCRIPTION, paginated_response
+from app.api.responses import FastJSONResponse
 from app.schemas.company import CompanyResponse, PaginatedResponse, CompanyCatalogItem
 from app.services.company_service import CompanyService
+from app.services.suggest_service import SuggestService
 
-import math
 
 router = APIRouter()
 
 @router.get("/", response_model=PaginatedResponse[CompanyResponse])
+@response_cache(condition=is_leading_page)
 def read_companies(
     session: SessionDep,
     page: int = Query(1, ge=1, description="頁碼"),
     size: int = Query(20, le=100, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="分頁游標 (上一頁回傳的 next_cursor，提供時忽略 page)"),
+    include_total: bool = Query(True, description="是否計算總筆數 (false 可省去 count 查詢)"),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
     sort: Optional[List[str]] = Query(None, description="排序欄位 (e.g. -capital, listing_date)"),
     market_type: Optional[List[str]] = Query(None, description="市場別過濾 (Listed, OTC, Emerging, Public)"),
     industry: Optional[List[str]] = Query(None, description="產業類別過濾"),
@@ -31,28 +38,41 @@ def read_companies(
         "name": name
     }
     
-    results, total = service.get_companies(
+    results, total, total_pages, next_cursor = service.get_companies(
         session=session,
         page=page,
         size=size,
         filters=filters,
-        sorts=sort
+        sorts=sort,
+        cursor=cursor,
+        include_total=include_total,
+        fields=fields,
     )
     
-    total_pages = math.ceil(total / size) if size > 0 else 0
-    
-    return PaginatedResponse(
-        items=results,
-        total=total,
-        page=page,
-        size=size,
-        total_pages=total_pages
+    return paginated_response(
+        results, fields,
+        page=page, size=size, total=total,
+        total_pages=total_pages, next_cursor=next_cursor,
     )
 
+@router.get("/suggest", response_model=List[CompanyCatalogItem])
+def suggest_companies(
+    session: SessionDep,
+    q: str = Query(..., min_length=1, max_length=50, description="輸入的代號 / 名稱 / 簡稱片段"),
+    limit: int = Query(10, ge=1, le=50, description="回傳筆數"),
+):
+    """
+    公司搜尋建議 (typeahead)：以記憶體索引比對，不查詢資料庫。
+    排序為 完全相符 > 代號前綴 > 名稱/簡稱前綴 > 子字串，再依市場別與資本額。
+    """
+    return FastJSONResponse(SuggestService().suggest(session, q, limit=limit))
+
 @router.get("/catalog", response_model=List[CompanyCatalogItem])
+@response_cache()
 def read_company_catalog(session: SessionDep):
     """
     取得所有公司的精簡清單（用於前端搜尋建議）
     """
     service = CompanyService()
-    return service.get_catalog(session)
+    # 目錄列已依 CompanyCatalogItem 組好，直接編碼不再驗證
+    return FastJSONResponse(service.get_catalog(session))
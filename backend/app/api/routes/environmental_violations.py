@@ -2,43 +2,43 @@
 Environmental Violations API Routes
 
 GET /environmental-violations - 查詢環境違規記錄
+GET /environmental-violations/export - 串流匯出環境違規記錄 (NDJSON / CSV)
+GET /environmental-violations/facets - 環境違規多維度統計 (法條 / 機關 / 類別 / 產業 / 年月)
 """
-import math
 from typing import List, Optional
 from datetime import date
 
 from fastapi import APIRouter, Query
-from sqlmodel import select, col, asc, desc, func
+from sqlmodel import select, col
 from sqlalchemy import extract
 
+from app.api.cache import response_cache, is_leading_page
 from app.api.deps import SessionDep
+from app.api.export import EXPORT_FORMAT_DESCRIPTION, ExportFormat, stream_export
+from app.api.fields import FIELDS_DESCRIPTION, paginated_response
+from app.api.responses import FastJSONResponse
+from app.db.pagination import paginate
 from app.models.environmental_violation import EnvironmentalViolation
 from app.schemas.environmental_violation import EnvironmentalViolationPublic
 from app.schemas.company import PaginatedResponse
+from app.schemas.facet import EnvironmentalViolationFacetField, FacetOrder, FacetResponse
+from app.services.facet_service import FacetService
+from app.services.violation_stats_service import SOURCE_ENV
 
 router = APIRouter()
 
 
-@router.get("/", response_model=PaginatedResponse[EnvironmentalViolationPublic])
-def read_environmental_violations(
-    session: SessionDep,
-    page: int = Query(1, ge=1, description="頁碼"),
-    size: int = Query(20, le=100, description="每頁筆數"),
-    sort: Optional[List[str]] = Query(None, description="排序欄位 (e.g. -fine_amount, penalty_date)"),
-    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
-    violation_type: Optional[List[str]] = Query(None, description="污染類別過濾"),
-    authority: Optional[List[str]] = Query(None, description="裁處機關過濾"),
-    year: Optional[List[int]] = Query(None, description="年度過濾 (西元年)"),
-    start_date: Optional[date] = Query(None, description="處分日期起始"),
-    end_date: Optional[date] = Query(None, description="處分日期結束"),
-    min_fine: Optional[int] = Query(None, description="最低罰款金額"),
-    max_fine: Optional[int] = Query(None, description="最高罰款金額"),
+def _build_query(
+    company_code: Optional[List[str]] = None,
+    violation_type: Optional[List[str]] = None,
+    authority: Optional[List[str]] = None,
+    year: Optional[List[int]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    min_fine: Optional[int] = None,
+    max_fine: Optional[int] = None,
 ):
-    """
-    查詢環境違規記錄（僅上市櫃公司）
-    
-    支援多重篩選與排序，行為與 /violations 保持一致。
-    """
+    """列表與匯出共用的過濾條件"""
     query = select(EnvironmentalViolation)
     
     # Filters
@@ -65,32 +65,102 @@ def read_environmental_violations(
         
     if max_fine is not None:
         query = query.where(EnvironmentalViolation.fine_amount <= max_fine)
+
+    return query
+
+
+@router.get("/", response_model=PaginatedResponse[EnvironmentalViolationPublic])
+@response_cache(condition=is_leading_page)
+def read_environmental_violations(
+    session: SessionDep,
+    page: int = Query(1, ge=1, description="頁碼"),
+    size: int = Query(20, le=100, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="分頁游標 (上一頁回傳的 next_cursor，提供時忽略 page)"),
+    include_total: bool = Query(True, description="是否計算總筆數 (false 可省去 count 查詢)"),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    sort: Optional[List[str]] = Query(None, description="排序欄位 (e.g. -fine_amount, penalty_date)"),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+    violation_type: Optional[List[str]] = Query(None, description="污染類別過濾"),
+    authority: Optional[List[str]] = Query(None, description="裁處機關過濾"),
+    year: Optional[List[int]] = Query(None, description="年度過濾 (西元年)"),
+    start_date: Optional[date] = Query(None, description="處分日期起始"),
+    end_date: Optional[date] = Query(None, description="處分日期結束"),
+    min_fine: Optional[int] = Query(None, description="最低罰款金額"),
+    max_fine: Optional[int] = Query(None, description="最高罰款金額"),
+):
+    """
+    查詢環境違規記錄（僅上市櫃公司）
     
-    # Count total before pagination
-    count_query = select(func.count()).select_from(query.subquery())
-    total = session.exec(count_query).one()
-        
-    # Sorting
-    if sort:
-        for sort_field in sort:
-            direction = desc if sort_field.startswith("-") else asc
-            field_name = sort_field.lstrip("-")
-            if hasattr(EnvironmentalViolation, field_name):
-                query = query.order_by(direction(getattr(EnvironmentalViolation, field_name)))
-    else:
-        # Default sort
-        query = query.order_by(desc(EnvironmentalViolation.penalty_date), desc(EnvironmentalViolation.id))
-    
-    # Pagination
-    query = query.offset((page - 1) * size).limit(size)
-    violations = session.exec(query).all()
+    支援多重篩選與排序，行為與 /violations 保持一致。
+    """
+    query = _build_query(
+        company_code=company_code, violation_type=violation_type, authority=authority, year=year,
+        start_date=start_date, end_date=end_date, min_fine=min_fine, max_fine=max_fine,
+    )
     
-    total_pages = math.ceil(total / size) if size > 0 else 0
+    violations, total, total_pages, next_cursor = paginate(
+        session, query, EnvironmentalViolation,
+        page=page, size=size, sorts=sort,
+        default_sort=("-penalty_date", "-id"),
+        cursor=cursor, include_total=include_total, fields=fields,
+    )
     
-    return PaginatedResponse(
-        items=violations,
-        total=total,
-        page=page,
-        size=size,
-        total_pages=total_pages
+    return paginated_response(
+        violations, fields,
+        page=page, size=size, total=total,
+        total_pages=total_pages, next_cursor=next_cursor,
+    )
+
+
+@router.get("/export")
+def export_environmental_violations(
+    format: ExportFormat = Query(ExportFormat.ndjson, description=EXPORT_FORMAT_DESCRIPTION),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+    violation_type: Optional[List[str]] = Query(None, description="污染類別過濾"),
+    authority: Optional[List[str]] = Query(None, description="裁處機關過濾"),
+    year: Optional[List[int]] = Query(None, description="年度過濾 (西元年)"),
+    start_date: Optional[date] = Query(None, description="處分日期起始"),
+    end_date: Optional[date] = Query(None, description="處分日期結束"),
+    min_fine: Optional[int] = Query(None, description="最低罰款金額"),
+    max_fine: Optional[int] = Query(None, description="最高罰款金額"),
+):
+    """
+    串流匯出環境違規記錄 (過濾條件與 /environmental-violations 相同，不分頁、不計算總數)
+    """
+    query = _build_query(
+        company_code=company_code, violation_type=violation_type, authority=authority, year=year,
+        start_date=start_date, end_date=end_date, min_fine=min_fine, max_fine=max_fine,
     )
+    return stream_export(query, EnvironmentalViolation, format, "environmental_violations", fields=fields)
+
+@router.get("/facets", response_model=FacetResponse)
+@response_cache()
+def get_environmental_violation_facets(
+    session: SessionDep,
+    by: List[EnvironmentalViolationFacetField] = Query(..., description="分組維度 (可多個，依組合分組)"),
+    order: FacetOrder = Query(FacetOrder.count, description="排序依據 (多到少)"),
+    limit: int = Query(50, ge=1, le=1000, description="最多回傳的分組數"),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+    violation_type: Optional[List[str]] = Query(None, description="污染類別過濾"),
+    authority: Optional[List[str]] = Query(None, description="主管機關過濾"),
+    law_article: Optional[List[str]] = Query(None, description="法條過濾"),
+    industry: Optional[List[str]] = Query(None, description="產業別過濾"),
+    market_type: Optional[List[str]] = Query(None, description="市場別過濾"),
+    year: Optional[List[int]] = Query(None, description="年度過濾 (西元年)"),
+):
+    """
+    環境違規多維度統計 (讀取同步時維護的彙總表，不掃描原始紀錄)
+
+    例: by=law_article&year=2024&industry=半導體業 → 2024 年半導體業最常違反的法條。
+    彙總以月為單位，因此不支援日期區間與單筆罰鍰金額的過濾。
+    """
+    return FastJSONResponse(FacetService().get_facets(
+        session, SOURCE_ENV,
+        by=list(dict.fromkeys(field.value for field in by)),
+        filters={
+            "company_code": company_code, "violation_type": violation_type, "authority": authority,
+            "law_article": law_article, "industry": industry, "market_type": market_type, "year": year,
+        },
+        order=order, limit=limit,
+    ))
@@ -0,0 +1,40 @@
+"""
+Industry API Routes
+
+Endpoints:
+- GET /api/v1/industries/{industry}/stats - 產業基準統計 (分布與公司百分位排名)
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.cache import response_cache
+from app.api.deps import SessionDep
+from app.api.responses import FastJSONResponse
+from app.schemas.industry import BenchmarkMetric, IndustryStatsResponse
+from app.services.benchmark_service import BenchmarkService
+
+router = APIRouter()
+
+
+@router.get("/{industry}/stats", response_model=IndustryStatsResponse)
+@response_cache()
+def get_industry_stats(
+    session: SessionDep,
+    industry: str,
+    year: Optional[List[int]] = Query(None, description="民國年過濾"),
+    metric: Optional[List[BenchmarkMetric]] = Query(None, description="指標過濾 (預設全部)"),
+    include_companies: bool = Query(False, description="是否附上各公司的百分位排名"),
+):
+    """
+    取得產業基準統計 (同步後物化，請求時不計算)
+
+    每個年度、指標回傳公司數、平均數與 p10/p25/p50/p75/p90；
+    include_companies=true 時附上各公司數值與百分位排名 (依排名由高至低)。
+    """
+    stats = BenchmarkService().get_industry_stats(
+        session, industry, years=year, metrics=metric, include_companies=include_companies,
+    )
+    if stats is None:
+        raise HTTPException(status_code=404, detail=f"Industry {industry} not found")
+    return FastJSONResponse(stats)
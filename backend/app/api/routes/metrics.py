@@ -0,0 +1,62 @@
+"""
+Metrics API Route (Prometheus)
+
+Endpoints:
+- GET /metrics - Prometheus text format 指標 (不在 /api/v1 之下，不列入 OpenAPI 文件)
+
+除了 HTTP 與連線池指標外，於 scrape 時回報:
+- 回應快取命中 / 未命中次數、項目數與容量
+- 資料世代、最後同步時間與資料年齡
+- 分析快照的建立時間與年齡
+"""
+import time
+
+from fastapi import APIRouter, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.cache import cache
+from app.core.metrics import CONTENT_TYPE, REGISTRY, gauge_sample
+from app.services.analytics_service import AnalyticsService
+from app.services.generation_service import get_generation
+
+router = APIRouter()
+
+
+def _collect_response_cache():
+    return [
+        ("response_cache_requests_total", "counter", "Response cache lookups", [
+            ({"result": "hit"}, cache.hits),
+            ({"result": "miss"}, cache.misses),
+        ]),
+        *gauge_sample("response_cache_entries", "Entries in the response cache", len(cache)),
+        *gauge_sample("response_cache_bytes", "Bytes held by the response cache (including precompressed variants)", cache.total_bytes),
+    ]
+
+
+def _collect_data_freshness():
+    generation, updated_at = get_generation()
+    now = time.time()
+    samples = gauge_sample("data_generation", "Current data generation", generation)
+    if updated_at is not None:
+        synced_at = updated_at.timestamp()
+        samples += gauge_sample("data_last_sync_timestamp_seconds", "Time of the last generation bump", synced_at)
+        samples += gauge_sample("data_age_seconds", "Seconds since the last generation bump", now - synced_at)
+
+    snapshot = AnalyticsService().get_snapshot()
+    if snapshot is not None:
+        built_at = snapshot.built_at.timestamp()
+        samples += gauge_sample("analytics_snapshot_timestamp_seconds", "Build time of the mapped analytics snapshot", built_at)
+        samples += gauge_sample("analytics_snapshot_age_seconds", "Age of the mapped analytics snapshot", now - built_at)
+        samples += gauge_sample("analytics_snapshot_rows", "Rows in the mapped analytics snapshot", len(snapshot))
+    return samples
+
+
+REGISTRY.register_collector(_collect_response_cache)
+REGISTRY.register_collector(_collect_data_freshness)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    # collector 可能查詢資料庫 (資料世代)，移至 threadpool
+    body = await run_in_threadpool(REGISTRY.render)
+    return Response(content=body, media_type=CONTENT_TYPE)
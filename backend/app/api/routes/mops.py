@@ -6,14 +6,18 @@ Endpoints:
 - GET /mops/non-manager-salaries - 非擔任主管職務之全時員工薪資資訊  
 - GET /mops/welfare-policies - 員工福利政策及權益維護措施
 - GET /mops/salary-adjustments - 基層員工調整薪資或分派酬勞
+- GET /mops/{...}/export - 串流匯出上述資料 (NDJSON / CSV)
 """
-import math
 from typing import List, Optional
 
 from fastapi import APIRouter, Query
-from sqlmodel import Session, select, col, asc, desc, func
+from sqlmodel import Session, select, col
 
+from app.api.cache import response_cache, is_leading_page
 from app.api.deps import SessionDep
+from app.api.export import EXPORT_FORMAT_DESCRIPTION, ExportFormat, stream_export
+from app.api.fields import FIELDS_DESCRIPTION, paginated_response
+from app.db.pagination import paginate
 from app.models.employee_benefit import EmployeeBenefit
 from app.models.non_manager_salary import NonManagerSalary
 from app.models.welfare_policy import WelfarePolicy
@@ -29,41 +33,53 @@ from app.schemas.company import PaginatedResponse
 router = APIRouter()
 
 
-def apply_pagination_and_sort(query, model, page: int, size: int, sorts: Optional[List[str]], session: Session):
+def apply_filters(
+    query, model,
+    company_code: Optional[List[str]] = None,
+    year: Optional[List[int]] = None,
+    market_type: Optional[List[str]] = None,
+    industry: Optional[List[str]] = None,
+):
     """
-    Apply sorting and pagination to a query.
-    Returns (results, total_count).
+    Apply the common MOPS filters (shared by list and export endpoints).
     """
-    # Count total before pagination
-    count_query = select(func.count()).select_from(query.subquery())
-    total = session.exec(count_query).one()
-    
-    # Apply sorts
-    if sorts:
-        for sort_field in sorts:
-            direction = desc if sort_field.startswith("-") else asc
-            field_name = sort_field.lstrip("-")
-            if hasattr(model, field_name):
-                query = query.order_by(direction(getattr(model, field_name)))
-    else:
-        # Default sort by year desc, id desc
-        query = query.order_by(desc(model.year), desc(model.id))
-    
-    # Apply pagination
-    query = query.offset((page - 1) * size).limit(size)
-    
-    results = session.exec(query).all()
-    total_pages = math.ceil(total / size) if size > 0 else 0
-    
-    return results, total, total_pages
+    if company_code:
+        query = query.where(col(model.company_code).in_(company_code))
+    if year:
+        query = query.where(col(model.year).in_(year))
+    if market_type:
+        query = query.where(col(model.market_type).in_(market_type))
+    if industry:
+        query = query.where(col(model.industry).in_(industry))
+    return query
+
+
+def apply_pagination_and_sort(
+    query, model, page: int, size: int, sorts: Optional[List[str]], session: Session,
+    cursor: Optional[str] = None, include_total: bool = True, fields: Optional[List[str]] = None,
+):
+    """
+    Apply sorting and pagination to a query (default sort: year desc, id desc).
+    Returns (results, total_count, total_pages, next_cursor).
+    """
+    return paginate(
+        session, query, model,
+        page=page, size=size, sorts=sorts,
+        default_sort=("-year", "-id"),
+        cursor=cursor, include_total=include_total, fields=fields,
+    )
 
 
 # ========== Employee Benefits (t100sb14) ==========
 @router.get("/employee-benefits", response_model=PaginatedResponse[EmployeeBenefitResponse])
+@response_cache(condition=is_leading_page)
 def read_employee_benefits(
     session: SessionDep,
     page: int = Query(1, ge=1, description="頁碼"),
     size: int = Query(20, le=100, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="分頁游標 (上一頁回傳的 next_cursor，提供時忽略 page)"),
+    include_total: bool = Query(True, description="是否計算總筆數 (false 可省去 count 查詢)"),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
     sort: Optional[List[str]] = Query(None, description="排序欄位 (e.g. -year, company_code)"),
     company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
     year: Optional[List[int]] = Query(None, description="民國年過濾"),
@@ -73,36 +89,46 @@ def read_employee_benefits(
     """
     查詢財務報告附註揭露之員工福利(薪資)資訊 (t100sb14)
     """
-    query = select(EmployeeBenefit)
-    
-    if company_code:
-        query = query.where(col(EmployeeBenefit.company_code).in_(company_code))
-    if year:
-        query = query.where(col(EmployeeBenefit.year).in_(year))
-    if market_type:
-        query = query.where(col(EmployeeBenefit.market_type).in_(market_type))
-    if industry:
-        query = query.where(col(EmployeeBenefit.industry).in_(industry))
+    query = apply_filters(select(EmployeeBenefit), EmployeeBenefit, company_code=company_code, year=year, market_type=market_type, industry=industry)
     
-    results, total, total_pages = apply_pagination_and_sort(
-        query, EmployeeBenefit, page, size, sort, session
+    results, total, total_pages, next_cursor = apply_pagination_and_sort(
+        query, EmployeeBenefit, page, size, sort, session,
+        cursor=cursor, include_total=include_total, fields=fields,
     )
     
-    return PaginatedResponse(
-        items=results,
-        total=total,
-        page=page,
-        size=size,
-        total_pages=total_pages
+    return paginated_response(
+        results, fields,
+        page=page, size=size, total=total,
+        total_pages=total_pages, next_cursor=next_cursor,
     )
 
 
+@router.get("/employee-benefits/export")
+def export_employee_benefits(
+    format: ExportFormat = Query(ExportFormat.ndjson, description=EXPORT_FORMAT_DESCRIPTION),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+    year: Optional[List[int]] = Query(None, description="民國年過濾"),
+    market_type: Optional[List[str]] = Query(None, description="市場別過濾 (sii/otc)"),
+    industry: Optional[List[str]] = Query(None, description="產業類別過濾"),
+):
+    """
+    串流匯出財務報告附註揭露之員工福利(薪資)資訊 (t100sb14) (過濾條件與列表相同)
+    """
+    query = apply_filters(select(EmployeeBenefit), EmployeeBenefit, company_code=company_code, year=year, market_type=market_type, industry=industry)
+    return stream_export(query, EmployeeBenefit, format, "employee_benefits", fields=fields)
+
+
 # ========== Non-Manager Salaries (t100sb15) ==========
 @router.get("/non-manager-salaries", response_model=PaginatedResponse[NonManagerSalaryResponse])
+@response_cache(condition=is_leading_page)
 def read_non_manager_salaries(
     session: SessionDep,
     page: int = Query(1, ge=1, description="頁碼"),
     size: int = Query(20, le=100, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="分頁游標 (上一頁回傳的 next_cursor，提供時忽略 page)"),
+    include_total: bool = Query(True, description="是否計算總筆數 (false 可省去 count 查詢)"),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
     sort: Optional[List[str]] = Query(None, description="排序欄位 (e.g. -year, company_code)"),
     company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
     year: Optional[List[int]] = Query(None, description="民國年過濾"),
@@ -112,36 +138,46 @@ def read_non_manager_salaries(
     """
     查詢非擔任主管職務之全時員工薪資資訊 (t100sb15)
     """
-    query = select(NonManagerSalary)
-    
-    if company_code:
-        query = query.where(col(NonManagerSalary.company_code).in_(company_code))
-    if year:
-        query = query.where(col(NonManagerSalary.year).in_(year))
-    if market_type:
-        query = query.where(col(NonManagerSalary.market_type).in_(market_type))
-    if industry:
-        query = query.where(col(NonManagerSalary.industry).in_(industry))
+    query = apply_filters(select(NonManagerSalary), NonManagerSalary, company_code=company_code, year=year, market_type=market_type, industry=industry)
     
-    results, total, total_pages = apply_pagination_and_sort(
-        query, NonManagerSalary, page, size, sort, session
+    results, total, total_pages, next_cursor = apply_pagination_and_sort(
+        query, NonManagerSalary, page, size, sort, session,
+        cursor=cursor, include_total=include_total, fields=fields,
     )
     
-    return PaginatedResponse(
-        items=results,
-        total=total,
-        page=page,
-        size=size,
-        total_pages=total_pages
+    return paginated_response(
+        results, fields,
+        page=page, size=size, total=total,
+        total_pages=total_pages, next_cursor=next_cursor,
     )
 
 
+@router.get("/non-manager-salaries/export")
+def export_non_manager_salaries(
+    format: ExportFormat = Query(ExportFormat.ndjson, description=EXPORT_FORMAT_DESCRIPTION),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+    year: Optional[List[int]] = Query(None, description="民國年過濾"),
+    market_type: Optional[List[str]] = Query(None, description="市場別過濾 (sii/otc)"),
+    industry: Optional[List[str]] = Query(None, description="產業類別過濾"),
+):
+    """
+    串流匯出非擔任主管職務之全時員工薪資資訊 (t100sb15) (過濾條件與列表相同)
+    """
+    query = apply_filters(select(NonManagerSalary), NonManagerSalary, company_code=company_code, year=year, market_type=market_type, industry=industry)
+    return stream_export(query, NonManagerSalary, format, "non_manager_salaries", fields=fields)
+
+
 # ========== Welfare Policies (t100sb13) ==========
 @router.get("/welfare-policies", response_model=PaginatedResponse[WelfarePolicyResponse])
+@response_cache(condition=is_leading_page)
 def read_welfare_policies(
     session: SessionDep,
     page: int = Query(1, ge=1, description="頁碼"),
     size: int = Query(20, le=100, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="分頁游標 (上一頁回傳的 next_cursor，提供時忽略 page)"),
+    include_total: bool = Query(True, description="是否計算總筆數 (false 可省去 count 查詢)"),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
     sort: Optional[List[str]] = Query(None, description="排序欄位 (e.g. -year, company_code)"),
     company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
     year: Optional[List[int]] = Query(None, description="民國年過濾"),
@@ -150,34 +186,45 @@ def read_welfare_policies(
     """
     查詢員工福利政策及權益維護措施揭露 (t100sb13)
     """
-    query = select(WelfarePolicy)
+    query = apply_filters(select(WelfarePolicy), WelfarePolicy, company_code=company_code, year=year, market_type=market_type)
     
-    if company_code:
-        query = query.where(col(WelfarePolicy.company_code).in_(company_code))
-    if year:
-        query = query.where(col(WelfarePolicy.year).in_(year))
-    if market_type:
-        query = query.where(col(WelfarePolicy.market_type).in_(market_type))
-    
-    results, total, total_pages = apply_pagination_and_sort(
-        query, WelfarePolicy, page, size, sort, session
+    results, total, total_pages, next_cursor = apply_pagination_and_sort(
+        query, WelfarePolicy, page, size, sort, session,
+        cursor=cursor, include_total=include_total, fields=fields,
     )
     
-    return PaginatedResponse(
-        items=results,
-        total=total,
-        page=page,
-        size=size,
-        total_pages=total_pages
+    return paginated_response(
+        results, fields,
+        page=page, size=size, total=total,
+        total_pages=total_pages, next_cursor=next_cursor,
     )
 
 
+@router.get("/welfare-policies/export")
+def export_welfare_policies(
+    format: ExportFormat = Query(ExportFormat.ndjson, description=EXPORT_FORMAT_DESCRIPTION),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+    year: Optional[List[int]] = Query(None, description="民國年過濾"),
+    market_type: Optional[List[str]] = Query(None, description="市場別過濾 (sii/otc)"),
+):
+    """
+    串流匯出員工福利政策及權益維護措施揭露 (t100sb13) (過濾條件與列表相同)
+    """
+    query = apply_filters(select(WelfarePolicy), WelfarePolicy, company_code=company_code, year=year, market_type=market_type)
+    return stream_export(query, WelfarePolicy, format, "welfare_policies", fields=fields)
+
+
 # ========== Salary Adjustments (t222sb01) ==========
 @router.get("/salary-adjustments", response_model=PaginatedResponse[SalaryAdjustmentResponse])
+@response_cache(condition=is_leading_page)
 def read_salary_adjustments(
     session: SessionDep,
     page: int = Query(1, ge=1, description="頁碼"),
     size: int = Query(20, le=100, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="分頁游標 (上一頁回傳的 next_cursor，提供時忽略 page)"),
+    include_total: bool = Query(True, description="是否計算總筆數 (false 可省去 count 查詢)"),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
     sort: Optional[List[str]] = Query(None, description="排序欄位 (e.g. -year, company_code)"),
     company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
     year: Optional[List[int]] = Query(None, description="民國年過濾"),
@@ -187,25 +234,30 @@ def read_salary_adjustments(
     """
     查詢基層員工調整薪資或分派酬勞 (t222sb01)
     """
-    query = select(SalaryAdjustment)
-    
-    if company_code:
-        query = query.where(col(SalaryAdjustment.company_code).in_(company_code))
-    if year:
-        query = query.where(col(SalaryAdjustment.year).in_(year))
-    if market_type:
-        query = query.where(col(SalaryAdjustment.market_type).in_(market_type))
-    if industry:
-        query = query.where(col(SalaryAdjustment.industry).in_(industry))
+    query = apply_filters(select(SalaryAdjustment), SalaryAdjustment, company_code=company_code, year=year, market_type=market_type, industry=industry)
     
-    results, total, total_pages = apply_pagination_and_sort(
-        query, SalaryAdjustment, page, size, sort, session
+    results, total, total_pages, next_cursor = apply_pagination_and_sort(
+        query, SalaryAdjustment, page, size, sort, session,
+        cursor=cursor, include_total=include_total, fields=fields,
     )
     
-    return PaginatedResponse(
-        items=results,
-        total=total,
-        page=page,
-        size=size,
-        total_pages=total_pages
+    return paginated_response(
+        results, fields,
+        page=page, size=size, total=total,
+        total_pages=total_pages, next_cursor=next_cursor,
     )
+
+@router.get("/salary-adjustments/export")
+def export_salary_adjustments(
+    format: ExportFormat = Query(ExportFormat.ndjson, description=EXPORT_FORMAT_DESCRIPTION),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+    year: Optional[List[int]] = Query(None, description="民國年過濾"),
+    market_type: Optional[List[str]] = Query(None, description="市場別過濾 (sii/otc)"),
+    industry: Optional[List[str]] = Query(None, description="產業類別過濾"),
+):
+    """
+    串流匯出基層員工調整薪資或分派酬勞 (t222sb01) (過濾條件與列表相同)
+    """
+    query = apply_filters(select(SalaryAdjustment), SalaryAdjustment, company_code=company_code, year=year, market_type=market_type, industry=industry)
+    return stream_export(query, SalaryAdjustment, format, "salary_adjustments", fields=fields)
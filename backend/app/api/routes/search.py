@@ -0,0 +1,74 @@
+"""
+全文檢索 API Routes
+
+Endpoints:
+- GET /search/companies - 以代號 / 名稱 / 簡稱搜尋公司
+- GET /search/violations - 搜尋勞動違規紀錄內容
+- GET /search/environmental-violations - 搜尋環境違規紀錄內容
+"""
+import math
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
+
+from app.api.deps import SessionDep
+from app.models.environmental_violation import EnvironmentalViolation
+from app.models.violation import Violation
+from app.schemas.company import PaginatedResponse
+from app.schemas.search import CompanySearchHit, ViolationSearchHit
+from app.services.search_service import SearchService
+
+router = APIRouter()
+
+
+@router.get("/companies", response_model=List[CompanySearchHit])
+def search_companies(
+    session: SessionDep,
+    q: str = Query(..., min_length=1, max_length=100, description="關鍵字 (空白分隔為 AND)"),
+    limit: int = Query(20, ge=1, le=100, description="回傳筆數"),
+):
+    """
+    以代號 / 名稱 / 簡稱搜尋公司，依相關度排序 (代號命中優先)
+    """
+    return SearchService().search_companies(session, q, limit=limit)
+
+
+def _search_violations(session, model, q: str, page: int, size: int, company_code: Optional[List[str]]):
+    items, total = SearchService().search_violations(
+        session, model, q, page=page, size=size, company_code=company_code
+    )
+    return PaginatedResponse(
+        items=items,
+        total=total,
+        page=page,
+        size=size,
+        total_pages=math.ceil(total / size) if size > 0 else 0,
+    )
+
+
+@router.get("/violations", response_model=PaginatedResponse[ViolationSearchHit])
+def search_violations(
+    session: SessionDep,
+    q: str = Query(..., min_length=1, max_length=100, description="關鍵字 (空白分隔為 AND)"),
+    page: int = Query(1, ge=1, description="頁碼"),
+    size: int = Query(20, ge=1, le=100, description="每頁筆數"),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+):
+    """
+    搜尋勞動違規紀錄 (事業單位名稱、違反法規內容、法條)，依相關度排序並附命中片段
+    """
+    return _search_violations(session, Violation, q, page, size, company_code)
+
+
+@router.get("/environmental-violations", response_model=PaginatedResponse[ViolationSearchHit])
+def search_environmental_violations(
+    session: SessionDep,
+    q: str = Query(..., min_length=1, max_length=100, description="關鍵字 (空白分隔為 AND)"),
+    page: int = Query(1, ge=1, description="頁碼"),
+    size: int = Query(20, ge=1, le=100, description="每頁筆數"),
+    company_code: Optional[List[str]] = Query(None, description="公司代號過濾"),
+):
+    """
+    搜尋環境違規紀錄 (事業名稱、違規事由、法條、處分事由)，依相關度排序並附命中片段
+    """
+    return _search_violations(session, EnvironmentalViolation, q, page, size, company_code)
@@ -1,6 +1,10 @@
-from fastapi import APIRouter
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
 from sqlmodel import select, func
-from app.api.deps import SessionDep
+from app.api.cache import response_cache
+from app.api.deps import SessionDep, SlowQuerySessionDep
 from app.models.company import Company
 from app.models.violation import Violation
 from app.models.environmental_violation import EnvironmentalViolation
@@ -8,11 +12,13 @@ from app.models.employee_benefit import EmployeeBenefit
 from app.models.non_manager_salary import NonManagerSalary
 from app.models.welfare_policy import WelfarePolicy
 from app.models.salary_adjustment import SalaryAdjustment
-from app.schemas.system import SyncStatusResponse, SyncStatusItem
+from app.schemas.system import SyncStatusResponse, SyncStatusItem, SlowQueryOrder, SlowQueryStats
+from app.services.slow_query_service import SlowQueryService
 
 router = APIRouter()
 
 @router.get("/sync-status", response_model=SyncStatusResponse)
+@response_cache()
 def get_sync_status(session: SessionDep):
     # Company Sync Status
     companies_status = {}
@@ -89,3 +95,17 @@ def get_sync_status(session: SessionDep):
         environmental_violations=env_status,
         mops=mops_status
     )
+
+
+@router.get("/slow-queries", response_model=List[SlowQueryStats])
+def get_slow_queries(
+    session: SlowQuerySessionDep,
+    limit: int = Query(20, ge=1, le=100, description="回傳的查詢數"),
+    order: SlowQueryOrder = Query(SlowQueryOrder.total, description="排序: total 累計耗時 / max 單次最長 / count 次數"),
+    since: Optional[datetime] = Query(None, description="只統計此時間之後的紀錄"),
+):
+    """
+    最嚴重的慢查詢 (依 fingerprint 彙總，附最慢一次的參數與 EXPLAIN QUERY PLAN)。
+    門檻見 SLOW_QUERY_THRESHOLD_MS；不經回應快取 (內容與資料世代無關)。
+    """
+    return SlowQueryService().get_worst(session, limit=limit, order=order, since=since)
@@ -4,13 +4,9 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
-from app.services.crawler_service import CrawlerService
-from app.services.company_service import CompanyService
-from app.services.violation_service import ViolationService
-from app.services.mops_scraper import MopsScraper
-from app.services.export_service import ExportService
-from app.services.environmental_service import EnvironmentalService
-from app.services.company_detail_scraper import CompanyDetailScraper
+# 服務 (以及其依賴的 SQLModel / pandas / httpx / bs4) 於各指令內才 import，
+# 只執行單一指令 (或 sync_all 的每個子行程) 時不必載入全部模組。
+# 啟動時間檢查: python scripts/check_import_time.py
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -52,6 +48,9 @@ def sync_companies(
     Sync company data from TWSE/TPEX to database.
     Order: Public -> Emerging -> OTC -> Listed (to ensure proper precedence if overlap)
     """
+    from app.services.crawler_service import CrawlerService
+    from app.services.company_service import CompanyService
+
     crawler_service = CrawlerService()
     company_service = CompanyService()
     
@@ -95,6 +94,9 @@ def sync_violations(
     """
     Sync violation data from MOL Open Data.
     """
+    from app.services.crawler_service import CrawlerService
+    from app.services.violation_service import ViolationService
+
     crawler_service = CrawlerService()
     violation_service = ViolationService()
     
@@ -166,6 +168,8 @@ def sync_mops(
     - welfare_policy: t100sb13 員工福利政策及權益維護措施揭露
     - salary_adjustment: t222sb01 基層員工調整薪資或分派酬勞
     """
+    from app.services.mops_scraper import MopsScraper
+
     scraper = MopsScraper()
     
     # Calculate year range
@@ -208,14 +212,51 @@ def export(
     """
     Export all data to static JSON files for SSG.
     """
+    from app.services.export_service import ExportService
+
     service = ExportService(output_dir)
     service.export_all()
 
+@app.command()
+def materialize(
+    full: bool = typer.Option(False, "--full", help="Rebuild every company profile, not only changed ones"),
+):
+    """
+    Rebuild materialized read models (leaderboards, industry benchmarks, analytics snapshot, company profiles) after a sync.
+    --full also rebuilds the full-text search index and the violation stats
+    (normally kept in sync by triggers / at ingest).
+    """
+    from app.db.search_index import rebuild_search_index
+    from app.db.session import engine
+    from app.services.analytics_service import AnalyticsService
+    from app.services.benchmark_service import BenchmarkService
+    from app.services.leaderboard_service import LeaderboardService
+    from app.services.profile_service import ProfileService
+    from app.services.violation_stats_service import rebuild_violation_stats
+
+    if full:
+        typer.echo("--- Rebuilding Search Index & Violation Stats ---")
+        with engine.begin() as connection:
+            rebuild_search_index(connection)
+            rebuild_violation_stats(connection)
+    typer.echo("--- Materializing Leaderboards ---")
+    LeaderboardService().refresh()
+    typer.echo("--- Computing Industry Benchmarks ---")
+    BenchmarkService().refresh()
+    typer.echo("--- Writing Analytics Snapshot ---")
+    AnalyticsService().refresh()
+    typer.echo("--- Materializing Company Profiles ---")
+    count = ProfileService().refresh(full=full)
+    typer.echo(f"Rebuilt {count} company profiles.")
+    typer.echo("Materialize completed.")
+
 @app.command()
 def sync_env():
     """
     Sync environmental violation data from MOENV Open Data.
     """
+    from app.services.environmental_service import EnvironmentalService
+
     service = EnvironmentalService()
     
     # Data Dir
@@ -251,6 +292,8 @@ def sync_company_details(
     """
     Sync additional company details (Stakeholder/Governance URLs) from MOPS t05st03.
     """
+    from app.services.company_detail_scraper import CompanyDetailScraper
+
     scraper = CompanyDetailScraper()
     typer.echo("--- Starting Company Detail Sync (t05st03) ---")
     scraper.sync_all_details(limit=limit, force=force, company_code=company_code, retries=retries, delay=retry_delay)
@@ -262,7 +305,7 @@ def sync_all(
 ):
     """
     Run all sync commands in sequence:
-    Companies -> Violations -> Environmental -> MOPS -> Export
+    Companies -> Violations -> Environmental -> MOPS -> Materialize -> Export
     """
     import subprocess
     import sys
@@ -273,6 +316,7 @@ def sync_all(
         ["sync_env"],
         ["sync_company_details"],
         ["sync_mops"],
+        ["materialize"],
         ["export"],
     ]
     
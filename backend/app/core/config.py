@@ -6,6 +6,37 @@ class Settings(BaseSettings):
     MOENV_API_KEY: str = ""
     BACKEND_CORS_ORIGINS: list[str] = []
 
+    # HTTP 快取
+    DATA_GENERATION_TTL: float = 5.0  # 資料世代的行程內快取秒數
+    HTTP_CACHE_CONTROL: str = "public, no-cache"  # GET 回應的 Cache-Control (每次向 API 驗證 ETag)
+    BUILD_ID: str = ""  # 部署版本 (e.g. git commit SHA)，併入 ETag；未設定時以 app 原始碼的雜湊代替
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512  # 回應快取筆數上限
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 回應快取容量上限 (bytes)
+    RESPONSE_CACHE_MAX_PAGE: int = 3  # 列表端點只快取前幾頁
+    RESPONSE_CACHE_WARMUP_PATHS: list[str] = []  # 啟動時預熱的路徑 (e.g. /api/v1/companies/catalog)
+    COUNT_CACHE_MAX_ENTRIES: int = 1024  # 列表總筆數快取上限
+    PROFILE_LATEST_RECORDS: int = 20  # 公司 profile 內附的最新違規筆數
+    PROFILE_BATCH_MAX_SIZE: int = 20  # /companies/profiles 單次最多公司數
+
+    # 回應壓縮
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # 小於此大小 (bytes) 的回應不壓縮
+    GZIP_COMPRESS_LEVEL: int = 6  # 即時壓縮的 gzip 等級 (1-9)
+    BROTLI_QUALITY: int = 5  # 即時壓縮的 brotli 品質 (0-11)
+    PRECOMPRESS_GZIP_LEVEL: int = 9  # 回應快取內預壓縮版本的 gzip 等級 (只壓一次)
+    PRECOMPRESS_BROTLI_QUALITY: int = 9  # 回應快取內預壓縮版本的 brotli 品質
+
+    # 分析快照
+    ANALYTICS_SNAPSHOT_DIR: str = "data/analytics"  # 欄式快照 (.npy) 目錄，所有 worker 共用
+
+    # 請求剖析
+    PROFILING_SAMPLE_RATE: float = 0.1  # 剖析 (Server-Timing + log) 的請求比例，0 為關閉、1 為全部
+    PROFILING_N_PLUS_ONE_THRESHOLD: int = 30  # 單一請求查詢數超過此值時標記為疑似 N+1
+
+    # 慢查詢紀錄
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0  # 超過此執行時間的 SQL 記錄查詢計畫，0 為關閉
+    SLOW_QUERY_MAX_ROWS: int = 1000  # slow_query 表保留的筆數 (超過時刪除最舊的)
+    SLOW_QUERY_DATABASE_URL: str = "sqlite:///slow_query.db"  # 慢查詢紀錄的獨立資料庫 (背景寫入不與主資料庫搶寫入鎖)
+
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,25 @@
+"""
+ORM 變更歷史 - 在 flush 事件中取得欄位變更前的值
+
+供 flush 監聽器 (violation_stats_service 的統計增量、profile_service 的 stale 標記)
+判斷紀錄實際改變了什麼。
+"""
+from sqlalchemy import inspect as sa_inspect, select
+from sqlalchemy.orm.attributes import NO_VALUE
+
+
+def previous_value(obj, key: str):
+    """欄位變更前的值 (未變更時為目前值)"""
+    state = sa_inspect(obj)
+    history = state.attrs[key].history
+    if not history.added:
+        return getattr(obj, key)
+    if history.deleted:
+        return history.deleted[0]
+    if state.committed_state.get(key) is NO_VALUE and state.identity:
+        # 物件已 expire (e.g. commit 後) 才被修改，變更前的值未載入，向資料庫查詢
+        model = type(obj)
+        return state.session.execute(
+            select(getattr(model, key)).where(model.id == state.identity[0])
+        ).scalar_one_or_none()
+    return None
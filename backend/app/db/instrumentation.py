@@ -0,0 +1,77 @@
+"""
+DB Instrumentation - 連線池指標
+
+- `db_connection_checkouts_total`: 自連線池取得連線的次數
+- `db_connection_wait_seconds`: 取得連線的等待時間 (含連線池已滿時的排隊與建立新連線)
+- `db_pool_checked_out` / `db_pool_size`: scrape 時讀取的連線池狀態
+"""
+import time
+from typing import Dict, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import Pool
+
+from app.core.metrics import REGISTRY
+
+# 連線等待時間區間 (秒)；SQLite 連線池多半在 1ms 內取得
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+DB_CHECKOUTS = REGISTRY.counter(
+    "db_connection_checkouts_total", "Connections checked out from the pool", ["database"]
+)
+DB_CHECKOUT_WAIT = REGISTRY.histogram(
+    "db_connection_wait_seconds", "Time spent waiting for a pooled connection", ["database"], buckets=WAIT_BUCKETS
+)
+
+_engines: Dict[str, Engine] = {}
+
+
+def instrumented_pool_class(url: str, name: str) -> Type[Pool]:
+    """
+    URL 對應的預設連線池類別的子類別，量測 connect() 的等待時間 (name 作為 database 標籤)。
+    以 create_engine(poolclass=...) 使用；dispose() 經 Pool.recreate() 重建時沿用同一類別。
+    """
+    url = make_url(url)
+    pool_class = url.get_dialect().get_pool_class(url)
+    wait = DB_CHECKOUT_WAIT.labels(name)
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return pool_class.connect(self)
+        finally:
+            wait.observe(time.perf_counter() - started)
+
+    return type(f"Instrumented{pool_class.__name__}", (pool_class,), {"connect": connect})
+
+
+def instrument_engine(engine: Engine, name: str):
+    """
+    記錄 engine 供 scrape 時讀取連線池狀態，並計算取得連線次數。
+    監聽註冊在 engine 上，dispose() 後的新連線池仍然有效。
+    """
+    _engines[name] = engine
+    checkouts = DB_CHECKOUTS.labels(name)
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.inc()
+
+
+def _collect_pools():
+    checked_out = []
+    size = []
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if hasattr(pool, "checkedout"):
+            checked_out.append(({"database": name}, pool.checkedout()))
+        if hasattr(pool, "size"):
+            size.append(({"database": name}, pool.size()))
+    return [
+        ("db_pool_checked_out", "gauge", "Connections currently checked out", checked_out),
+        ("db_pool_size", "gauge", "Configured pool size", size),
+    ]
+
+
+REGISTRY.register_collector(_collect_pools)
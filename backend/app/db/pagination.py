@@ -0,0 +1,286 @@
+"""
+列表端點共用的分頁工具
+
+- 游標 (keyset) 分頁: 游標為不透明字串，內容是上一頁最後一筆的排序鍵與主鍵；
+  以 WHERE 條件接續查詢，深頁與第一頁成本相同
+- 相容舊的 page 參數 (OFFSET)
+- 總筆數可關閉 (include_total=false)；開啟時依 (資料世代, 篩選條件 SQL) 快取
+- 欄位投影 (fields=): SQL 只 SELECT 指定欄位，回傳 dict 而非完整物件
+"""
+import base64
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, false, inspect as sa_inspect, or_
+from sqlmodel import Session, asc, desc, func, select
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.services.generation_service import get_generation
+
+
+class InvalidCursorError(ValueError):
+    """游標無法解析或與目前的排序不符"""
+
+
+class InvalidFieldsError(ValueError):
+    """fields 參數包含不存在的欄位"""
+
+
+# ========== 排序 ==========
+def parse_sorts(model, sorts: Optional[Sequence[str]], default_sort: Sequence[str]) -> List[Tuple[Any, bool]]:
+    """
+    解析排序參數為 [(欄位, 是否遞減)]，並補上主鍵作為唯一的次序。
+
+    不存在的欄位會被忽略 (與既有行為一致)。
+    """
+    keys = []
+    for sort_field in sorts or default_sort:
+        field_name = sort_field.lstrip("-")
+        if hasattr(model, field_name):
+            keys.append((getattr(model, field_name), sort_field.startswith("-")))
+    if not keys:
+        keys = parse_sorts(model, default_sort, default_sort)
+
+    sorted_names = {column.key for column, _ in keys}
+    for pk in sa_inspect(model).primary_key:
+        if pk.key not in sorted_names:
+            keys.append((getattr(model, pk.key), False))
+    return keys
+
+
+# ========== 欄位投影 ==========
+def split_fields(fields: Optional[Sequence[str]]) -> List[str]:
+    """展開重複或以逗號分隔的欄位名稱 (去除重複，保留順序)"""
+    names: List[str] = []
+    for value in fields or ():
+        for name in value.split(","):
+            name = name.strip()
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+def parse_fields(model, fields: Optional[Sequence[str]]) -> Optional[List[str]]:
+    """
+    解析 fields 參數 (可重複或以逗號分隔，e.g. fields=code,name)。
+    未指定時回傳 None (完整物件)；包含不存在的欄位時拋出 InvalidFieldsError。
+    """
+    names = split_fields(fields)
+    if not names:
+        return None
+    columns = sa_inspect(model).columns.keys()
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+# ========== 游標 ==========
+def _sort_signature(keys: List[Tuple[Any, bool]]) -> str:
+    return ",".join(f"{'-' if descending else ''}{column.key}" for column, descending in keys)
+
+
+def _encode_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value):
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return value
+
+
+def encode_cursor(keys: List[Tuple[Any, bool]], item) -> str:
+    """以最後一筆的排序鍵建立游標"""
+    payload = {
+        "s": _sort_signature(keys),
+        "v": [_encode_value(getattr(item, column.key)) for column, _ in keys],
+    }
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(keys: List[Tuple[Any, bool]], cursor: str) -> List[Any]:
+    """解析游標並驗證排序一致，回傳各排序鍵的值"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["v"]
+        signature = payload["s"]
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Invalid cursor")
+    if signature != _sort_signature(keys) or len(values) != len(keys):
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    try:
+        return [_decode_value(column, value) for (column, _), value in zip(keys, values)]
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Invalid cursor")
+
+
+def _nullable(column) -> bool:
+    return getattr(column.expression, "nullable", True)
+
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _after(column, descending: bool, value, include_nulls: bool = True):
+    """
+    在排序中位於 value 之後的條件。SQLite 將 NULL 視為最小值:
+    遞增時 NULL 在最前、遞減時 NULL 在最後。
+    """
+    if value is None:
+        return false() if descending else column.is_not(None)
+    if descending:
+        if include_nulls and _nullable(column):
+            return or_(column < value, column.is_(None))
+        return column < value
+    return column > value
+
+
+def keyset_condition(keys: List[Tuple[Any, bool]], values: List[Any]):
+    """
+    (k1, k2, ...) 位於游標之後的 WHERE 條件 (NULL 安全)。
+
+    首鍵加上範圍界定 (k1 <= v1 / k1 >= v1) 讓 SQLite 以索引 SEARCH 直接定位，
+    而不是從頭 SCAN。遞減排序時首鍵為 NULL 的尾段不在此條件內，
+    需另以 null_tail_condition 查詢 (見 paginate)。
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        equal = [_equal(keys[j][0], values[j]) for j in range(i)]
+        clauses.append(and_(*equal, _after(column, descending, values[i], include_nulls=i > 0)))
+    condition = or_(*clauses)
+
+    leading, descending = keys[0]
+    if values[0] is not None:
+        condition = and_(leading <= values[0] if descending else leading >= values[0], condition)
+    return condition
+
+
+def null_tail_condition(keys: List[Tuple[Any, bool]], values: List[Any]):
+    """遞減排序時首鍵為 NULL 的尾段 (排在所有非 NULL 之後)；不需要時回傳 None"""
+    leading, descending = keys[0]
+    if descending and values[0] is not None and _nullable(leading):
+        return leading.is_(None)
+    return None
+
+
+# ========== 總筆數 ==========
+_count_cache: "OrderedDict[tuple, int]" = OrderedDict()
+_count_lock = threading.Lock()
+
+COUNT_CACHE_REQUESTS = REGISTRY.counter("count_cache_requests_total", "List total-count cache lookups", ["result"])
+_count_hits = COUNT_CACHE_REQUESTS.labels("hit")
+_count_misses = COUNT_CACHE_REQUESTS.labels("miss")
+
+
+def count_total(session: Session, query) -> int:
+    """
+    計算篩選後的總筆數，依 (資料世代, SQL, 參數) 快取。
+    資料只在同步時改變，相同篩選條件的總數不需重算。
+    """
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    compiled = count_query.compile(dialect=session.get_bind().dialect)
+    params = repr(sorted(compiled.params.items()))
+    generation, _ = get_generation()
+    key = (generation, hashlib.sha1(f"{compiled}|{params}".encode("utf-8")).hexdigest())
+
+    with _count_lock:
+        total = _count_cache.get(key)
+        if total is not None:
+            _count_cache.move_to_end(key)
+            _count_hits.inc()
+            return total
+
+    _count_misses.inc()
+    total = session.exec(count_query).one()
+    with _count_lock:
+        _count_cache[key] = total
+        while len(_count_cache) > settings.COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.popitem(last=False)
+    return total
+
+
+# ========== 分頁 ==========
+def paginate(
+    session: Session,
+    query,
+    model,
+    page: int = 1,
+    size: int = 20,
+    sorts: Optional[Sequence[str]] = None,
+    default_sort: Sequence[str] = ("id",),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[list, Optional[int], Optional[int], Optional[str]]:
+    """
+    套用排序與分頁。
+
+    Args:
+        query: 已套用篩選條件的 select(model)
+        page: 頁碼 (OFFSET 分頁；提供 cursor 時忽略)
+        sorts: 排序欄位 (e.g. -fine_amount)
+        default_sort: 未指定排序時使用
+        cursor: 上一頁回傳的 next_cursor
+        include_total: 是否計算總筆數
+        fields: 只查詢並回傳這些欄位 (見 parse_fields)；items 改為 dict
+
+    Returns:
+        (items, total, total_pages, next_cursor)；未計算總數時 total/total_pages 為 None
+    """
+    keys = parse_sorts(model, sorts, default_sort)
+    fields = parse_fields(model, fields)
+
+    total = count_total(session, query) if include_total else None
+    total_pages = (math.ceil(total / size) if size > 0 else 0) if total is not None else None
+
+    fetch = session.exec
+    if fields is not None:
+        # 排序鍵 (含主鍵) 一併查詢以建立游標，但不輸出；
+        # 以 Core 執行取得 Row，不建立 ORM 物件
+        selected = fields + [column.key for column, _ in keys if column.key not in fields]
+        query = query.with_only_columns(*[getattr(model, name) for name in selected])
+        fetch = session.connection().execute
+
+    query = query.order_by(*[desc(column) if descending else asc(column) for column, descending in keys])
+    null_tail = None
+    if cursor:
+        values = decode_cursor(keys, cursor)
+        null_tail = null_tail_condition(keys, values)
+        items = list(fetch(query.where(keyset_condition(keys, values)).limit(size + 1)).all())
+    else:
+        items = list(fetch(query.offset((page - 1) * size).limit(size + 1)).all())
+
+    # 非 NULL 段不足一頁時接續 NULL 尾段
+    if null_tail is not None and len(items) <= size:
+        items += fetch(query.where(null_tail).limit(size + 1 - len(items))).all()
+
+    # 多取一筆以判斷是否還有下一頁
+    next_cursor = None
+    if size > 0 and len(items) > size:
+        items = items[:size]
+        next_cursor = encode_cursor(keys, items[-1])
+
+    if fields is not None:
+        items = [{name: row._mapping[name] for name in fields} for row in items]
+
+    return items, total, total_pages, next_cursor
@@ -0,0 +1,117 @@
+"""
+SQLite FTS5 全文檢索索引 (trigram)
+
+- trigram tokenizer 以三字元為單位建立索引，中文子字串搜尋 (3 字以上) 可走索引，
+  不再需要 LIKE '%...%' 全表掃描
+- 以 external content 表建立 (不重複儲存內容)，並以 trigger 在寫入時同步；
+  UPDATE trigger 只監聽被索引的欄位，同步時只更新 last_updated 不會重建索引
+- 主資料庫每次 `SQLModel.metadata.create_all` 後確保索引存在；新建時自動 rebuild
+"""
+import logging
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event, literal_column, select, table, text
+from sqlalchemy.engine import Connection, make_url
+from sqlmodel import SQLModel
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 索引名稱 -> (來源資料表, 索引欄位)
+SEARCH_INDEXES: Dict[str, Tuple[str, Sequence[str]]] = {
+    "company_fts": ("company", ("code", "name", "abbreviation")),
+    "violation_fts": ("violation", ("company_name", "violation_content", "law_article")),
+    "environmental_violation_fts": (
+        "environmentalviolation",
+        ("company_name", "violation_reason", "law_article", "penalty_reason"),
+    ),
+}
+
+# trigram 最短可檢索長度
+TRIGRAM_MIN_LENGTH = 3
+
+
+def _exists(connection: Connection, name: str) -> bool:
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": name}
+    ).first() is not None
+
+
+def ensure_search_index(connection: Connection):
+    """建立 FTS 表與同步 trigger (已存在則略過)；新建的索引以既有資料 rebuild"""
+    for name, (source, columns) in SEARCH_INDEXES.items():
+        if not _exists(connection, source):
+            continue
+        cols = ", ".join(columns)
+        new_values = ", ".join(f"new.{c}" for c in columns)
+        old_values = ", ".join(f"old.{c}" for c in columns)
+
+        created = not _exists(connection, name)
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5("
+            f"{cols}, content='{source}', tokenize='trigram')"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {source} BEGIN "
+            f"INSERT INTO {name}(rowid, {cols}) VALUES (new.rowid, {new_values}); END"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {source} BEGIN "
+            f"INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); END"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {cols} ON {source} BEGIN "
+            f"INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.rowid, {old_values}); "
+            f"INSERT INTO {name}(rowid, {cols}) VALUES (new.rowid, {new_values}); END"
+        ))
+        if created:
+            logger.info(f"Building search index {name}...")
+            connection.execute(text(f"INSERT INTO {name}({name}) VALUES ('rebuild')"))
+
+
+def rebuild_search_index(connection: Connection):
+    """以來源資料表重建所有索引 (e.g. VACUUM 重新編號 rowid 後)"""
+    ensure_search_index(connection)
+    for name in SEARCH_INDEXES:
+        if _exists(connection, name):
+            connection.execute(text(f"INSERT INTO {name}({name}) VALUES ('rebuild')"))
+
+
+def _phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    將使用者輸入轉為 FTS5 MATCH 運算式: 以空白分隔的詞各自作為片語 (AND)。
+    少於三個字元的詞無法以 trigram 檢索，不納入；全部都太短時回傳 None。
+    """
+    terms = [term for term in query.split() if len(term) >= TRIGRAM_MIN_LENGTH]
+    if not terms:
+        return None
+    return " AND ".join(_phrase(term) for term in terms)
+
+
+def substring_condition(index: str, column: str, value: str):
+    """
+    與 `column ILIKE '%value%'` 相同的子字串條件，但以 trigram 索引查詢
+    (rowid IN (...))。value 少於三個字元時無法使用索引，回傳 None。
+    """
+    if len(value) < TRIGRAM_MIN_LENGTH:
+        return None
+    source, _ = SEARCH_INDEXES[index]
+    matches = (
+        select(literal_column("rowid"))
+        .select_from(table(index))
+        .where(literal_column(index).op("MATCH")(f"{column} : {_phrase(value)}"))
+    )
+    return literal_column(f"{source}.rowid").in_(matches)
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def _create_search_index(target, connection: Connection, **kw):
+    # 只建立在主資料庫 (archive 資料庫不提供搜尋)
+    if connection.dialect.name != "sqlite" or connection.engine.url != make_url(settings.DATABASE_URL):
+        return
+    ensure_search_index(connection)
@@ -1,10 +1,24 @@
 from sqlmodel import create_engine, Session
 from app.core.config import settings
+from app.db import search_index  # noqa: F401  (create_all 時建立 FTS 索引)
+from app.db.instrumentation import instrument_engine, instrumented_pool_class
 
 # access_token is just an example of what might be in settings, here we just use DATABASE_URL
 # connect_args={"check_same_thread": False} is needed for SQLite
-engine = create_engine(settings.DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
-archive_engine = create_engine(settings.ARCHIVE_DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+engine = create_engine(
+    settings.DATABASE_URL, echo=False, connect_args={"check_same_thread": False},
+    poolclass=instrumented_pool_class(settings.DATABASE_URL, "main"),
+)
+archive_engine = create_engine(
+    settings.ARCHIVE_DATABASE_URL, echo=False, connect_args={"check_same_thread": False},
+    poolclass=instrumented_pool_class(settings.ARCHIVE_DATABASE_URL, "archive"),
+)
+# 慢查詢紀錄只由背景 thread 寫入；鎖定時最多等待 1 秒 (sqlite3 timeout 即 busy_timeout)，逾時捨棄該批紀錄
+slow_query_engine = create_engine(
+    settings.SLOW_QUERY_DATABASE_URL, echo=False, connect_args={"check_same_thread": False, "timeout": 1.0},
+)
+instrument_engine(engine, "main")
+instrument_engine(archive_engine, "archive")
 
 def get_session():
     with Session(engine) as session:
@@ -13,3 +27,7 @@ def get_session():
 def get_archive_session():
     with Session(archive_engine) as session:
         yield session
+
+def get_slow_query_session():
+    with Session(slow_query_engine) as session:
+        yield session
@@ -1,11 +1,44 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlmodel import Session, SQLModel
 from starlette.middleware.cors import CORSMiddleware
 
+from app.api.cache import warm_up
 from app.api.main import api_router
+from app.api.routes import metrics
 from app.core.config import settings
+from app.db.pagination import InvalidCursorError, InvalidFieldsError
+from app.db.session import engine
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.etag import ETagMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.services.slow_query_service import install_slow_query_log
+from app.services.suggest_service import SuggestService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 確保物化表存在 (尚未執行 materialize 時排行榜會退回即時計算)
+    SQLModel.metadata.create_all(engine)
+    # 慢查詢紀錄 (只在 API 行程；同步 CLI 的大量寫入不列入)
+    install_slow_query_log(engine)
+    # 建立公司搜尋建議索引 (之後於資料世代改變時重建)
+    with Session(engine) as session:
+        SuggestService().get_index(session)
+    await warm_up(app, settings.RESPONSE_CACHE_WARMUP_PATHS)
+    yield
+
+
+app = FastAPI(title="Bossy Radar API", lifespan=lifespan)
 
+# 回應壓縮 (brotli / gzip)；最內層，回應快取已預壓縮的回應原樣通過
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
 
-app = FastAPI(title="Bossy Radar API")
+# 條件式 GET (ETag / Last-Modified)；先註冊以便 CORS 也套用在 304 回應
+app.add_middleware(ETagMiddleware)
 
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -16,7 +49,21 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# 抽樣請求的剖析 (Server-Timing)；總耗時包含其他 middleware
+app.add_middleware(ProfilingMiddleware)
+
+# Prometheus 指標 (延遲、回應大小、進行中請求數)；最外層
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
+app.include_router(metrics.router)
+
+
+@app.exception_handler(InvalidCursorError)
+@app.exception_handler(InvalidFieldsError)
+async def invalid_query_handler(request: Request, exc: ValueError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,199 @@
+"""
+回應壓縮 Middleware (brotli / gzip)
+
+依 Accept-Encoding 選擇 brotli (已安裝 `brotli` 套件時) 或 gzip 壓縮回應:
+- 串流回應逐段壓縮 (每段 flush，客戶端可即時解壓)
+- 已設定 Content-Encoding、206 部分回應與已壓縮格式 (圖片等) 原樣通過
+- 小於 minimum_size 的單段回應不壓縮
+
+不依賴 Starlette GZipMiddleware 的內部 responder (其建構參數隨版本變動)。
+
+回應快取 (app/api/cache.py) 會以 `compress` 預先壓縮並保存各編碼版本，
+命中時直接回傳已壓縮的 bytes，這類回應不會在此重新壓縮。
+"""
+import gzip
+import zlib
+from typing import Dict, Optional
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # 選用依賴: 未安裝時只提供 gzip
+    brotli = None
+
+# 偏好順序 (同 q 值時)
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# 超過此大小的區塊移至 worker thread 壓縮，避免阻塞 event loop
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+# 已壓縮或需即時送出的格式不再壓縮 ("type/*" 表示整個主類型)
+EXCLUDED_CONTENT_TYPES = {
+    "application/gzip", "application/x-gzip", "application/zip",
+    "text/event-stream", "image/*", "audio/*", "video/*", "font/woff", "font/woff2",
+}
+
+
+def _parse_accept_encoding(accept_encoding: str) -> Dict[str, float]:
+    """解析 Accept-Encoding (e.g. "br;q=1.0, gzip;q=0.8, *;q=0")"""
+    preferences: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        preferences[name] = quality
+    return preferences
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """依 Accept-Encoding 選擇壓縮編碼；不接受任何支援的編碼時回傳 None"""
+    preferences = _parse_accept_encoding(accept_encoding)
+    wildcard = preferences.get("*", 0.0)
+    candidates = [
+        (preferences.get(encoding, wildcard), encoding)
+        for encoding in SUPPORTED_ENCODINGS
+        if preferences.get(encoding, wildcard) > 0
+    ]
+    if not candidates:
+        return None
+    best = max(quality for quality, _ in candidates)
+    return next(encoding for quality, encoding in candidates if quality == best)
+
+
+def compress(data: bytes, encoding: str, precompress: bool = False) -> bytes:
+    """
+    以指定編碼壓縮。
+
+    Args:
+        precompress: 快取用的預壓縮 (只壓一次，使用較高的壓縮等級)
+    """
+    if encoding == "br":
+        quality = settings.PRECOMPRESS_BROTLI_QUALITY if precompress else settings.BROTLI_QUALITY
+        return brotli.compress(data, quality=quality)
+    if encoding == "gzip":
+        level = settings.PRECOMPRESS_GZIP_LEVEL if precompress else settings.GZIP_COMPRESS_LEVEL
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        return self._compressor.compress(body) + self._compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self._compressor.process(body)
+        return data + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+def _new_compressor(encoding: str):
+    if encoding == "br":
+        return _BrotliCompressor(settings.BROTLI_QUALITY)
+    return _GzipCompressor(settings.GZIP_COMPRESS_LEVEL)
+
+
+def _is_excluded(media_type: str) -> bool:
+    return media_type in EXCLUDED_CONTENT_TYPES or f"{media_type.partition('/')[0]}/*" in EXCLUDED_CONTENT_TYPES
+
+
+class CompressionResponder:
+    """單一請求的 send wrapper；encoding 為 None 時不壓縮 (仍加上 Vary)"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, encoding: Optional[str]):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.send: Optional[Send] = None
+        self.initial_message: Optional[Message] = None
+        self.passthrough = False
+        self.started = False
+        self.compressor = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if self.compressor is None:
+            self.compressor = _new_compressor(self.encoding)
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(self.compressor.compress, body, more_body)
+        return self.compressor.compress(body, more_body)
+
+    async def send_with_compression(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # 待第一段 body 決定是否壓縮後才送出 (需修改 headers)
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+            self.passthrough = "content-encoding" in headers or message["status"] == 206 or _is_excluded(media_type)
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if self.passthrough or message_type != "http.response.body":
+            # pathsend (檔案) 不壓縮；trailers 等訊息原樣轉送
+            if message_type == "http.response.pathsend" and not self.passthrough and not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.started:
+            # 串流回應的後續區塊
+            if self.encoding is not None:
+                message["body"] = await self._compress(body, more_body)
+            await self.send(message)
+            return
+
+        self.started = True
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if len(body) < self.minimum_size and not more_body:
+            self.encoding = None
+        if self.encoding is not None:
+            message["body"] = await self._compress(body, more_body)
+            headers["Content-Encoding"] = self.encoding
+            if more_body or self.initial_message.get("trailers", False):
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+        await self.send(self.initial_message)
+        await self.send(message)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        await CompressionResponder(self.app, self.minimum_size, encoding)(scope, receive, send)
@@ -0,0 +1,120 @@
+"""
+ETag / 條件式 GET Middleware
+
+API 回應只取決於資料世代、程式版本與請求 URL，因此 ETag 直接由
+(世代, 版本, 路徑, 查詢參數) 計算，不需要先執行路由。客戶端帶 If-None-Match /
+If-Modified-Since 且資料未變時，在碰到資料庫之前就回傳 304。
+
+- 版本為 BUILD_ID (未設定時為 app 原始碼的雜湊)：只部署新程式、未重新同步時，
+  回應格式的變更不會被舊的 304 擋住
+- 只處理 API 路徑 (`/api/v1`)；`/docs`、`/openapi.json` 等不隨資料世代變動
+- `If-None-Match: *` 需要先確認資源存在，因此執行路由，回應 200 時才改回 304
+"""
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Sequence
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.services.generation_service import get_generation
+
+# 加上 ETag 的路徑
+INCLUDED_PATH_PREFIXES: Sequence[str] = ("/api/v1/",)
+# 回應內容不只取決於資料世代的路徑 (不加 ETag)
+EXCLUDED_PATH_PREFIXES: Sequence[str] = ("/api/v1/system/slow-queries",)
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+@lru_cache(maxsize=1)
+def build_version() -> str:
+    """程式版本: BUILD_ID，未設定時為 app/ 下所有 .py 的內容雜湊 (同一版程式的各 worker 相同)"""
+    if settings.BUILD_ID:
+        return settings.BUILD_ID
+    digest = hashlib.sha1()
+    for path in sorted(APP_DIR.rglob("*.py")):
+        digest.update(path.relative_to(APP_DIR).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def compute_etag(generation: int, request: Request) -> str:
+    """由資料世代、程式版本與請求 URL 計算弱 ETag"""
+    key = f"{build_version()}:{request.url.path}?{request.url.query}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return f'W/"{generation}-{digest}"'
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """比對 If-None-Match (弱比對，支援多值；* 另外處理)"""
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _not_modified_since(last_modified, if_modified_since: str) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return last_modified.astimezone().replace(microsecond=0) <= since
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """為 GET 回應加上 ETag / Last-Modified，並以 304 回應未變更的條件式請求"""
+
+    def __init__(
+        self,
+        app,
+        included_path_prefixes: Optional[Sequence[str]] = None,
+        excluded_path_prefixes: Optional[Sequence[str]] = None,
+    ):
+        super().__init__(app)
+        self.included_path_prefixes = tuple(included_path_prefixes or INCLUDED_PATH_PREFIXES)
+        self.excluded_path_prefixes = tuple(excluded_path_prefixes or EXCLUDED_PATH_PREFIXES)
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        path = request.url.path
+        if (
+            request.method not in ("GET", "HEAD")
+            or not path.startswith(self.included_path_prefixes)
+            or path.startswith(self.excluded_path_prefixes)
+        ):
+            return await call_next(request)
+
+        generation, updated_at = get_generation()
+        etag = compute_etag(generation, request)
+        headers = {"ETag": etag, "Cache-Control": settings.HTTP_CACHE_CONTROL}
+        if updated_at is not None:
+            # 資料世代以本地時間記錄，Last-Modified 需為 GMT
+            headers["Last-Modified"] = format_datetime(updated_at.astimezone(), usegmt=True)
+        # 304 不經過壓縮層，需自行帶上 200 回應的 Vary，共用快取才不會混用不同編碼的版本
+        not_modified_headers = {**headers, "Vary": "Accept-Encoding"}
+
+        # 條件式請求: If-None-Match 優先於 If-Modified-Since (RFC 9110)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and if_none_match.strip() == "*":
+            # 「任何版本」: 只有資源存在 (路由回應 200) 時才視為符合
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            async for _ in response.body_iterator:
+                pass
+            return Response(status_code=304, headers=not_modified_headers)
+        if if_none_match is not None:
+            if _etag_matches(etag, if_none_match):
+                return Response(status_code=304, headers=not_modified_headers)
+        elif updated_at is not None and request.headers.get("if-modified-since"):
+            if _not_modified_since(updated_at, request.headers["if-modified-since"]):
+                return Response(status_code=304, headers=not_modified_headers)
+
+        response = await call_next(request)
+        if response.status_code == 200:
+            response.headers.update(headers)
+        return response
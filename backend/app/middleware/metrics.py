@@ -0,0 +1,104 @@
+"""
+HTTP Metrics Middleware
+
+記錄每個路由的請求延遲、回應大小與進行中的請求數 (Prometheus 指標，見 app/core/metrics.py)。
+路由標籤使用路由的路徑樣板 (e.g. /api/v1/companies/{code})，未對應到路由的請求
+歸入 "unmatched"，避免標籤數量隨 URL 無限增加。
+內層 middleware 直接回應 (e.g. ETag 的 304) 而未經過 Router 時，以路徑樣板比對出路由。
+"""
+import time
+from typing import Dict, List, Optional, Pattern, Set, Tuple
+
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import REGISTRY
+
+# 回應大小區間 (bytes)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests currently being served")
+HTTP_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+HTTP_RESPONSE_SIZE = REGISTRY.histogram(
+    "http_response_size_bytes", "HTTP response body size (after compression)", ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+
+
+def _route_templates(app) -> Dict[int, str]:
+    """路由物件 -> 完整路徑樣板 (含 include_router 的 prefix)"""
+    try:
+        from fastapi.routing import iter_route_contexts
+    except ImportError:
+        # 舊版 FastAPI 的 include_router 會複製路由，route.path 即為完整路徑
+        return {}
+    return {id(context.original_route): context.path for context in iter_route_contexts(app.routes)}
+
+
+def _route_patterns(app) -> List[Tuple[Pattern, Optional[Set[str]], str]]:
+    """依路由順序的 (路徑 regex, methods, 路徑樣板)"""
+    try:
+        from fastapi.routing import iter_route_contexts
+        routes = [(context.path, context.methods) for context in iter_route_contexts(app.routes)]
+    except ImportError:
+        routes = [(route.path, getattr(route, "methods", None)) for route in app.routes if hasattr(route, "path")]
+    return [(compile_path(path)[0], methods, path) for path, methods in routes]
+
+
+class MetricsMiddleware:
+    """放在最外層，延遲與回應大小才包含其他 middleware (壓縮後的大小)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._templates: Optional[Dict[int, str]] = None
+        self._patterns: Optional[List[Tuple[Pattern, Optional[Set[str]], str]]] = None
+
+    def _route_label(self, scope: Scope) -> str:
+        # 路由比對後 Router 會將 route 寫入 scope
+        route = scope.get("route")
+        if route is None:
+            return self._match_route(scope)
+        if self._templates is None:
+            self._templates = _route_templates(scope["app"])
+        return self._templates.get(id(route)) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+    def _match_route(self, scope: Scope) -> str:
+        """請求未經過 Router 時，依路徑與 method 比對路徑樣板"""
+        if self._patterns is None:
+            self._patterns = _route_patterns(scope["app"])
+        path, method = scope["path"], scope["method"]
+        for regex, methods, template in self._patterns:
+            if regex.match(path) and (methods is None or method in methods):
+                return template
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        size = 0
+
+        async def send_with_metrics(message: Message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route_path = self._route_label(scope)
+            method = scope["method"]
+            HTTP_DURATION.labels(method, route_path, status_code).observe(time.perf_counter() - started)
+            HTTP_RESPONSE_SIZE.labels(method, route_path).observe(size)
@@ -0,0 +1,201 @@
+"""
+Request Profiling Middleware - 請求層級效能剖析
+
+依 PROFILING_SAMPLE_RATE 抽樣請求，記錄:
+- SQL 查詢數、SQL 總耗時與最慢的一個 statement (SQLAlchemy before/after_cursor_execute)
+- 序列化耗時 (FastJSONResponse 與回應快取的序列化，見 `measure_serialization`)
+- 請求總耗時
+
+結果以 `Server-Timing` 標頭回傳 (瀏覽器 DevTools 的 Timing 分頁可直接檢視)，
+並寫入 key=value 格式的 log (另以 extra={"profile": {...}} 提供給 JSON formatter)。
+查詢數超過 PROFILING_N_PLUS_ONE_THRESHOLD 的請求以 WARNING 標記為疑似 N+1，
+並附上重複最多次的 statement。
+
+未抽中的請求只多一次亂數判斷，每個查詢只多一次 ContextVar 讀取，可常駐於正式環境。
+"""
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# log 中 statement 的最大長度
+MAX_STATEMENT_LENGTH = 300
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _compact(statement: Optional[str]) -> Optional[str]:
+    if statement is None:
+        return None
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    if len(statement) > MAX_STATEMENT_LENGTH:
+        return statement[:MAX_STATEMENT_LENGTH] + "..."
+    return statement
+
+
+class RequestProfile:
+    """單一請求的剖析結果 (時間單位: 秒)"""
+    __slots__ = (
+        "started", "query_count", "sql_time", "slowest_time", "slowest_statement",
+        "serialize_time", "statements",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.serialize_time = 0.0
+        self.statements: Counter = Counter()
+
+    def record_query(self, statement: str, duration: float):
+        self.query_count += 1
+        self.sql_time += duration
+        self.statements[statement] += 1
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def most_repeated(self):
+        """(statement, 次數)；沒有查詢時為 (None, 0)"""
+        if not self.statements:
+            return None, 0
+        return self.statements.most_common(1)[0]
+
+    def server_timing(self) -> str:
+        total = self.elapsed()
+        app = max(total - self.sql_time - self.serialize_time, 0.0)
+        return ", ".join([
+            f'db;dur={self.sql_time * 1000:.2f};desc="{self.query_count} queries"',
+            f"db-slowest;dur={self.slowest_time * 1000:.2f}",
+            f"serialize;dur={self.serialize_time * 1000:.2f}",
+            f"app;dur={app * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ])
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """目前請求的剖析 (未抽樣時為 None)；threadpool 中的同步路由也能取得"""
+    return _current.get()
+
+
+@contextmanager
+def measure_serialization() -> Iterator[None]:
+    """將區塊耗時計入目前請求的序列化時間"""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serialize_time += time.perf_counter() - started
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is None:
+        return
+    started = conn.info.get("profiling_started")
+    if started:
+        profile.record_query(statement, time.perf_counter() - started.pop())
+
+
+class ProfilingMiddleware:
+    """
+    抽樣請求的剖析 (放在最外層，總耗時才包含其他 middleware)。
+
+    Server-Timing 於回應開始時計算；串流回應 (e.g. 匯出) 之後的查詢只計入 log。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: Optional[float] = None,
+        n_plus_one_threshold: Optional[int] = None,
+    ):
+        self.app = app
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.n_plus_one_threshold = (
+            settings.PROFILING_N_PLUS_ONE_THRESHOLD if n_plus_one_threshold is None else n_plus_one_threshold
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        token = _current.set(profile)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._log(scope, status_code, profile)
+
+    def _log(self, scope: Scope, status_code: int, profile: RequestProfile):
+        total = profile.elapsed()
+        statement, repeated = profile.most_repeated()
+        suspected_n_plus_one = profile.query_count > self.n_plus_one_threshold
+        path = scope["path"] + (f"?{scope['query_string'].decode('latin-1')}" if scope.get("query_string") else "")
+        data = {
+            "method": scope["method"],
+            "path": path,
+            "status": status_code,
+            "total_ms": round(total * 1000, 2),
+            "queries": profile.query_count,
+            "sql_ms": round(profile.sql_time * 1000, 2),
+            "slowest_ms": round(profile.slowest_time * 1000, 2),
+            "serialize_ms": round(profile.serialize_time * 1000, 2),
+            "n_plus_one": suspected_n_plus_one,
+        }
+        message = " ".join(f"{key}={value}" for key, value in data.items())
+        if suspected_n_plus_one:
+            data["repeated"] = repeated
+            data["repeated_statement"] = _compact(statement)
+            logger.warning(
+                f"{message} repeated={repeated} repeated_statement=\"{data['repeated_statement']}\"",
+                extra={"profile": data},
+            )
+        else:
+            data["slowest_statement"] = _compact(profile.slowest_statement)
+            if data["slowest_statement"]:
+                message += f" slowest_statement=\"{data['slowest_statement']}\""
+            logger.info(message, extra={"profile": data})
@@ -5,3 +5,11 @@ from .non_manager_salary import NonManagerSalary
 from .welfare_policy import WelfarePolicy
 from .salary_adjustment import SalaryAdjustment
 from .environmental_violation import EnvironmentalViolation
+from .leaderboard_entry import LeaderboardEntry
+from .data_generation import DataGeneration
+from .company_profile import CompanyProfile
+from .violation_stat import ViolationStat
+from .violation_facet import ViolationFacet
+from .industry_benchmark import IndustryBenchmark
+from .industry_percentile import IndustryPercentile
+from .slow_query import SlowQuery
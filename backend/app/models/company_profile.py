@@ -0,0 +1,16 @@
+"""
+公司完整資料物化表 - 每家公司一份序列化後的 profile JSON
+"""
+from datetime import datetime
+from sqlalchemy import Column, LargeBinary
+from sqlmodel import Field, SQLModel
+
+
+class CompanyProfile(SQLModel, table=True):
+    """公司 profile 文件 (GET /companies/{code}/profile 直接回傳)"""
+    __tablename__ = "company_profile"
+
+    company_code: str = Field(primary_key=True, description="公司代號")
+    document: bytes = Field(sa_column=Column(LargeBinary, nullable=False), description="序列化後的 CompanyProfileResponse (JSON)")
+    stale: bool = Field(default=False, index=True, description="關聯資料已變更，待重建")
+    updated_at: datetime = Field(default_factory=datetime.now, description="最後重建時間")
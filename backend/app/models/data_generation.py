@@ -0,0 +1,15 @@
+"""
+資料世代 (Data Generation) - 每次同步遞增，用於 HTTP 快取驗證與回應快取失效
+"""
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class DataGeneration(SQLModel, table=True):
+    """資料世代 (單列表)"""
+    __tablename__ = "data_generation"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    generation: int = Field(default=0, description="資料世代 (每次同步 +1)")
+    updated_at: datetime = Field(default_factory=datetime.now, description="最後同步時間")
@@ -0,0 +1,30 @@
+"""
+產業基準統計物化表 - 於同步結束後以 pandas 一次計算各產業/年度的分布
+"""
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class IndustryBenchmark(SQLModel, table=True):
+    """單一產業、年度、指標的分布統計"""
+    __tablename__ = "industry_benchmark"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    # 統計範圍
+    industry: str = Field(index=True, description="產業類別")
+    year: int = Field(index=True, description="民國年")
+    metric: str = Field(description="指標 (avg_salary/median_salary/eps/avg_salary_expense/avg_benefit)")
+
+    # 分布統計
+    count: int = Field(description="公司數")
+    mean: Optional[float] = Field(default=None, description="平均數")
+    p10: Optional[float] = Field(default=None, description="第 10 百分位數")
+    p25: Optional[float] = Field(default=None, description="第 25 百分位數")
+    p50: Optional[float] = Field(default=None, description="中位數")
+    p75: Optional[float] = Field(default=None, description="第 75 百分位數")
+    p90: Optional[float] = Field(default=None, description="第 90 百分位數")
+
+    # System
+    created_at: datetime = Field(default_factory=datetime.now, description="建立時間")
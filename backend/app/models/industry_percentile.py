@@ -0,0 +1,29 @@
+"""
+公司於同產業的百分位排名 - 與 industry_benchmark 同時計算
+"""
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class IndustryPercentile(SQLModel, table=True):
+    """單一公司於同產業、年度、指標中的百分位排名"""
+    __tablename__ = "industry_percentile"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    # 統計範圍
+    industry: str = Field(index=True, description="產業類別")
+    year: int = Field(index=True, description="民國年")
+    metric: str = Field(description="指標 (同 IndustryBenchmark.metric)")
+
+    # 公司
+    company_code: str = Field(index=True, description="公司代號")
+    company_name: str = Field(description="公司名稱")
+
+    # 排名
+    value: float = Field(description="指標數值")
+    percentile: float = Field(description="百分位排名 (0-100，同產業中數值小於等於此公司的比例)")
+
+    # System
+    created_at: datetime = Field(default_factory=datetime.now, description="建立時間")
@@ -0,0 +1,41 @@
+"""
+排行榜物化表 - 於同步結束後一次計算所有排行榜
+"""
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class LeaderboardEntry(SQLModel, table=True):
+    """排行榜單筆項目 (每個排行榜的每個名次一筆)"""
+    __tablename__ = "leaderboard_entry"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    # 排行榜定位
+    board: str = Field(index=True, description="排行榜 (violation_all_time/violation_yearly/salary/salary_by_industry)")
+    year: Optional[int] = Field(default=None, description="民國年 (歷年累計為 None)")
+    industry: Optional[str] = Field(default=None, description="產業別 (僅 salary_by_industry)")
+    ranking: str = Field(description="排行類型 (e.g. top_by_count, bottom_by_median)")
+    rank: int = Field(description="名次 (從 1 開始)")
+    latest_year: Optional[int] = Field(default=None, description="物化時的最新年度 (民國年)，讀取時依此補齊空榜")
+
+    # 公司
+    company_code: str = Field(description="公司代號")
+    company_name: str = Field(description="公司名稱")
+
+    # 違規統計
+    labor_count: Optional[int] = Field(default=None, description="勞動違規次數")
+    labor_fine: Optional[int] = Field(default=None, description="勞動違規罰鍰")
+    env_count: Optional[int] = Field(default=None, description="環境違規次數")
+    env_fine: Optional[int] = Field(default=None, description="環境違規罰鍰")
+    total_count: Optional[int] = Field(default=None, description="違規總次數")
+    total_fine: Optional[int] = Field(default=None, description="違規總罰鍰")
+
+    # 薪資統計
+    avg_salary: Optional[int] = Field(default=None, description="平均薪資(仟元)")
+    median_salary: Optional[int] = Field(default=None, description="薪資中位數(仟元)")
+    eps: Optional[float] = Field(default=None, description="每股盈餘(元/股)")
+
+    # System
+    created_at: datetime = Field(default_factory=datetime.now, description="建立時間")
@@ -0,0 +1,27 @@
+"""
+慢查詢紀錄 - 超過 SLOW_QUERY_THRESHOLD_MS 的 SQL 與其查詢計畫
+
+存於獨立資料庫 (SLOW_QUERY_DATABASE_URL)，因此使用自己的 registry，
+不列入 SQLModel.metadata (主資料庫與 archive 的 create_all 不會建立此表)。
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import registry
+from sqlmodel import Field, SQLModel
+
+
+class SlowQueryBase(SQLModel, registry=registry()):
+    pass
+
+
+class SlowQuery(SlowQueryBase, table=True):
+    """單次慢查詢 (只保留最新 SLOW_QUERY_MAX_ROWS 筆)"""
+    __tablename__ = "slow_query"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    fingerprint: str = Field(index=True, description="正規化 statement 的雜湊 (參數與 IN 清單長度不同視為同一查詢)")
+    statement: str = Field(description="SQL statement")
+    parameters: Optional[str] = Field(default=None, description="綁定參數 (JSON)")
+    elapsed_ms: float = Field(description="執行時間 (毫秒)")
+    query_plan: Optional[str] = Field(default=None, description="EXPLAIN QUERY PLAN 輸出 (每行一個節點)")
+    created_at: datetime = Field(default_factory=datetime.now, index=True, description="發生時間")
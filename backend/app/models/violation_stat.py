@@ -0,0 +1,17 @@
+"""
+違規統計彙總表 - 於寫入違規紀錄時增量維護
+"""
+from sqlmodel import Field, SQLModel
+
+
+class ViolationStat(SQLModel, table=True):
+    """單一公司、年度、來源類別的違規次數與罰鍰合計"""
+    __tablename__ = "violation_stats"
+
+    company_code: str = Field(primary_key=True, description="公司代號")
+    year: int = Field(primary_key=True, description="處分日期西元年 (處分日期不明為 0)")
+    source: str = Field(primary_key=True, description="違規類型 (labor: 勞動違規 / env: 環境違規)")
+    category: str = Field(primary_key=True, description="資料來源 (勞動: data_source) 或污染類別 (環境: violation_type)，無則為空字串")
+
+    count: int = Field(default=0, description="違規次數")
+    fine: int = Field(default=0, description="罰鍰合計")
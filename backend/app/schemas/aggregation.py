@@ -17,15 +17,43 @@ from app.schemas.environmental_violation import EnvironmentalViolationPublic
 
 
 # ========== Company Profile ==========
+class ViolationYearStat(BaseModel):
+    """單一年度違規統計"""
+    year: Optional[int] = Field(description="處分年度 (西元年，無處分日期為 None)")
+    count: int
+    fine: int
+
+
+class ViolationSummary(BaseModel):
+    """違規統計 (全部紀錄)"""
+    total_count: int = 0
+    total_fine: int = 0
+    by_year: List[ViolationYearStat] = []
+
+
 class CompanyProfileResponse(BaseModel):
-    """單一公司完整資料"""
+    """
+    單一公司完整資料
+
+    violations / environmental_violations 只包含最新 N 筆
+    (PROFILE_LATEST_RECORDS)，完整紀錄請使用
+    /companies/{code}/violations 與 /companies/{code}/environmental-violations。
+    """
     company: CompanyResponse
-    violations: List[ViolationPublic]
+    violations: List[ViolationPublic] = Field(description="最新的勞動違規紀錄")
+    violation_summary: ViolationSummary = Field(default_factory=ViolationSummary, description="勞動違規統計")
     employee_benefits: List[EmployeeBenefitResponse]
     non_manager_salaries: List[NonManagerSalaryResponse]
     welfare_policies: List[WelfarePolicyResponse]
     salary_adjustments: List[SalaryAdjustmentResponse]
-    environmental_violations: List[EnvironmentalViolationPublic] = Field(description="環境違規紀錄")
+    environmental_violations: List[EnvironmentalViolationPublic] = Field(description="最新的環境違規紀錄")
+    environmental_violation_summary: ViolationSummary = Field(default_factory=ViolationSummary, description="環境違規統計")
+
+
+class CompanyProfilesResponse(BaseModel):
+    """多家公司完整資料 (依請求順序)"""
+    items: List[CompanyProfileResponse]
+    not_found: List[str] = Field(default_factory=list, description="查無資料的公司代號")
 
 
 # ========== Yearly Summary ==========
@@ -0,0 +1,55 @@
+"""
+Analytics 相關 schemas
+"""
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+
+class AnalyticsMetric(str, Enum):
+    """分析快照指標 (每家公司每年度一筆)"""
+    avg_salary = "avg_salary"  # 非主管全時員工平均薪資(仟元) (t100sb15)
+    median_salary = "median_salary"  # 非主管全時員工薪資中位數(仟元) (t100sb15)
+    eps = "eps"  # 每股盈餘(元/股) (t100sb15)
+    avg_salary_expense = "avg_salary_expense"  # 平均員工薪資費用(仟元/人) (t100sb14)
+    avg_benefit = "avg_benefit"  # 平均員工福利費用(仟元/人) (t100sb14)
+    labor_count = "labor_count"  # 勞動違規次數
+    labor_fine = "labor_fine"  # 勞動違規罰鍰
+    env_count = "env_count"  # 環境違規次數
+    env_fine = "env_fine"  # 環境違規罰鍰
+    total_count = "total_count"  # 違規總次數
+    total_fine = "total_fine"  # 違規總罰鍰
+
+
+class SortOrder(str, Enum):
+    desc = "desc"
+    asc = "asc"
+
+
+class AnalyticsItem(BaseModel):
+    """排名項目"""
+    company_code: str
+    company_name: str
+    industry: Optional[str] = None
+    market_type: Optional[str] = None
+    year: int
+    value: float
+
+
+class AnalyticsTopResponse(BaseModel):
+    """Top-K 排名"""
+    metric: AnalyticsMetric
+    order: SortOrder
+    matched: int  # 符合過濾條件且有數值的筆數
+    items: List[AnalyticsItem]
+    snapshot_built_at: datetime
+
+
+class AnalyticsPercentilesResponse(BaseModel):
+    """分布統計"""
+    metric: AnalyticsMetric
+    count: int
+    mean: Optional[float] = None
+    percentiles: Dict[str, Optional[float]]  # e.g. {"p50": 812.0}
+    snapshot_built_at: datetime
@@ -6,10 +6,11 @@ T = TypeVar("T")
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
-    total: int
+    total: Optional[int] = None        # include_total=false 時為 None
     page: int
     size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # 下一頁游標 (最後一頁為 None)
 
 class CompanyResponse(Company):
     pass
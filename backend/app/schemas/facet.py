@@ -0,0 +1,48 @@
+"""
+Facet (違規多維度統計) 相關 schemas
+"""
+from enum import Enum
+from typing import Dict, List, Optional, Union
+from pydantic import BaseModel
+
+
+class ViolationFacetField(str, Enum):
+    """勞動違規可分組的維度"""
+    law_article = "law_article"  # 違反法規條款
+    authority = "authority"  # 主管機關
+    data_source = "data_source"  # 資料來源
+    industry = "industry"  # 產業別
+    market_type = "market_type"  # 市場別
+    year = "year"  # 處分年度 (西元)
+    month = "month"  # 處分年月 (YYYY-MM)
+
+
+class EnvironmentalViolationFacetField(str, Enum):
+    """環境違規可分組的維度"""
+    law_article = "law_article"  # 違反法令
+    authority = "authority"  # 裁處機關
+    violation_type = "violation_type"  # 污染類別
+    industry = "industry"  # 產業別
+    market_type = "market_type"  # 市場別
+    year = "year"  # 裁處年度 (西元)
+    month = "month"  # 裁處年月 (YYYY-MM)
+
+
+class FacetOrder(str, Enum):
+    count = "count"  # 依違規次數 (多到少)
+    fine = "fine"  # 依罰鍰合計 (多到少)
+
+
+class FacetBucket(BaseModel):
+    """單一分組"""
+    key: Dict[str, Optional[Union[int, str]]]  # e.g. {"law_article": "勞動基準法第24條", "year": 2024}
+    count: int
+    fine: int
+
+
+class FacetResponse(BaseModel):
+    """多維度統計"""
+    by: List[str]
+    total_count: int  # 符合過濾條件的違規總次數 (不受 limit 影響)
+    total_fine: int
+    buckets: List[FacetBucket]
@@ -0,0 +1,43 @@
+"""
+Industry 相關 schemas
+"""
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class BenchmarkMetric(str, Enum):
+    """產業基準指標"""
+    avg_salary = "avg_salary"  # 非主管全時員工平均薪資(仟元) (t100sb15)
+    median_salary = "median_salary"  # 非主管全時員工薪資中位數(仟元) (t100sb15)
+    eps = "eps"  # 每股盈餘(元/股) (t100sb15)
+    avg_salary_expense = "avg_salary_expense"  # 平均員工薪資費用(仟元/人) (t100sb14)
+    avg_benefit = "avg_benefit"  # 平均員工福利費用(仟元/人) (t100sb14)
+
+
+class CompanyPercentile(BaseModel):
+    """公司於同產業的百分位排名"""
+    company_code: str
+    company_name: str
+    value: float
+    percentile: float  # 0-100
+
+
+class IndustryMetricStats(BaseModel):
+    """單一年度、指標的產業分布"""
+    year: int
+    metric: BenchmarkMetric
+    count: int
+    mean: Optional[float] = None
+    p10: Optional[float] = None
+    p25: Optional[float] = None
+    p50: Optional[float] = None
+    p75: Optional[float] = None
+    p90: Optional[float] = None
+    companies: Optional[List[CompanyPercentile]] = None  # include_companies=true 時提供 (依百分位由高至低)
+
+
+class IndustryStatsResponse(BaseModel):
+    """產業基準統計"""
+    industry: str
+    stats: List[IndustryMetricStats]
@@ -1,10 +1,20 @@
 """
 Leaderboard 相關 schemas
 """
+from enum import Enum
 from typing import Dict, List, Optional
 from pydantic import BaseModel
 
 
+class LeaderboardMetric(str, Enum):
+    """排行榜指標 (對應 /leaderboards 的 metrics 參數)"""
+    violation_count = "violation_count"  # 違規次數 (violation_all_time / violation_yearly)
+    violation_fine = "violation_fine"  # 違規罰鍰 (violation_all_time / violation_yearly)
+    avg_salary = "avg_salary"  # 平均薪資 (salary)
+    median_salary = "median_salary"  # 薪資中位數 (salary / salary_by_industry)
+    eps = "eps"  # 每股盈餘 (salary_by_industry)
+
+
 class LeaderboardItem(BaseModel):
     """排行榜基本項目"""
     company_code: str
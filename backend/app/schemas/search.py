@@ -0,0 +1,28 @@
+"""
+全文檢索 API Schemas
+"""
+from datetime import date
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class CompanySearchHit(BaseModel):
+    """公司搜尋結果"""
+    code: str
+    name: str
+    abbreviation: Optional[str] = None
+    market_type: str
+    industry: Optional[str] = None
+    score: Optional[float] = Field(None, description="相關度 (越大越相關；短關鍵字退回 LIKE 時為 None)")
+
+
+class ViolationSearchHit(BaseModel):
+    """違規紀錄搜尋結果 (勞動 / 環境)"""
+    id: int
+    company_code: Optional[str] = None
+    company_name: str
+    penalty_date: Optional[date] = None
+    fine_amount: int = 0
+    law_article: Optional[str] = None
+    snippet: Optional[str] = Field(None, description="命中片段 (以【】標示關鍵字)")
+    score: Optional[float] = Field(None, description="相關度 (越大越相關；短關鍵字退回 LIKE 時為 None)")
@@ -1,5 +1,6 @@
 from typing import Dict, Optional, List
 from datetime import datetime
+from enum import Enum
 from pydantic import BaseModel
 
 class SyncStatusItem(BaseModel):
@@ -11,3 +12,21 @@ class SyncStatusResponse(BaseModel):
     violations: Dict[str, SyncStatusItem]
     environmental_violations: Dict[str, SyncStatusItem]
     mops: Dict[str, SyncStatusItem]
+
+
+class SlowQueryOrder(str, Enum):
+    total = "total"  # 累計耗時
+    max = "max"  # 單次最長
+    count = "count"  # 次數
+
+class SlowQueryStats(BaseModel):
+    fingerprint: str
+    count: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+    last_seen: datetime
+    # 最慢一次的 statement / 綁定參數 (JSON) / EXPLAIN QUERY PLAN
+    statement: str
+    parameters: Optional[str]
+    query_plan: Optional[str]
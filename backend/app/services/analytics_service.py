@@ -0,0 +1,301 @@
+"""
+Analytics Service - 欄式分析快照
+
+排名 / 百分位 / Top-K 若每次都經 ORM 查詢 SQLite 列儲存，成本與資料量成正比。
+同步結束後將每家公司每年度的薪資、福利、EPS 與違規彙總攤平成欄式快照:
+
+    {ANALYTICS_SNAPSHOT_DIR}/
+        CURRENT                  # 目前快照的目錄名稱 (以 os.replace 原子切換)
+        20261019T074000123456/
+            meta.json            # 字典 (公司代號 / 名稱、產業、市場別) 與欄位清單
+            company.npy          # int32 公司字典編號
+            industry.npy         # int16 產業字典編號 (-1 為無)
+            market_type.npy      # int8  市場別字典編號 (-1 為無)
+            year.npy             # int16 民國年
+            avg_salary.npy ...   # float64 指標 (NaN 為無資料)
+
+各 uvicorn worker 以 np.load(mmap_mode="r") 唯讀映射，共用作業系統的 page cache
+(記憶體只有一份)；查詢以 NumPy 向量運算完成，不需存取資料庫。
+NumPy / pandas 於第一次讀取或建立快照時才載入，不拖慢 API 啟動。
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from sqlmodel import Session, select, func, col
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.company import Company
+from app.models.employee_benefit import EmployeeBenefit
+from app.models.non_manager_salary import NonManagerSalary
+from app.models.violation_stat import ViolationStat
+from app.schemas.analytics import AnalyticsMetric
+from app.services.generation_service import bump_generation, get_generation
+from app.services.violation_stats_service import SOURCE_ENV, SOURCE_LABOR, UNKNOWN_YEAR
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = pd = None  # 由 _load_dependencies() 載入
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+META_FILE = "meta.json"
+
+# 維度欄位 -> dtype
+DIMENSION_DTYPES = {"company": "int32", "industry": "int16", "market_type": "int8", "year": "int16"}
+
+METRICS = [metric.value for metric in AnalyticsMetric]
+
+# 指標 -> (來源資料表, 欄位)
+SOURCE_COLUMNS = {
+    NonManagerSalary: {"avg_salary": "avg_salary", "median_salary": "median_salary", "eps": "eps"},
+    EmployeeBenefit: {"avg_salary_current_year": "avg_salary_expense", "avg_benefit_per_employee": "avg_benefit"},
+}
+
+VIOLATION_COLUMNS = [f"{source}_{stat}" for source in (SOURCE_LABOR, SOURCE_ENV) for stat in ("count", "fine")]
+
+
+def _load_dependencies():
+    """載入 NumPy / pandas (讀取或建立快照時呼叫一次；API 與 CLI 啟動時不載入)"""
+    global np, pd
+    if np is None:
+        import numpy as np
+        import pandas as pd
+
+
+class AnalyticsSnapshot:
+    """唯讀的欄式快照 (所有欄位皆為 memory-mapped NumPy 陣列)"""
+
+    def __init__(self, path: Path):
+        _load_dependencies()
+        self.path = path
+        meta = json.loads((path / META_FILE).read_text(encoding="utf-8"))
+        self.built_at = datetime.fromisoformat(meta["built_at"])
+        self.companies: List[str] = meta["companies"]
+        self.company_names: List[str] = meta["company_names"]
+        self.industries: List[str] = meta["industries"]
+        self.market_types: List[str] = meta["market_types"]
+        self.columns: Dict[str, "np.ndarray"] = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r")
+            for name in (*DIMENSION_DTYPES, *meta["metrics"])
+        }
+        self._ids = {
+            "company": {code: i for i, code in enumerate(self.companies)},
+            "industry": {name: i for i, name in enumerate(self.industries)},
+            "market_type": {name: i for i, name in enumerate(self.market_types)},
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns["year"])
+
+    def _mask(
+        self,
+        years: Optional[Sequence[int]] = None,
+        industries: Optional[Sequence[str]] = None,
+        market_types: Optional[Sequence[str]] = None,
+        company_codes: Optional[Sequence[str]] = None,
+    ) -> "np.ndarray":
+        mask = np.ones(len(self), dtype=bool)
+        if years:
+            mask &= np.isin(self.columns["year"], years)
+        for dimension, values in (("industry", industries), ("market_type", market_types), ("company", company_codes)):
+            if values:
+                ids = [self._ids[dimension][value] for value in values if value in self._ids[dimension]]
+                mask &= np.isin(self.columns[dimension], ids)
+        return mask
+
+    def _select(self, metric: str, **filters) -> Tuple["np.ndarray", "np.ndarray"]:
+        """符合過濾條件且有數值的列 (列編號, 數值)"""
+        values = self.columns[metric]
+        rows = np.flatnonzero(self._mask(**filters) & ~np.isnan(values))
+        return rows, values[rows]
+
+    def _item(self, row: int, value: float) -> dict:
+        industry = int(self.columns["industry"][row])
+        market_type = int(self.columns["market_type"][row])
+        company = int(self.columns["company"][row])
+        return {
+            "company_code": self.companies[company],
+            "company_name": self.company_names[company],
+            "industry": self.industries[industry] if industry >= 0 else None,
+            "market_type": self.market_types[market_type] if market_type >= 0 else None,
+            "year": int(self.columns["year"][row]),
+            "value": float(value),
+        }
+
+    def top_k(self, metric: str, k: int, ascending: bool = False, **filters) -> Tuple[int, List[dict]]:
+        """
+        取數值最高 (ascending=True 時最低) 的 k 筆；同值依公司代號、年度排序。
+
+        Returns:
+            (符合條件的筆數, 項目)
+        """
+        rows, values = self._select(metric, **filters)
+        keys = values if ascending else -values
+        if k < len(keys):
+            candidates = np.argpartition(keys, k - 1)[:k]
+        else:
+            candidates = np.arange(len(keys))
+        # 列已依 (公司代號, 年度) 排序，以列編號作為次要排序鍵
+        order = candidates[np.lexsort((rows[candidates], keys[candidates]))]
+        return len(rows), [self._item(rows[i], values[i]) for i in order]
+
+    def percentiles(self, metric: str, qs: Sequence[float], **filters) -> Tuple[int, Optional[float], List[Optional[float]]]:
+        """
+        分布統計 (線性內插，與 pandas quantile 相同)。
+
+        Returns:
+            (筆數, 平均數, 各百分位數)
+        """
+        _, values = self._select(metric, **filters)
+        if not len(values):
+            return 0, None, [None for _ in qs]
+        return len(values), float(values.mean()), [float(v) for v in np.percentile(values, qs)]
+
+
+def _build_frame(session: Session) -> "pd.DataFrame":
+    """每家公司每年度一列的寬表 (index: company_code, year)"""
+    connection = session.connection()
+    keys = ["company_code", "year"]
+    parts = []
+
+    for model, columns in SOURCE_COLUMNS.items():
+        query = select(
+            model.company_code, model.year, *[getattr(model, column) for column in columns]
+        ).where(col(model.company_code).is_not(None))
+        # 同年度重複 (e.g. 上市櫃轉換同時出現在 sii / otc) 取第一筆
+        parts.append(pd.read_sql(query, connection).rename(columns=columns).groupby(keys).first())
+
+    year = (ViolationStat.year - 1911).label("year")
+    query = (
+        select(
+            ViolationStat.company_code, year, ViolationStat.source,
+            func.sum(ViolationStat.count).label("count"),
+            func.sum(ViolationStat.fine).label("fine"),
+        )
+        .where(ViolationStat.year != UNKNOWN_YEAR)
+        .group_by(ViolationStat.company_code, ViolationStat.year, ViolationStat.source)
+    )
+    violations = pd.read_sql(query, connection).pivot_table(
+        index=keys, columns="source", values=["count", "fine"], aggfunc="sum"
+    )
+    violations.columns = [f"{source}_{stat}" for stat, source in violations.columns]
+    parts.append(violations.reindex(columns=VIOLATION_COLUMNS))
+
+    frame = pd.concat(parts, axis=1).astype(float)
+    frame[VIOLATION_COLUMNS] = frame[VIOLATION_COLUMNS].fillna(0)
+    frame["total_count"] = frame["labor_count"] + frame["env_count"]
+    frame["total_fine"] = frame["labor_fine"] + frame["env_fine"]
+
+    companies = pd.read_sql(
+        select(Company.code.label("company_code"), Company.name, Company.industry, Company.market_type),
+        connection,
+    )
+    return frame.reset_index().merge(companies, on="company_code").sort_values(keys, ignore_index=True)
+
+
+def write_snapshot(frame: "pd.DataFrame", root: Path) -> Path:
+    """
+    寫入新快照並原子切換 CURRENT；保留前一版 (可能仍被其他 worker 映射中)，更舊的刪除。
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    name = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    staging = root / f".{name}.tmp"
+    staging.mkdir()
+
+    company_ids, companies = pd.factorize(frame["company_code"])
+    names = frame.groupby("company_code")["name"].first()
+    industry_ids, industries = pd.factorize(frame["industry"])
+    market_ids, market_types = pd.factorize(frame["market_type"])
+    arrays = {
+        "company": company_ids,
+        "industry": industry_ids,
+        "market_type": market_ids,
+        "year": frame["year"].to_numpy(),
+    }
+    for dimension, dtype in DIMENSION_DTYPES.items():
+        np.save(staging / f"{dimension}.npy", np.ascontiguousarray(arrays[dimension], dtype=dtype))
+    for metric in METRICS:
+        np.save(staging / f"{metric}.npy", np.ascontiguousarray(frame[metric].to_numpy(), dtype="float64"))
+
+    meta = {
+        "built_at": datetime.now().isoformat(),
+        "rows": len(frame),
+        "metrics": METRICS,
+        "companies": list(companies),
+        "company_names": [names[code] for code in companies],
+        "industries": list(industries),
+        "market_types": list(market_types),
+    }
+    (staging / META_FILE).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    os.replace(staging, root / name)
+
+    previous = _read_current(root)
+    pointer = root / f".{CURRENT_FILE}.tmp"
+    pointer.write_text(name, encoding="utf-8")
+    os.replace(pointer, root / CURRENT_FILE)
+
+    for path in root.iterdir():
+        if path.is_dir() and path.name not in (name, previous):
+            shutil.rmtree(path, ignore_errors=True)
+    return root / name
+
+
+def _read_current(root: Path) -> Optional[str]:
+    try:
+        return (root / CURRENT_FILE).read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+_snapshot: Optional[AnalyticsSnapshot] = None
+_snapshot_generation: Optional[int] = None
+_lock = threading.Lock()
+
+
+class AnalyticsService:
+    def __init__(self):
+        pass
+
+    def refresh(self) -> int:
+        """
+        重建分析快照 (於同步結束後執行)。
+
+        Returns:
+            快照列數
+        """
+        _load_dependencies()
+        with Session(engine) as session:
+            frame = _build_frame(session)
+            path = write_snapshot(frame, Path(settings.ANALYTICS_SNAPSHOT_DIR))
+            bump_generation(session)
+
+        logger.info(f"Wrote analytics snapshot {path} ({len(frame)} rows)")
+        return len(frame)
+
+    def get_snapshot(self) -> Optional[AnalyticsSnapshot]:
+        """取得目前快照 (資料世代改變時重新讀取 CURRENT)；尚未建立時回傳 None"""
+        global _snapshot, _snapshot_generation
+        generation, _ = get_generation()
+        if _snapshot is not None and _snapshot_generation == generation:
+            return _snapshot
+        with _lock:
+            if _snapshot is None or _snapshot_generation != generation:
+                root = Path(settings.ANALYTICS_SNAPSHOT_DIR)
+                name = _read_current(root)
+                if name is None:
+                    return None
+                if _snapshot is None or _snapshot.path.name != name:
+                    _snapshot = AnalyticsSnapshot(root / name)
+                    logger.info(f"Mapped analytics snapshot {name} ({len(_snapshot)} rows)")
+                _snapshot_generation = generation
+        return _snapshot
@@ -0,0 +1,180 @@
+"""
+Benchmark Service - 產業基準統計
+
+MOPS 只公布同產業平均 (industry_avg_*)，這裡於同步結束後將各年度的薪資 / EPS
+欄位載入 pandas，以 groupby 一次計算每個 (產業, 年度, 指標) 的公司數、平均數、
+p10/p25/p50/p75/p90 與每家公司的百分位排名，寫入 `industry_benchmark` 與
+`industry_percentile` 表；API 只讀取物化結果，不在請求時計算。
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select, col, delete
+
+from app.db.session import engine
+from app.services.generation_service import bump_generation
+from app.models.employee_benefit import EmployeeBenefit
+from app.models.non_manager_salary import NonManagerSalary
+from app.models.industry_benchmark import IndustryBenchmark
+from app.models.industry_percentile import IndustryPercentile
+from app.schemas.industry import (
+    BenchmarkMetric,
+    CompanyPercentile,
+    IndustryMetricStats,
+    IndustryStatsResponse,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 指標 -> (來源資料表, 欄位)
+METRIC_SOURCES = {
+    BenchmarkMetric.avg_salary: (NonManagerSalary, "avg_salary"),
+    BenchmarkMetric.median_salary: (NonManagerSalary, "median_salary"),
+    BenchmarkMetric.eps: (NonManagerSalary, "eps"),
+    BenchmarkMetric.avg_salary_expense: (EmployeeBenefit, "avg_salary_current_year"),
+    BenchmarkMetric.avg_benefit: (EmployeeBenefit, "avg_benefit_per_employee"),
+}
+
+# 百分位數 -> 欄位名稱
+QUANTILES = {0.1: "p10", 0.25: "p25", 0.5: "p50", 0.75: "p75", 0.9: "p90"}
+
+GROUP_KEYS = ["industry", "year", "metric"]
+
+METRIC_ORDER = {metric.value: i for i, metric in enumerate(BenchmarkMetric)}
+
+
+class BenchmarkService:
+    def __init__(self):
+        pass
+
+    def _load_values(self, session: Session) -> "pd.DataFrame":
+        """
+        載入所有指標數值 (長表: industry, year, metric, raw_company_code, company_code, company_name, value)。
+        每個來源資料表只查詢一次。
+        """
+        # pandas 只在 materialize 時需要，API 行程不載入
+        import pandas as pd
+
+        sources: Dict[type, Dict[str, str]] = defaultdict(dict)
+        for metric, (model, column) in METRIC_SOURCES.items():
+            sources[model][column] = metric.value
+
+        frames = []
+        for model, columns in sources.items():
+            query = select(
+                model.industry, model.year, model.raw_company_code, model.company_code, model.company_name,
+                *[getattr(model, column) for column in columns],
+            ).where(col(model.industry).is_not(None), col(model.industry) != "")
+            wide = pd.read_sql(query, session.connection())
+            frames.append(
+                wide.rename(columns=columns).melt(
+                    id_vars=["industry", "year", "raw_company_code", "company_code", "company_name"],
+                    value_vars=list(columns.values()),
+                    var_name="metric",
+                    value_name="value",
+                )
+            )
+
+        values = pd.concat(frames, ignore_index=True).dropna(subset=["value"])
+        values["value"] = values["value"].astype(float)
+        # 同一公司同年度只計一次 (e.g. 上市櫃轉換年度同時出現在 sii / otc)
+        return values.drop_duplicates(subset=["year", "metric", "raw_company_code"], ignore_index=True)
+
+    def compute_benchmarks(self, session: Session) -> Tuple["pd.DataFrame", "pd.DataFrame"]:
+        """
+        計算所有產業基準。
+
+        Returns:
+            (stats, percentiles):
+            - stats: 每個 (產業, 年度, 指標) 一列，含 count / mean / p10 ... p90
+            - percentiles: 每個 (產業, 年度, 指標, 公司) 一列，含 value / percentile
+        """
+        values = self._load_values(session)
+        grouped = values.groupby(GROUP_KEYS, sort=True)["value"]
+
+        stats = grouped.agg(count="count", mean="mean")
+        quantiles = grouped.quantile(list(QUANTILES)).unstack()
+        quantiles.columns = [QUANTILES[q] for q in quantiles.columns]
+        stats = stats.join(quantiles).round(2).reset_index()
+
+        # 百分位排名: 同組中數值小於等於此公司的比例 (同值取相同排名)
+        values["percentile"] = (grouped.rank(method="max", pct=True) * 100).round(2)
+        percentiles = values.dropna(subset=["company_code"])[
+            GROUP_KEYS + ["company_code", "company_name", "value", "percentile"]
+        ]
+        return stats, percentiles
+
+    def refresh(self):
+        """
+        重新計算所有產業基準並寫入物化表 (於同步結束後執行)。
+        """
+        SQLModel.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            stats, percentiles = self.compute_benchmarks(session)
+            now = datetime.now()
+
+            session.exec(delete(IndustryBenchmark))
+            session.exec(delete(IndustryPercentile))
+            if len(stats):
+                session.execute(insert(IndustryBenchmark), stats.assign(created_at=now).to_dict("records"))
+            if len(percentiles):
+                session.execute(insert(IndustryPercentile), percentiles.assign(created_at=now).to_dict("records"))
+            session.commit()
+            bump_generation(session)
+
+        logger.info(f"Materialized {len(stats)} industry benchmarks, {len(percentiles)} company percentiles")
+
+    def get_industry_stats(
+        self,
+        session: Session,
+        industry: str,
+        years: Optional[List[int]] = None,
+        metrics: Optional[List[BenchmarkMetric]] = None,
+        include_companies: bool = False,
+    ) -> Optional[IndustryStatsResponse]:
+        """
+        讀取產業基準 (依年度新到舊、指標固定順序)。產業不存在時回傳 None。
+        """
+        def scoped(model):
+            query = select(model).where(model.industry == industry)
+            if years:
+                query = query.where(col(model.year).in_(years))
+            if metrics:
+                query = query.where(col(model.metric).in_([metric.value for metric in metrics]))
+            return query
+
+        rows = sorted(
+            session.exec(scoped(IndustryBenchmark)).all(),
+            key=lambda row: (-row.year, METRIC_ORDER.get(row.metric, len(METRIC_ORDER))),
+        )
+        if not rows:
+            return None
+
+        companies: Dict[Tuple[int, str], List[CompanyPercentile]] = defaultdict(list)
+        if include_companies:
+            query = scoped(IndustryPercentile).order_by(
+                col(IndustryPercentile.percentile).desc(), IndustryPercentile.company_code
+            )
+            for row in session.exec(query).all():
+                companies[(row.year, row.metric)].append(CompanyPercentile(
+                    company_code=row.company_code, company_name=row.company_name,
+                    value=row.value, percentile=row.percentile,
+                ))
+
+        return IndustryStatsResponse(
+            industry=industry,
+            stats=[
+                IndustryMetricStats(
+                    **row.model_dump(include={"year", "metric", "count", "mean", *QUANTILES.values()}),
+                    companies=companies.get((row.year, row.metric), []) if include_companies else None,
+                )
+                for row in rows
+            ],
+        )
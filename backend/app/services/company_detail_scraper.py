@@ -9,6 +9,8 @@ from bs4 import BeautifulSoup
 from sqlmodel import Session, select
 
 from app.db.session import engine
+from app.services.generation_service import bump_generation
+from app.services.profile_service import track_profile_changes
 from app.models.company import Company
 
 logger = logging.getLogger(__name__)
@@ -29,6 +31,7 @@ class CompanyDetailScraper:
     def sync_all_details(self, limit: Optional[int] = None, force: bool = False, company_code: Optional[str] = None, retries: int = 3, delay: float = 2.0):
         """Sync detailed info (Stakeholder/Governance URLs) for all companies."""
         with Session(engine) as session:
+            track_profile_changes(session)
             if company_code:
                 query = select(Company).where(Company.code == company_code)
             else:
@@ -59,6 +62,7 @@ class CompanyDetailScraper:
                     continue
 
             session.commit()
+            bump_generation(session)
             logger.info("Company detail sync completed.")
 
     def _fetch_and_update_company(self, session: Session, company: Company, retries: int = 3, retry_delay: float = 2.0):
@@ -4,10 +4,14 @@ from datetime import date, datetime
 from pathlib import Path
 from typing import List, Optional
 
-from sqlmodel import Session, select, col, asc, desc, func
+from sqlmodel import Session, select, col
 
 from app.models.company import Company
+from app.db.pagination import paginate
+from app.db.search_index import substring_condition
 from app.db.session import engine
+from app.services.generation_service import bump_generation
+from app.services.profile_service import track_profile_changes
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,10 +26,14 @@ class CompanyService:
         page: int = 1,
         size: int = 20,
         filters: Optional[dict] = None,
-        sorts: Optional[List[str]] = None
+        sorts: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[List[str]] = None,
     ):
         """
         Get companies with pagination, filtering, and sorting.
+        Returns (results, total, total_pages, next_cursor).
         """
         query = select(Company)
         
@@ -44,34 +52,19 @@ class CompanyService:
                 query = query.where(col(Company.code).in_(filters["code"]))
             
             if filters.get("name"):
-                # Partial match
-                query = query.where(col(Company.name).ilike(f"%{filters['name']}%"))
+                # Partial match (trigram index for 3+ characters, LIKE scan otherwise)
+                condition = substring_condition("company_fts", "name", filters["name"])
+                if condition is None:
+                    condition = col(Company.name).ilike(f"%{filters['name']}%")
+                query = query.where(condition)
 
-        # Calculate Total (before pagination)
-        # Efficient count query
-        count_query = select(func.count()).select_from(query.subquery())
-        total = session.exec(count_query).one()
-
-        # Apply Sorts
-        if sorts:
-            for sort_field in sorts:
-                direction = desc
-                if not sort_field.startswith("-"):
-                    direction = asc
-                
-                field_name = sort_field.lstrip("-")
-                if hasattr(Company, field_name):
-                    query = query.order_by(direction(getattr(Company, field_name)))
-        else:
-            # Default sort
-            query = query.order_by(Company.code)
-            
-        # Apply Pagination
-        query = query.offset((page - 1) * size).limit(size)
-        
-        results = session.exec(query).all()
-        
-        return results, total
+        # Sort, paginate (offset or cursor) and count
+        return paginate(
+            session, query, Company,
+            page=page, size=size, sorts=sorts,
+            default_sort=("code",),
+            cursor=cursor, include_total=include_total, fields=fields,
+        )
 
     def get_catalog(self, session: Session) -> List[Company]:
         """
@@ -116,6 +109,7 @@ class CompanyService:
         SQLModel.metadata.create_all(engine)
         
         with Session(engine) as session:
+            track_profile_changes(session)
             for market_type in target_types:
                 file_path = data_dir / f"{market_type}.csv"
                 if not file_path.exists():
@@ -127,6 +121,7 @@ class CompanyService:
                 self._upsert_companies(session, companies)
             
             session.commit()
+            bump_generation(session)
 
     def _parse_csv(self, file_path: Path, market_type: str) -> List[Company]:
         companies = []
@@ -16,6 +16,9 @@ from sqlmodel import Session, select, SQLModel
 
 from app.core.config import settings
 from app.db.session import engine, archive_engine
+from app.services.generation_service import bump_generation
+from app.services.profile_service import track_profile_changes
+from app.services.violation_stats_service import track_violation_stats
 from app.models.environmental_violation import EnvironmentalViolation
 from app.services.company_matcher import CompanyMatcher
 
@@ -116,6 +119,8 @@ class EnvironmentalService:
         SQLModel.metadata.create_all(archive_engine)
         
         with Session(engine) as session, Session(archive_engine) as archive_session:
+            track_profile_changes(session)
+            track_violation_stats(session)
             # 初始化比對器
             matcher = CompanyMatcher(session)
             
@@ -129,6 +134,7 @@ class EnvironmentalService:
             
             session.commit()
             archive_session.commit()
+            bump_generation(session)
     
     def _parse_json(self, file_path: Path) -> List[EnvironmentalViolation]:
         """解析 JSON 檔案"""
@@ -0,0 +1,104 @@
+"""
+Facet Service - 違規多維度統計
+
+讀取 `violation_facets` 彙總表 (見 violation_stats_service)，依任意維度組合
+(法條、主管機關、來源類別、產業、市場別、年度 / 年月) 分組計算違規次數與罰鍰，
+不掃描原始違規資料表。產業 / 市場別於需要時 JOIN 公司表取得。
+"""
+import logging
+from typing import Dict, List, Optional
+
+from sqlmodel import Session, col, desc, func, select
+
+from app.models.company import Company
+from app.models.violation_facet import ViolationFacet
+from app.schemas.facet import FacetBucket, FacetOrder, FacetResponse
+from app.services.violation_stats_service import UNKNOWN_MONTH
+
+logger = logging.getLogger(__name__)
+
+# 維度 -> 欄位 (data_source / violation_type 皆對應 category)
+FACET_COLUMNS = {
+    "law_article": ViolationFacet.law_article,
+    "authority": ViolationFacet.authority,
+    "data_source": ViolationFacet.category,
+    "violation_type": ViolationFacet.category,
+    "industry": Company.industry,
+    "market_type": Company.market_type,
+    "year": ViolationFacet.month // 100,
+    "month": ViolationFacet.month,
+}
+
+COMPANY_FIELDS = {"industry", "market_type"}
+
+
+def _bucket_value(name: str, value):
+    """彙總表的佔位值 (空字串 / 0) 轉為 None，年月格式化為 YYYY-MM"""
+    if value in ("", None, UNKNOWN_MONTH):
+        return None
+    if name == "month":
+        return f"{value // 100:04d}-{value % 100:02d}"
+    return value
+
+
+class FacetService:
+    def __init__(self):
+        pass
+
+    def get_facets(
+        self,
+        session: Session,
+        source: str,
+        by: List[str],
+        filters: Optional[Dict[str, list]] = None,
+        order: FacetOrder = FacetOrder.count,
+        limit: int = 50,
+    ) -> FacetResponse:
+        """
+        依 by 的維度組合分組統計。
+
+        Args:
+            source: 違規類型 (labor / env)
+            by: 分組維度 (見 FACET_COLUMNS)
+            filters: 維度 -> 允許的值 (另支援 company_code)
+            order: 排序依據 (次數或罰鍰，多到少)
+            limit: 最多回傳的分組數
+        """
+        filters = {name: values for name, values in (filters or {}).items() if values}
+
+        conditions = [ViolationFacet.source == source]
+        for name, values in filters.items():
+            column = ViolationFacet.company_code if name == "company_code" else FACET_COLUMNS[name]
+            conditions.append(column.in_(values))
+
+        def scoped(query):
+            if COMPANY_FIELDS & (set(by) | set(filters)):
+                query = query.join(Company, Company.code == ViolationFacet.company_code)
+            return query.where(*conditions)
+
+        count = func.sum(ViolationFacet.count)
+        fine = func.sum(ViolationFacet.fine)
+        dimensions = [FACET_COLUMNS[name].label(name) for name in by]
+        query = scoped(
+            select(*dimensions, count.label("count"), fine.label("fine")).select_from(ViolationFacet)
+        ).group_by(*dimensions).order_by(
+            desc(count if order == FacetOrder.count else fine), *dimensions
+        ).limit(limit)
+
+        total_count, total_fine = session.exec(
+            scoped(select(func.coalesce(count, 0), func.coalesce(fine, 0)).select_from(ViolationFacet))
+        ).one()
+
+        return FacetResponse(
+            by=by,
+            total_count=total_count,
+            total_fine=total_fine,
+            buckets=[
+                FacetBucket(
+                    key={name: _bucket_value(name, row[name]) for name in by},
+                    count=row["count"],
+                    fine=row["fine"],
+                )
+                for row in session.exec(query).mappings()
+            ],
+        )
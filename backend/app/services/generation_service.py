@@ -0,0 +1,63 @@
+"""
+Data Generation Service - 資料世代
+
+資料只在同步時改變，因此每次同步結束時遞增一個全域世代值。API 以此產生
+ETag / Last-Modified，並作為回應快取的失效依據。
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.data_generation import DataGeneration
+
+logger = logging.getLogger(__name__)
+
+GENERATION_ROW_ID = 1
+
+# 行程內快取: (世代, 最後同步時間, 讀取時間)
+_cached: Optional[Tuple[int, Optional[datetime], float]] = None
+
+
+def bump_generation(session: Session) -> int:
+    """
+    遞增資料世代 (於同步結束時呼叫)。
+
+    Args:
+        session: 資料庫 Session (會直接 commit)
+
+    Returns:
+        新的世代值
+    """
+    row = session.get(DataGeneration, GENERATION_ROW_ID)
+    if row is None:
+        row = DataGeneration(id=GENERATION_ROW_ID, generation=0)
+    row.generation += 1
+    row.updated_at = datetime.now()
+    session.add(row)
+    session.commit()
+    logger.info(f"Data generation bumped to {row.generation}")
+    return row.generation
+
+
+def get_generation() -> Tuple[int, Optional[datetime]]:
+    """
+    取得目前資料世代與最後同步時間。
+
+    結果在行程內快取 DATA_GENERATION_TTL 秒，避免每個請求都查詢資料庫；
+    同步完成後最多延遲 TTL 秒才會被 API 看見。
+    """
+    global _cached
+    now = time.monotonic()
+    if _cached is not None and now - _cached[2] < settings.DATA_GENERATION_TTL:
+        return _cached[0], _cached[1]
+
+    with Session(engine) as session:
+        row = session.get(DataGeneration, GENERATION_ROW_ID)
+    generation, updated_at = (row.generation, row.updated_at) if row else (0, None)
+    _cached = (generation, updated_at, now)
+    return generation, updated_at
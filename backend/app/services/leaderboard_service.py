@@ -0,0 +1,459 @@
+"""
+Leaderboard Service - 排行榜計算與物化
+
+排行榜只在資料同步後才會改變，因此於同步結束時一次計算所有排行榜並寫入
+`leaderboard_entry` 表，API 與匯出只需一次查詢即可取得完整排行榜。
+"""
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlmodel import Session, SQLModel, select, func, col
+from sqlalchemy import and_, case, or_
+from sqlalchemy.exc import OperationalError
+
+from app.db.session import engine
+from app.services.generation_service import bump_generation
+from app.services.violation_stats_service import SOURCE_ENV, SOURCE_LABOR
+from app.models.company import Company
+from app.models.violation_stat import ViolationStat
+from app.models.non_manager_salary import NonManagerSalary
+from app.models.leaderboard_entry import LeaderboardEntry
+from app.schemas.leaderboard import (
+    LeaderboardMetric,
+    LeaderboardResponse,
+    ViolationLeaderboard,
+    ViolationLeaderboardItem,
+    SalaryLeaderboard,
+    SalaryLeaderboardItem,
+    IndustrySalaryLeaderboard,
+    IndustrySalaryLeaderboardItem,
+)
+
+logger = logging.getLogger(__name__)
+
+# 常數
+LIMIT = 10
+YEARS_TO_INCLUDE = 3  # 只回傳最近 N 年
+
+# 排行榜名稱
+BOARD_VIOLATION_ALL_TIME = "violation_all_time"
+BOARD_VIOLATION_YEARLY = "violation_yearly"
+BOARD_SALARY = "salary"
+BOARD_SALARY_BY_INDUSTRY = "salary_by_industry"
+
+VIOLATION_ITEM_FIELDS = ["labor_count", "labor_fine", "env_count", "env_fine", "total_count", "total_fine"]
+SALARY_ITEM_FIELDS = ["avg_salary", "median_salary"]
+INDUSTRY_SALARY_ITEM_FIELDS = ["avg_salary", "median_salary", "eps"]
+
+# 指標 -> (top 排行欄位, bottom 排行欄位)
+VIOLATION_RANKINGS = {
+    LeaderboardMetric.violation_count: ("top_by_count", "bottom_by_count"),
+    LeaderboardMetric.violation_fine: ("top_by_fine", "bottom_by_fine"),
+}
+VIOLATION_METRIC_COLUMNS = {
+    LeaderboardMetric.violation_count: "total_count",
+    LeaderboardMetric.violation_fine: "total_fine",
+}
+# Bottom 違規排行的候選名單: 各欄位前 limit × CANDIDATE_FACTOR 名 (歷年累計看次數與罰鍰，各年度只看次數)
+CANDIDATE_FACTOR = 2
+CANDIDATE_FIELDS_ALL_TIME = ["labor_count", "labor_fine", "env_count", "env_fine"]
+CANDIDATE_FIELDS_YEARLY = ["labor_count", "env_count"]
+SALARY_RANKINGS = {
+    LeaderboardMetric.avg_salary: ("top_by_avg", "bottom_by_avg"),
+    LeaderboardMetric.median_salary: ("top_by_median", "bottom_by_median"),
+}
+INDUSTRY_SALARY_RANKINGS = {
+    LeaderboardMetric.median_salary: ("top_by_median", "bottom_by_median"),
+    LeaderboardMetric.eps: ("top_by_eps", "bottom_by_eps"),
+}
+
+
+def get_current_roc_year() -> int:
+    """今年民國年"""
+    return date.today().year - 1911
+
+
+def get_recent_years(current_year: int) -> List[int]:
+    """取得最近 N 年的年份列表 (民國年)"""
+    return [current_year - i for i in range(YEARS_TO_INCLUDE)]
+
+
+def _build_board(board_class, rankings: Dict[str, list]):
+    """建構排行榜，缺少的排行類型以空列表補齊"""
+    return board_class(**{r: rankings.get(r, []) for r in board_class.model_fields})
+
+
+class LeaderboardService:
+    def __init__(self):
+        pass
+
+    # ========== 讀取 ==========
+    def get_leaderboards(self, session: Session) -> LeaderboardResponse:
+        """
+        取得排行榜：優先讀取物化表，尚未物化時即時計算。
+        """
+        materialized = self.get_materialized(session)
+        if materialized is not None:
+            return materialized
+        logger.warning("Leaderboards not materialized yet, computing on the fly")
+        return self.compute_leaderboards(session)
+
+    def get_materialized(self, session: Session) -> Optional[LeaderboardResponse]:
+        """
+        以單一查詢讀取物化排行榜，尚未物化時回傳 None。
+        """
+        try:
+            entries = session.exec(
+                select(LeaderboardEntry).order_by(
+                    LeaderboardEntry.board,
+                    LeaderboardEntry.year,
+                    LeaderboardEntry.industry,
+                    LeaderboardEntry.ranking,
+                    LeaderboardEntry.rank,
+                )
+            ).all()
+        except OperationalError as e:
+            # 舊版結構的物化表 (下次 materialize 時重建)
+            logger.warning(f"Leaderboard table is outdated, run materialize: {e.orig}")
+            session.rollback()
+            return None
+        if not entries:
+            return None
+
+        violation_boards: Dict[Optional[int], Dict[str, list]] = defaultdict(lambda: defaultdict(list))
+        salary_boards: Dict[int, Dict[str, list]] = defaultdict(lambda: defaultdict(list))
+        industry_boards: Dict[int, Dict[str, Dict[str, list]]] = defaultdict(
+            lambda: defaultdict(lambda: defaultdict(list))
+        )
+
+        for e in entries:
+            if e.board in (BOARD_VIOLATION_ALL_TIME, BOARD_VIOLATION_YEARLY):
+                violation_boards[e.year][e.ranking].append(
+                    ViolationLeaderboardItem(
+                        company_code=e.company_code,
+                        company_name=e.company_name,
+                        **{f: getattr(e, f) or 0 for f in VIOLATION_ITEM_FIELDS},
+                    )
+                )
+            elif e.board == BOARD_SALARY:
+                salary_boards[e.year][e.ranking].append(
+                    SalaryLeaderboardItem(
+                        company_code=e.company_code,
+                        company_name=e.company_name,
+                        **{f: getattr(e, f) for f in SALARY_ITEM_FIELDS},
+                    )
+                )
+            elif e.board == BOARD_SALARY_BY_INDUSTRY:
+                industry_boards[e.year][e.industry][e.ranking].append(
+                    IndustrySalaryLeaderboardItem(
+                        company_code=e.company_code,
+                        company_name=e.company_name,
+                        industry=e.industry or "",
+                        **{f: getattr(e, f) for f in INDUSTRY_SALARY_ITEM_FIELDS},
+                    )
+                )
+
+        # 以物化當時的年度為準 (跨年後、下次 materialize 前不會混用兩組年度)
+        latest_year = entries[0].latest_year or get_current_roc_year()
+        violation_all_time = _build_board(ViolationLeaderboard, violation_boards.pop(None, {}))
+
+        # 薪資排行榜在沒有資料的年度也回傳空榜 (與即時計算一致)
+        for year_roc in get_recent_years(latest_year):
+            salary_boards.setdefault(year_roc, {})
+            industry_boards.setdefault(year_roc, {})
+
+        return LeaderboardResponse(
+            latest_year=latest_year,
+            violation_all_time=violation_all_time,
+            violation_yearly={y: _build_board(ViolationLeaderboard, b) for y, b in violation_boards.items()},
+            salary={y: _build_board(SalaryLeaderboard, b) for y, b in salary_boards.items()},
+            salary_by_industry={
+                y: {ind: _build_board(IndustrySalaryLeaderboard, b) for ind, b in industries.items()}
+                for y, industries in industry_boards.items()
+            },
+        )
+
+    # ========== 物化 ==========
+    def refresh(self):
+        """
+        重新計算所有排行榜並寫入物化表 (於同步結束後執行)。
+        """
+        SQLModel.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            response = self.compute_leaderboards(session)
+            entries = self._to_entries(response)
+
+            # 物化表完全由此重建: 同一交易內重建資料表 (結構變更時不需 migration)
+            connection = session.connection()
+            LeaderboardEntry.__table__.drop(connection, checkfirst=True)
+            LeaderboardEntry.__table__.create(connection)
+            session.add_all(entries)
+            session.commit()
+            bump_generation(session)
+
+        logger.info(f"Materialized {len(entries)} leaderboard entries")
+
+    def _to_entries(self, response: LeaderboardResponse) -> List[LeaderboardEntry]:
+        """將排行榜回應攤平成物化表列"""
+        entries = []
+
+        def add(board: str, year: Optional[int], industry: Optional[str], ranking: str, items: list):
+            for rank, item in enumerate(items, start=1):
+                entries.append(LeaderboardEntry(
+                    board=board, year=year, industry=industry, ranking=ranking, rank=rank,
+                    latest_year=response.latest_year,
+                    **item.model_dump(exclude={"industry"}),
+                ))
+
+        def add_board(board: str, year: Optional[int], industry: Optional[str], leaderboard):
+            for ranking in type(leaderboard).model_fields:
+                add(board, year, industry, ranking, getattr(leaderboard, ranking))
+
+        add_board(BOARD_VIOLATION_ALL_TIME, None, None, response.violation_all_time)
+        for year, board in response.violation_yearly.items():
+            add_board(BOARD_VIOLATION_YEARLY, year, None, board)
+        for year, board in response.salary.items():
+            add_board(BOARD_SALARY, year, None, board)
+        for year, industries in response.salary_by_industry.items():
+            for industry, board in industries.items():
+                add_board(BOARD_SALARY_BY_INDUSTRY, year, industry, board)
+
+        return entries
+
+    # ========== 計算 ==========
+    def compute_leaderboards(
+        self,
+        session: Session,
+        limit: int = LIMIT,
+        years: Optional[List[int]] = None,
+        metrics: Optional[List[LeaderboardMetric]] = None,
+    ) -> LeaderboardResponse:
+        """
+        即時計算排行榜資料 (以 ROW_NUMBER() 視窗函數一次取得所有分組的 Top/Bottom N)
+
+        Args:
+            limit: 每個排行榜的名次數
+            years: 要計算的民國年 (預設最近 3 年)
+            metrics: 要計算的指標 (預設全部)
+
+        回傳：
+        - violation_all_time: 歷年累計違規排行榜
+        - violation_yearly: 各年度違規排行榜
+        - salary: 各年度薪資排行榜
+        - salary_by_industry: 各年度各產業薪資排行榜
+        """
+        current_year = get_current_roc_year()
+        years = sorted(set(years), reverse=True) if years else get_recent_years(current_year)
+        metrics = set(metrics) if metrics else set(LeaderboardMetric)
+
+        # ========== 違規排行 (歷年累計 + 各年度) ==========
+        violation_metrics = [m for m in VIOLATION_RANKINGS if m in metrics]
+        violation_all_time: Dict[str, list] = {}
+        violation_yearly: Dict[int, Dict[str, list]] = {}
+        if violation_metrics:
+            violation_all_time = self._rank_violations(session, violation_metrics, limit).get(None, {})
+            violation_yearly = self._rank_violations(session, violation_metrics, limit, years)
+
+        # ========== 薪資排行 (各年度) ==========
+        salary: Dict[int, Dict[str, list]] = {}
+        salary_metrics = [m for m in SALARY_RANKINGS if m in metrics]
+        if salary_metrics:
+            salary = {year_roc: {} for year_roc in years}
+            for metric in salary_metrics:
+                ranked = self._rank_salaries(session, metric, limit, years, by_industry=False)
+                for (year_roc, _), rankings in ranked.items():
+                    for ranking, items in zip(SALARY_RANKINGS[metric], rankings):
+                        salary[year_roc][ranking] = [SalaryLeaderboardItem(**item) for item in items]
+
+        # ========== 各產業薪資排行 (各年度) ==========
+        salary_by_industry: Dict[int, Dict[str, Dict[str, list]]] = {}
+        industry_metrics = [m for m in INDUSTRY_SALARY_RANKINGS if m in metrics]
+        if industry_metrics:
+            salary_by_industry = {year_roc: {} for year_roc in years}
+            for metric in industry_metrics:
+                ranked = self._rank_salaries(session, metric, limit, years, by_industry=True)
+                for (year_roc, industry), rankings in ranked.items():
+                    boards = salary_by_industry[year_roc].setdefault(industry, {})
+                    for ranking, items in zip(INDUSTRY_SALARY_RANKINGS[metric], rankings):
+                        boards[ranking] = [IndustrySalaryLeaderboardItem(**item) for item in items]
+
+        return LeaderboardResponse(
+            latest_year=current_year,
+            violation_all_time=_build_board(ViolationLeaderboard, violation_all_time),
+            violation_yearly={y: _build_board(ViolationLeaderboard, b) for y, b in violation_yearly.items()},
+            salary={y: _build_board(SalaryLeaderboard, b) for y, b in salary.items()},
+            salary_by_industry={
+                y: {ind: _build_board(IndustrySalaryLeaderboard, b) for ind, b in industries.items()}
+                for y, industries in salary_by_industry.items()
+            },
+        )
+
+    def _rank_violations(
+        self,
+        session: Session,
+        metrics: List[LeaderboardMetric],
+        limit: int,
+        years: Optional[List[int]] = None,
+    ) -> Dict[Optional[int], Dict[str, List[ViolationLeaderboardItem]]]:
+        """
+        合併勞動 + 環境違規後排名，years 為 None 時計算歷年累計 (key 為 None)，
+        否則依年度分組 (key 為民國年)。
+        """
+        by_year = years is not None
+
+        # 勞動 / 環境違規彙總 (violation_stats)
+        def stat_sum(source: str, column):
+            return func.coalesce(func.sum(case((ViolationStat.source == source, column), else_=0)), 0)
+
+        labor_count = stat_sum(SOURCE_LABOR, ViolationStat.count)
+        labor_fine = stat_sum(SOURCE_LABOR, ViolationStat.fine)
+        env_count = stat_sum(SOURCE_ENV, ViolationStat.count)
+        env_fine = stat_sum(SOURCE_ENV, ViolationStat.fine)
+        group_columns = [ViolationStat.company_code] + ([ViolationStat.year] if by_year else [])
+        query = select(
+            ViolationStat.company_code.label("company_code"),
+            *([ViolationStat.year.label("year_ad")] if by_year else []),
+            labor_count.label("labor_count"),
+            labor_fine.label("labor_fine"),
+            env_count.label("env_count"),
+            env_fine.label("env_fine"),
+            (labor_count + env_count).label("total_count"),
+            (labor_fine + env_fine).label("total_fine"),
+        )
+        if by_year:
+            query = query.where(col(ViolationStat.year).in_([y + 1911 for y in years]))
+        totals = query.group_by(*group_columns).subquery()
+        partition_by = [totals.c.year_ad] if by_year else None
+
+        # Bottom 排行只在「違規大戶」候選名單中取最少者 (各來源前 limit × CANDIDATE_FACTOR 名)，
+        # 否則會是一長串只有 1 次違規、依代號排列的公司
+        candidate_fields = CANDIDATE_FIELDS_YEARLY if by_year else CANDIDATE_FIELDS_ALL_TIME
+        candidate_ranks = [
+            func.row_number()
+            .over(partition_by=partition_by, order_by=(totals.c[f].desc(), totals.c.company_code))
+            .label(f"candidate_{f}")
+            for f in candidate_fields
+        ]
+        scored = select(totals, *candidate_ranks).subquery()
+        is_candidate = or_(*[
+            and_(scored.c[f"candidate_{f}"] <= limit * CANDIDATE_FACTOR, scored.c[f] > 0)
+            for f in candidate_fields
+        ])
+
+        # 每個指標一組 Top / Bottom 名次 (Top 為全體排名，Bottom 先排候選名單)
+        partition_by = [scored.c.year_ad] if by_year else None
+        rank_columns = []
+        bottom_rankings = set()
+        for metric in metrics:
+            column = scored.c[VIOLATION_METRIC_COLUMNS[metric]]
+            top, bottom = VIOLATION_RANKINGS[metric]
+            bottom_rankings.add(bottom)
+            rank_columns.append(
+                func.row_number()
+                .over(partition_by=partition_by, order_by=(column.desc(), scored.c.company_code))
+                .label(top)
+            )
+            rank_columns.append(
+                func.row_number()
+                .over(
+                    partition_by=partition_by,
+                    order_by=(case((is_candidate, 0), else_=1), column.asc(), scored.c.company_code),
+                )
+                .label(bottom)
+            )
+        ranked = select(scored, case((is_candidate, 1), else_=0).label("is_candidate"), *rank_columns).subquery()
+
+        query = (
+            select(ranked, func.coalesce(Company.name, "").label("display_name"))
+            .outerjoin(Company, Company.code == ranked.c.company_code)
+            .where(or_(*[
+                and_(ranked.c[c.name] <= limit, ranked.c.is_candidate == 1) if c.name in bottom_rankings
+                else ranked.c[c.name] <= limit
+                for c in rank_columns
+            ]))
+        )
+
+        boards: Dict[Optional[int], Dict[str, list]] = defaultdict(lambda: defaultdict(list))
+        for row in session.exec(query).mappings():
+            year_roc = int(row["year_ad"]) - 1911 if by_year else None
+            item = ViolationLeaderboardItem(
+                company_code=row["company_code"],
+                company_name=row["display_name"],
+                **{f: row[f] or 0 for f in VIOLATION_ITEM_FIELDS},
+            )
+            for c in rank_columns:
+                if row[c.name] <= limit and (c.name not in bottom_rankings or row["is_candidate"]):
+                    boards[year_roc][c.name].append((row[c.name], item))
+
+        return {
+            year_roc: {ranking: [item for _, item in sorted(items, key=lambda x: x[0])] for ranking, items in rankings.items()}
+            for year_roc, rankings in boards.items()
+        }
+
+    def _rank_salaries(
+        self,
+        session: Session,
+        metric: LeaderboardMetric,
+        limit: int,
+        years: List[int],
+        by_industry: bool,
+    ) -> Dict[tuple, tuple]:
+        """
+        依單一指標一次掃描取得各 (年度[, 產業]) 的 Top / Bottom N 薪資資料。
+
+        Returns:
+            {(民國年, 產業 or None): ([top 項目], [bottom 項目])}
+        """
+        column = getattr(NonManagerSalary, metric.value)
+        partition_by = [NonManagerSalary.year] + ([NonManagerSalary.industry] if by_industry else [])
+
+        query = (
+            select(
+                NonManagerSalary.company_code,
+                NonManagerSalary.company_name,
+                NonManagerSalary.year,
+                NonManagerSalary.industry,
+                NonManagerSalary.avg_salary,
+                NonManagerSalary.median_salary,
+                NonManagerSalary.eps,
+                func.row_number()
+                .over(partition_by=partition_by, order_by=(column.desc(), NonManagerSalary.company_code))
+                .label("rank_top"),
+                func.row_number()
+                .over(partition_by=partition_by, order_by=(column.asc(), NonManagerSalary.company_code))
+                .label("rank_bottom"),
+            )
+            .where(NonManagerSalary.company_code.isnot(None))
+            .where(col(NonManagerSalary.year).in_(years))
+            .where(column.isnot(None))
+        )
+        if by_industry:
+            query = query.where(NonManagerSalary.industry.isnot(None)).where(NonManagerSalary.industry != "")
+        ranked = query.subquery()
+
+        rows = session.exec(
+            select(ranked, func.coalesce(Company.name, ranked.c.company_name).label("display_name"))
+            .outerjoin(Company, Company.code == ranked.c.company_code)
+            .where(or_(ranked.c.rank_top <= limit, ranked.c.rank_bottom <= limit))
+        ).mappings()
+
+        fields = INDUSTRY_SALARY_ITEM_FIELDS if by_industry else SALARY_ITEM_FIELDS
+        groups: Dict[tuple, tuple] = defaultdict(lambda: ([], []))
+        for row in rows:
+            item = {"company_code": row["company_code"], "company_name": row["display_name"]}
+            item.update({f: row[f] for f in fields})
+            if by_industry:
+                item["industry"] = row["industry"]
+            key = (row["year"], row["industry"] if by_industry else None)
+            if row["rank_top"] <= limit:
+                groups[key][0].append((row["rank_top"], item))
+            if row["rank_bottom"] <= limit:
+                groups[key][1].append((row["rank_bottom"], item))
+
+        return {
+            key: tuple([item for _, item in sorted(items, key=lambda x: x[0])] for items in (top, bottom))
+            for key, (top, bottom) in groups.items()
+        }
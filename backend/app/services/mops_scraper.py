@@ -18,6 +18,8 @@ from bs4 import BeautifulSoup
 from sqlmodel import Session, SQLModel, select
 
 from app.db.session import engine, archive_engine
+from app.services.generation_service import bump_generation
+from app.services.profile_service import track_profile_changes
 from app.models.company import Company
 from app.models.employee_benefit import EmployeeBenefit
 from app.models.non_manager_salary import NonManagerSalary
@@ -141,6 +143,7 @@ class MopsScraper:
         SQLModel.metadata.create_all(archive_engine)
         
         with Session(engine) as session, Session(archive_engine) as archive_session:
+            track_profile_changes(session)
             # Pre-load companies for matching
             company_code_map, company_name_map, company_branch_map = self._load_company_maps(session)
             
@@ -164,6 +167,7 @@ class MopsScraper:
             
             session.commit()
             archive_session.commit()
+            bump_generation(session)
 
     def _load_company_maps(self, session: Session) -> tuple:
         """Load company lookup maps for matching."""
@@ -0,0 +1,336 @@
+"""
+Profile Service - 公司完整資料 (profile) 的組裝與物化
+
+每家公司的 profile 需要七次查詢並逐列經 Pydantic 驗證，但資料只在同步時改變。
+因此將序列化後的 JSON 存入 `company_profile`，API 只需一次主鍵查詢即可回傳。
+
+增量重建:
+- 同步時以 `track_profile_changes(session)` 監聽 flush，關聯資料有實際變更
+  (新增、刪除或 last_updated 以外的欄位改變) 的公司會被標記為 stale
+- `materialize` 只重建 stale 與尚未建立的公司
+"""
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect as sa_inspect, update
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, SQLModel, select, delete, col, func
+
+from app.core.config import settings
+
+from app.db.history import previous_value
+from app.db.session import engine
+from app.services.generation_service import bump_generation
+from app.models.company import Company
+from app.models.company_profile import CompanyProfile
+from app.models.violation import Violation
+from app.models.employee_benefit import EmployeeBenefit
+from app.models.non_manager_salary import NonManagerSalary
+from app.models.welfare_policy import WelfarePolicy
+from app.models.salary_adjustment import SalaryAdjustment
+from app.models.environmental_violation import EnvironmentalViolation
+from app.models.violation_stat import ViolationStat
+from app.schemas.aggregation import CompanyProfileResponse, ViolationSummary, ViolationYearStat
+from app.schemas.environmental_violation import EnvironmentalViolationPublic
+from app.schemas.violation import ViolationPublic
+from app.services.violation_stats_service import SOURCE_ENV, SOURCE_LABOR, UNKNOWN_YEAR
+
+logger = logging.getLogger(__name__)
+
+# 構成 profile 的關聯資料表
+PROFILE_MODELS = (Violation, EmployeeBenefit, NonManagerSalary, WelfarePolicy, SalaryAdjustment, EnvironmentalViolation)
+
+# 不影響 profile 內容判斷的欄位 (每次同步都會更新)
+IGNORED_FIELDS = {"last_updated"}
+
+BATCH_SIZE = 200
+
+
+# ========== 變更追蹤 ==========
+def _company_codes(obj) -> Set[str]:
+    """物件 (目前與變更前) 所屬的公司代號"""
+    key = "code" if isinstance(obj, Company) else "company_code"
+    codes = {getattr(obj, key), previous_value(obj, key)}
+    return {code for code in codes if code}
+
+
+def _has_changes(obj) -> bool:
+    """
+    是否有 last_updated 以外的欄位實際改變。
+    commit 後過期的欄位被重新指派時 history 也會記為變更，須與資料庫中的舊值比對。
+    """
+    state = sa_inspect(obj)
+    return any(
+        getattr(obj, attr.key) != previous_value(obj, attr.key)
+        for attr in state.attrs
+        if attr.key not in IGNORED_FIELDS and attr.history.has_changes()
+    )
+
+
+def track_profile_changes(session: Session):
+    """
+    監聽此 Session 的 flush，將關聯資料有實際變更的公司 profile 標記為 stale。
+    (僅用於主資料庫的 Session)
+    """
+    tracked = (Company,) + PROFILE_MODELS
+    pending: Set[str] = set()
+
+    @event.listens_for(session, "before_flush")
+    def collect(session, flush_context, instances):
+        for obj in list(session.new) + list(session.deleted):
+            if isinstance(obj, tracked):
+                pending.update(_company_codes(obj))
+        for obj in session.dirty:
+            if isinstance(obj, tracked) and _has_changes(obj):
+                pending.update(_company_codes(obj))
+
+    @event.listens_for(session, "after_flush")
+    def mark(session, flush_context):
+        if pending:
+            mark_stale(session, pending)
+            pending.clear()
+
+
+def mark_stale(session: Session, company_codes: Iterable[str]):
+    """標記公司 profile 待重建 (不 commit)"""
+    codes = list(company_codes)
+    for i in range(0, len(codes), 500):
+        session.connection().execute(
+            update(CompanyProfile)
+            .where(col(CompanyProfile.company_code).in_(codes[i:i + 500]))
+            .values(stale=True)
+        )
+
+
+# ========== 組裝與物化 ==========
+class ProfileService:
+    def __init__(self):
+        pass
+
+    def build_profile(
+        self, session: Session, company: Company, latest_records: Optional[int] = None
+    ) -> CompanyProfileResponse:
+        """
+        以關聯資料組裝單一公司的完整資料。
+
+        Args:
+            latest_records: 違規紀錄只附最新 N 筆 (預設 PROFILE_LATEST_RECORDS)；
+                完整紀錄由分頁子資源提供，使 profile 大小不受公司歷史長度影響
+        """
+        return self.build_profiles(session, [company], latest_records)[company.code]
+
+    def build_profiles(
+        self, session: Session, companies: List[Company], latest_records: Optional[int] = None
+    ) -> Dict[str, CompanyProfileResponse]:
+        """
+        批次組裝多家公司的完整資料: 每個資料表一次 IN 查詢，再於記憶體中依公司分組
+        (查詢數與公司數無關)。
+
+        Returns:
+            {公司代號: profile}
+        """
+        if latest_records is None:
+            latest_records = settings.PROFILE_LATEST_RECORDS
+        if not companies:
+            return {}
+        codes = [company.code for company in companies]
+
+        violations = self._latest_violations_by_company(session, Violation, codes, latest_records)
+        environmental_violations = self._latest_violations_by_company(
+            session, EnvironmentalViolation, codes, latest_records
+        )
+        violation_summaries = self._violation_summaries(session, SOURCE_LABOR, codes)
+        environmental_summaries = self._violation_summaries(session, SOURCE_ENV, codes)
+        mops = {
+            key: self._records_by_company(session, model, codes)
+            for key, model in (
+                ("employee_benefits", EmployeeBenefit),
+                ("non_manager_salaries", NonManagerSalary),
+                ("welfare_policies", WelfarePolicy),
+                ("salary_adjustments", SalaryAdjustment),
+            )
+        }
+
+        return {
+            company.code: CompanyProfileResponse.model_validate(
+                {
+                    "company": company,
+                    "violations": violations.get(company.code, []),
+                    "violation_summary": violation_summaries.get(company.code) or ViolationSummary(),
+                    **{key: records.get(company.code, []) for key, records in mops.items()},
+                    "environmental_violations": environmental_violations.get(company.code, []),
+                    "environmental_violation_summary": (
+                        environmental_summaries.get(company.code) or ViolationSummary()
+                    ),
+                },
+                from_attributes=True,
+            )
+            for company in companies
+        }
+
+    def _records_by_company(self, session: Session, model, codes: List[str]) -> Dict[str, list]:
+        """MOPS 資料依公司分組 (年度新到舊)"""
+        grouped: Dict[str, list] = defaultdict(list)
+        for record in session.exec(
+            select(model)
+            .where(col(model.company_code).in_(codes))
+            .order_by(model.year.desc(), model.id)
+        ).all():
+            grouped[record.company_code].append(record)
+        return grouped
+
+    def _latest_violations_by_company(
+        self, session: Session, model, codes: List[str], limit: Optional[int]
+    ) -> Dict[str, list]:
+        """各公司依處分日期新到舊的違規紀錄 (每家最多 limit 筆，以視窗函數一次查詢)"""
+        order = (model.penalty_date.desc(), model.id.desc())
+        query = select(model).where(col(model.company_code).in_(codes))
+        if limit is not None:
+            ranked = (
+                select(model, func.row_number().over(partition_by=model.company_code, order_by=order).label("rn"))
+                .where(col(model.company_code).in_(codes))
+                .subquery()
+            )
+            record = aliased(model, ranked)
+            query = select(record).where(ranked.c.rn <= limit)
+            order = (record.company_code, record.penalty_date.desc(), record.id.desc())
+        grouped: Dict[str, list] = defaultdict(list)
+        for row in session.exec(query.order_by(*order)).all():
+            grouped[row.company_code].append(row)
+        return grouped
+
+    def _latest_violations(self, session: Session, model, company_code: str, limit: Optional[int]):
+        """依處分日期新到舊取違規紀錄 (limit=None 為全部)"""
+        query = (
+            select(model)
+            .where(model.company_code == company_code)
+            .order_by(model.penalty_date.desc(), model.id.desc())
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return session.exec(query).all()
+
+    def _violation_summaries(self, session: Session, source: str, codes: List[str]) -> Dict[str, ViolationSummary]:
+        """各公司違規按年度 (西元年) 的次數與罰鍰，以及全部合計 (讀取 violation_stats)"""
+        rows = session.exec(
+            select(ViolationStat.company_code, ViolationStat.year, func.sum(ViolationStat.count), func.sum(ViolationStat.fine))
+            .where(ViolationStat.source == source, col(ViolationStat.company_code).in_(codes))
+            .group_by(ViolationStat.company_code, ViolationStat.year)
+            .order_by(ViolationStat.company_code, ViolationStat.year.desc())
+        ).all()
+        by_company: Dict[str, List[ViolationYearStat]] = defaultdict(list)
+        for code, y, count, fine in rows:
+            by_company[code].append(ViolationYearStat(year=y if y != UNKNOWN_YEAR else None, count=count, fine=fine))
+        return {
+            code: ViolationSummary(
+                total_count=sum(stat.count for stat in by_year),
+                total_fine=sum(stat.fine for stat in by_year),
+                by_year=by_year,
+            )
+            for code, by_year in by_company.items()
+        }
+
+    def build_document(self, session: Session, company: Company) -> bytes:
+        """組裝並序列化 profile (與 API 回應相同的 JSON)"""
+        return self.build_profile(session, company).model_dump_json().encode("utf-8")
+
+    def get_document(self, session: Session, company_code: str) -> Optional[bytes]:
+        """
+        取得公司 profile JSON。物化文件有效時為一次主鍵查詢；
+        尚未物化或已標記 stale 時即時組裝。公司不存在時回傳 None。
+        """
+        profile = session.get(CompanyProfile, company_code)
+        if profile is not None and not profile.stale:
+            return profile.document
+
+        company = session.get(Company, company_code)
+        if company is None:
+            return None
+        return self.build_document(session, company)
+
+    def get_documents(self, session: Session, company_codes: List[str]) -> Dict[str, bytes]:
+        """
+        批次取得多家公司的 profile JSON: 一次 IN 查詢讀取有效的物化文件，
+        其餘 (尚未物化或 stale) 以 build_profiles 批次組裝。不存在的公司不在結果中。
+        """
+        documents: Dict[str, bytes] = {
+            profile.company_code: profile.document
+            for profile in session.exec(
+                select(CompanyProfile)
+                .where(col(CompanyProfile.company_code).in_(company_codes))
+                .where(CompanyProfile.stale == False)  # noqa: E712
+            ).all()
+        }
+        missing = [code for code in company_codes if code not in documents]
+        if missing:
+            companies = session.exec(select(Company).where(col(Company.code).in_(missing))).all()
+            for code, profile in self.build_profiles(session, list(companies)).items():
+                documents[code] = profile.model_dump_json().encode("utf-8")
+        return documents
+
+    def get_export_profile(self, session: Session, company_code: str) -> Optional[dict]:
+        """
+        靜態匯出用的 profile: 沿用物化文件，但違規紀錄為完整歷史
+        (靜態網站沒有分頁子資源可呼叫)。只有紀錄超過 N 筆的公司需要補查。
+        """
+        document = self.get_document(session, company_code)
+        if document is None:
+            return None
+        profile = json.loads(document)
+        for model, records_key, summary_key, schema in (
+            (Violation, "violations", "violation_summary", ViolationPublic),
+            (EnvironmentalViolation, "environmental_violations", "environmental_violation_summary", EnvironmentalViolationPublic),
+        ):
+            if profile[summary_key]["total_count"] > len(profile[records_key]):
+                records = self._latest_violations(session, model, company_code, limit=None)
+                profile[records_key] = [schema.model_validate(r).model_dump(mode="json") for r in records]
+        return profile
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        重建 stale 與尚未建立的公司 profile，並移除已不存在公司的文件。
+
+        Args:
+            full: 重建所有公司
+
+        Returns:
+            重建的公司數
+        """
+        SQLModel.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            query = select(Company.code).outerjoin(
+                CompanyProfile, CompanyProfile.company_code == Company.code
+            )
+            if not full:
+                query = query.where(
+                    col(CompanyProfile.company_code).is_(None) | (CompanyProfile.stale == True)  # noqa: E712
+                )
+            codes: List[str] = list(session.exec(query).all())
+            logger.info(f"Rebuilding {len(codes)} company profiles...")
+
+            for i in range(0, len(codes), BATCH_SIZE):
+                companies = session.exec(
+                    select(Company).where(col(Company.code).in_(codes[i:i + BATCH_SIZE]))
+                ).all()
+                profiles = self.build_profiles(session, list(companies))
+                for company in companies:
+                    profile = session.get(CompanyProfile, company.code) or CompanyProfile(company_code=company.code)
+                    profile.document = profiles[company.code].model_dump_json().encode("utf-8")
+                    profile.stale = False
+                    profile.updated_at = datetime.now()
+                    session.add(profile)
+                session.commit()
+                logger.info(f"Rebuilt {min(i + BATCH_SIZE, len(codes))}/{len(codes)} company profiles")
+
+            session.exec(delete(CompanyProfile).where(col(CompanyProfile.company_code).not_in(select(Company.code))))
+            session.commit()
+
+            if codes:
+                bump_generation(session)
+
+        logger.info(f"Materialized {len(codes)} company profiles")
+        return len(codes)
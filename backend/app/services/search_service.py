@@ -0,0 +1,149 @@
+"""
+Search Service - 公司與違規紀錄全文檢索
+
+以 FTS5 trigram 索引 (見 app/db/search_index.py) 檢索並依 bm25 排序；
+少於三個字元的詞無法走 trigram 索引，改以 LIKE 過濾 (整個查詢都太短時退回 LIKE 搜尋)。
+"""
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, literal_column, or_, table
+from sqlmodel import Session, col, func, select
+
+from app.db.search_index import SEARCH_INDEXES, TRIGRAM_MIN_LENGTH, match_expression
+from app.models.company import Company
+from app.models.environmental_violation import EnvironmentalViolation
+from app.models.violation import Violation
+from app.schemas.search import CompanySearchHit, ViolationSearchHit
+
+logger = logging.getLogger(__name__)
+
+# 違規模型 -> FTS 索引名稱
+VIOLATION_INDEXES = {
+    Violation: "violation_fts",
+    EnvironmentalViolation: "environmental_violation_fts",
+}
+
+# 公司搜尋欄位權重 (code, name, abbreviation)
+COMPANY_WEIGHTS = (10.0, 5.0, 5.0)
+
+SNIPPET_TOKENS = 16
+
+
+def _fts_table(name: str):
+    _, columns = SEARCH_INDEXES[name]
+    return table(name, column("rowid"), *[column(c) for c in columns])
+
+
+def _match(name: str, expression: str):
+    return literal_column(name).op("MATCH")(expression)
+
+
+def _short_terms_filter(model, columns, query: str):
+    """trigram 無法檢索的短詞: 每個詞須出現在任一欄位 (LIKE)"""
+    clauses = []
+    for term in query.split():
+        if len(term) < TRIGRAM_MIN_LENGTH:
+            clauses.append(or_(*[col(getattr(model, c)).ilike(f"%{term}%") for c in columns]))
+    return clauses
+
+
+def _score(bm25) -> Optional[float]:
+    # bm25 越小越相關，轉為越大越相關
+    return round(-bm25, 4) if bm25 is not None else None
+
+
+class SearchService:
+    def __init__(self):
+        pass
+
+    def search_companies(self, session: Session, query: str, limit: int = 20) -> List[CompanySearchHit]:
+        """以代號 / 名稱 / 簡稱搜尋公司 (代號命中權重較高)"""
+        _, columns = SEARCH_INDEXES["company_fts"]
+        fields = (Company.code, Company.name, Company.abbreviation, Company.market_type, Company.industry)
+        expression = match_expression(query)
+        short_terms = _short_terms_filter(Company, columns, query)
+
+        if expression is None:
+            statement = select(*fields, literal_column("NULL").label("score")).order_by(Company.code)
+        else:
+            fts = _fts_table("company_fts")
+            bm25 = func.bm25(literal_column("company_fts"), *COMPANY_WEIGHTS)
+            statement = (
+                select(*fields, bm25.label("score"))
+                .select_from(fts.join(Company, literal_column("company.rowid") == fts.c.rowid))
+                .where(_match("company_fts", expression))
+                .order_by(bm25)
+            )
+        rows = session.exec(statement.where(*short_terms).limit(limit)).all()
+        return [
+            CompanySearchHit(
+                code=row.code,
+                name=row.name,
+                abbreviation=row.abbreviation,
+                market_type=row.market_type,
+                industry=row.industry,
+                score=_score(row.score),
+            )
+            for row in rows
+        ]
+
+    def search_violations(
+        self,
+        session: Session,
+        model,
+        query: str,
+        page: int = 1,
+        size: int = 20,
+        company_code: Optional[List[str]] = None,
+    ) -> Tuple[List[ViolationSearchHit], int]:
+        """
+        搜尋違規紀錄內容 (事業名稱、違規內容 / 事由、法條)。
+
+        Returns:
+            (該頁項目, 總筆數)
+        """
+        name = VIOLATION_INDEXES[model]
+        _, columns = SEARCH_INDEXES[name]
+        fields = (model.id, model.company_code, model.company_name, model.penalty_date, model.fine_amount, model.law_article)
+        expression = match_expression(query)
+
+        filters = _short_terms_filter(model, columns, query)
+        if company_code:
+            filters.append(col(model.company_code).in_(company_code))
+
+        if expression is None:
+            statement = select(
+                *fields, literal_column("NULL").label("snippet"), literal_column("NULL").label("score")
+            ).where(*filters)
+            order_by = (model.penalty_date.desc(), model.id.desc())
+            count = select(func.count()).select_from(model).where(*filters)
+        else:
+            fts = _fts_table(name)
+            source = fts.join(model, model.id == fts.c.rowid)
+            bm25 = func.bm25(literal_column(name))
+            snippet = func.snippet(literal_column(name), -1, "【", "】", "…", SNIPPET_TOKENS)
+            statement = (
+                select(*fields, snippet.label("snippet"), bm25.label("score"))
+                .select_from(source)
+                .where(_match(name, expression), *filters)
+            )
+            order_by = (bm25, model.id.desc())
+            count = select(func.count()).select_from(source).where(_match(name, expression), *filters)
+
+        total = session.exec(count).one()
+        rows = session.exec(statement.order_by(*order_by).offset((page - 1) * size).limit(size)).all()
+        items = [
+            ViolationSearchHit(
+                id=row.id,
+                company_code=row.company_code,
+                company_name=row.company_name,
+                penalty_date=row.penalty_date,
+                fine_amount=row.fine_amount,
+                law_article=row.law_article,
+                snippet=row.snippet,
+                score=_score(row.score),
+            )
+            for row in rows
+        ]
+        return items, total
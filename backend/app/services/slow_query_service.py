@@ -0,0 +1,225 @@
+"""
+Slow Query Service - 慢查詢紀錄
+
+API 行程的 engine 掛上 before/after_cursor_execute，執行時間超過 SLOW_QUERY_THRESHOLD_MS
+的 statement:
+- 以同一個 DBAPI 連線、相同參數執行 `EXPLAIN QUERY PLAN`，記錄 SQLite 選用的索引 / 全表掃描
+- 以 WARNING 寫入 log (耗時、statement、綁定參數、查詢計畫)
+- 交由背景 thread 寫入獨立資料庫 (SLOW_QUERY_DATABASE_URL) 的 `slow_query` 表 (不阻塞請求，
+  也不與主資料庫的同步寫入搶鎖)，只保留最新 SLOW_QUERY_MAX_ROWS 筆；資料庫鎖定時捨棄該批紀錄
+
+statement 以 fingerprint (去除常值、IN 清單長度) 分組，`/system/slow-queries` 依此列出最嚴重的查詢。
+"""
+import hashlib
+import json
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select, func, col
+
+from app.core.config import settings
+from app.db.session import slow_query_engine
+from app.models.slow_query import SlowQuery
+from app.schemas.system import SlowQueryOrder, SlowQueryStats
+
+logger = logging.getLogger(__name__)
+
+# 只對讀取查詢執行 EXPLAIN QUERY PLAN
+EXPLAINABLE_PREFIXES = ("select", "with")
+
+# 背景寫入佇列上限 (滿時捨棄，只保留 log)
+QUEUE_MAX_SIZE = 1000
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def normalize_statement(statement: str) -> str:
+    """去除空白差異、常值與 IN 清單長度 (e.g. IN (?, ?, ?) -> IN (?+))"""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _LITERALS.sub("?", normalized)
+    return _IN_LISTS.sub("(?+)", normalized)
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize_statement(statement).encode("utf-8")).hexdigest()[:16]
+
+
+def explain_query_plan(dbapi_connection, statement: str, parameters) -> Optional[str]:
+    """
+    以 EXPLAIN QUERY PLAN 取得查詢計畫 (依節點深度縮排)；非讀取查詢或失敗時回傳 None。
+    直接使用 DBAPI 連線，不會再觸發 SQLAlchemy 事件。
+    """
+    if not statement.lstrip().lower().startswith(EXPLAINABLE_PREFIXES):
+        return None
+    try:
+        rows = dbapi_connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+    except sqlite3.Error as e:
+        logger.debug(f"EXPLAIN QUERY PLAN failed: {e}")
+        return None
+    depth: Dict[int, int] = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return "\n".join(lines)
+
+
+def _serialize_parameters(parameters) -> Optional[str]:
+    if parameters is None:
+        return None
+    if not isinstance(parameters, dict):
+        parameters = list(parameters)
+    return json.dumps(parameters, ensure_ascii=False, default=str)
+
+
+# ========== 背景寫入 ==========
+_queue: "queue.Queue[dict]" = queue.Queue(maxsize=QUEUE_MAX_SIZE)
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def _write_loop():
+    while True:
+        rows = [_queue.get()]
+        while True:
+            try:
+                rows.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            with Session(slow_query_engine) as session:
+                session.add_all([SlowQuery(**row) for row in rows])
+                session.flush()
+                # 只保留最新的 SLOW_QUERY_MAX_ROWS 筆
+                session.execute(
+                    text(
+                        "DELETE FROM slow_query WHERE id <= "
+                        "(SELECT id FROM slow_query ORDER BY id DESC LIMIT 1 OFFSET :keep)"
+                    ),
+                    {"keep": settings.SLOW_QUERY_MAX_ROWS},
+                )
+                session.commit()
+        except OperationalError as e:
+            # 鎖定 (busy_timeout 逾時) 時不重試，紀錄已寫入 log
+            logger.warning(f"Dropped {len(rows)} slow queries: {e.orig}")
+        except Exception as e:
+            logger.error(f"Failed to record {len(rows)} slow queries: {e}")
+
+
+def _enqueue(row: dict):
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_loop, name="slow-query-writer", daemon=True)
+                _writer.start()
+    try:
+        _queue.put_nowait(row)
+    except queue.Full:
+        pass
+
+
+_installed: Set[int] = set()
+
+
+def install_slow_query_log(engine: Engine, threshold_ms: Optional[float] = None):
+    """為 engine 加上慢查詢紀錄 (重複呼叫不會重複安裝；門檻 <= 0 時不安裝)"""
+    # 紀錄表在關閉時也建立，/system/slow-queries 才能回傳空清單
+    SlowQuery.metadata.create_all(slow_query_engine)
+    threshold_ms = settings.SLOW_QUERY_THRESHOLD_MS if threshold_ms is None else threshold_ms
+    if threshold_ms <= 0 or id(engine) in _installed:
+        return
+    _installed.add(id(engine))
+    threshold = threshold_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("slow_query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        if elapsed < threshold:
+            return
+
+        plan = None if executemany else explain_query_plan(cursor.connection, statement, parameters)
+        elapsed_ms = round(elapsed * 1000, 2)
+        serialized = None if executemany else _serialize_parameters(parameters)
+        logger.warning(
+            f"Slow query ({elapsed_ms} ms): {_WHITESPACE.sub(' ', statement).strip()} "
+            f"parameters={serialized}" + (f"\n{plan}" if plan else "")
+        )
+        _enqueue({
+            "fingerprint": fingerprint(statement),
+            "statement": statement,
+            "parameters": serialized,
+            "elapsed_ms": elapsed_ms,
+            "query_plan": plan,
+            "created_at": datetime.now(),
+        })
+
+
+class SlowQueryService:
+    def __init__(self):
+        pass
+
+    def get_worst(
+        self,
+        session: Session,
+        limit: int = 20,
+        order: SlowQueryOrder = SlowQueryOrder.total,
+        since: Optional[datetime] = None,
+    ) -> List[SlowQueryStats]:
+        """
+        依 fingerprint 彙總慢查詢，回傳最嚴重的前 limit 組 (附最慢一次的 statement、參數與查詢計畫)。
+        """
+        total_ms = func.sum(SlowQuery.elapsed_ms).label("total_ms")
+        max_ms = func.max(SlowQuery.elapsed_ms).label("max_ms")
+        count = func.count(SlowQuery.id).label("count")
+        sort_key = {SlowQueryOrder.total: total_ms, SlowQueryOrder.max: max_ms, SlowQueryOrder.count: count}[order]
+
+        query = select(
+            SlowQuery.fingerprint, count, total_ms, max_ms, func.max(SlowQuery.created_at).label("last_seen"),
+        ).group_by(SlowQuery.fingerprint)
+        if since is not None:
+            query = query.where(SlowQuery.created_at >= since)
+        groups = session.exec(query.order_by(sort_key.desc()).limit(limit)).all()
+        if not groups:
+            return []
+
+        # 每組最慢的一次
+        samples: Dict[str, SlowQuery] = {}
+        sample_query = select(SlowQuery).where(col(SlowQuery.fingerprint).in_([group.fingerprint for group in groups]))
+        if since is not None:
+            sample_query = sample_query.where(SlowQuery.created_at >= since)
+        for row in session.exec(sample_query.order_by(col(SlowQuery.elapsed_ms).desc())).all():
+            samples.setdefault(row.fingerprint, row)
+
+        return [
+            SlowQueryStats(
+                fingerprint=group.fingerprint,
+                count=group.count,
+                total_ms=round(group.total_ms, 2),
+                avg_ms=round(group.total_ms / group.count, 2),
+                max_ms=group.max_ms,
+                last_seen=group.last_seen,
+                statement=samples[group.fingerprint].statement,
+                parameters=samples[group.fingerprint].parameters,
+                query_plan=samples[group.fingerprint].query_plan,
+            )
+            for group in groups
+        ]
@@ -0,0 +1,143 @@
+"""
+Suggest Service - 公司搜尋建議 (typeahead)
+
+以公司目錄 (CompanyService.get_catalog) 在記憶體中建立索引，輸入每個字都不需查詢資料庫:
+- 前綴索引: 代號 / 名稱 / 簡稱的各前綴對應到公司
+- n-gram 索引: 單字與雙字 (bigram) 的倒排索引，再確認子字串相符
+- 排序: 完全相符 > 代號前綴 > 名稱/簡稱前綴 > 子字串，再依市場別、資本額
+
+索引於啟動時建立，資料世代改變時 (同步後) 自動重建。
+"""
+import logging
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlmodel import Session
+
+from app.services.company_service import CompanyService
+from app.services.generation_service import get_generation
+
+logger = logging.getLogger(__name__)
+
+# 市場別排序 (上市優先)
+MARKET_RANK = {"Listed": 0, "OTC": 1, "Emerging": 2, "Public": 3}
+
+SEARCH_FIELDS = ("code", "name", "abbreviation")
+
+# 前綴索引只收錄到此長度，更長的輸入由 n-gram 子字串比對處理
+MAX_PREFIX_LENGTH = 16
+
+
+def normalize(text: Optional[str]) -> str:
+    """全形轉半形、小寫、去除空白"""
+    if not text:
+        return ""
+    return "".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _prefixes(text: str) -> List[str]:
+    return [text[:n] for n in range(1, min(len(text), MAX_PREFIX_LENGTH) + 1)]
+
+
+class TypeaheadIndex:
+    """
+    項目先依 (市場別, 資本額) 排序，所有索引的 posting list 都依此順序排列，
+    查詢時依相符程度逐層取前 k 筆即可停止，不需排序全部候選。
+    """
+
+    def __init__(self, catalog: List[dict]):
+        self.items = sorted(
+            catalog,
+            key=lambda item: (
+                MARKET_RANK.get(item.get("market_type"), len(MARKET_RANK)),
+                -(item.get("capital") or 0),
+                item["code"],
+            ),
+        )
+        self._keys: List[Tuple[str, ...]] = [
+            tuple(normalize(item.get(field)) for field in SEARCH_FIELDS) for item in self.items
+        ]
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._code_prefixes: Dict[str, List[int]] = defaultdict(list)
+        self._name_prefixes: Dict[str, List[int]] = defaultdict(list)
+        self._unigrams: Dict[str, List[int]] = defaultdict(list)
+        self._bigrams: Dict[str, List[int]] = defaultdict(list)
+
+        for i, (code, *names) in enumerate(self._keys):
+            keys = [key for key in (code, *names) if key]
+            for key in set(keys):
+                self._exact[key].append(i)
+            for prefix in _prefixes(code):
+                self._code_prefixes[prefix].append(i)
+            for prefix in {p for name in names for p in _prefixes(name)}:
+                self._name_prefixes[prefix].append(i)
+            for gram in {g for key in keys for g in _grams(key, 1)}:
+                self._unigrams[gram].append(i)
+            for gram in {g for key in keys for g in _grams(key, 2)}:
+                self._bigrams[gram].append(i)
+
+    def _substring_matches(self, query: str) -> Iterator[int]:
+        """依排序逐一產生包含 query 的項目"""
+        if len(query) == 1:
+            yield from self._unigrams.get(query, ())
+            return
+        postings = [self._bigrams.get(gram) for gram in _grams(query, 2)]
+        if not all(postings):
+            return
+        for i in min(postings, key=len):
+            if any(query in key for key in self._keys[i]):
+                yield i
+
+    def suggest(self, query: str, limit: int = 10) -> List[dict]:
+        query = normalize(query)
+        if not query:
+            return []
+        results: List[int] = []
+        seen: Set[int] = set()
+        # 依相符程度逐層取用，每層已依市場別與資本額排序
+        for candidates in (
+            self._exact.get(query, ()),
+            self._code_prefixes.get(query, ()),
+            self._name_prefixes.get(query, ()),
+            self._substring_matches(query),
+        ):
+            for i in candidates:
+                if i not in seen:
+                    seen.add(i)
+                    results.append(i)
+                    if len(results) >= limit:
+                        return [self.items[i] for i in results]
+        return [self.items[i] for i in results]
+
+
+_index: Optional[TypeaheadIndex] = None
+_index_generation: Optional[int] = None
+_lock = threading.Lock()
+
+
+class SuggestService:
+    def __init__(self):
+        pass
+
+    def get_index(self, session: Session) -> TypeaheadIndex:
+        """取得目前資料世代的索引 (世代改變時重建)"""
+        global _index, _index_generation
+        generation, _ = get_generation()
+        if _index is not None and _index_generation == generation:
+            return _index
+        with _lock:
+            if _index is None or _index_generation != generation:
+                catalog = CompanyService().get_catalog(session)
+                _index = TypeaheadIndex(catalog)
+                _index_generation = generation
+                logger.info(f"Built typeahead index: {len(catalog)} companies (generation {generation})")
+        return _index
+
+    def suggest(self, session: Session, query: str, limit: int = 10) -> List[dict]:
+        return self.get_index(session).suggest(query, limit=limit)
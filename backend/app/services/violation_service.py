@@ -9,6 +9,9 @@ from sqlmodel import Session, select, col
 from app.models.violation import Violation
 from app.models.company import Company
 from app.db.session import engine
+from app.services.generation_service import bump_generation
+from app.services.profile_service import track_profile_changes
+from app.services.violation_stats_service import track_violation_stats
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,6 +37,8 @@ class ViolationService:
         SQLModel.metadata.create_all(archive_engine)
         
         with Session(engine) as session, Session(archive_engine) as archive_session:
+            track_profile_changes(session)
+            track_violation_stats(session)
             # 1. Pre-load companies for linking optimization
             # Fetch essential fields: code, name, abbreviation, chairman
             # For 2000 companies this is fine. If 100k+, need smarter lookup.
@@ -74,6 +79,8 @@ class ViolationService:
                 session.commit()
                 archive_session.commit()
 
+            bump_generation(session)
+
     def _parse_json(self, file_path: Path, source: str) -> List[Violation]:
         records = []
         try:
@@ -0,0 +1,221 @@
+"""
+Violation Stats Service - 違規統計彙總 (violation_stats / violation_facets)
+
+年度摘要、排行榜、公司 profile、分析快照與 facets 端點都需要違規次數與罰鍰的
+彙總，原本各自以 GROUP BY 掃描整個違規資料表。改由兩張彙總表保存:
+
+- `violation_stats`: (公司代號, 年度, 違規類型, 來源類別) -> (次數, 罰鍰)
+- `violation_facets`: (公司代號, 年月, 違規類型, 來源類別, 主管機關, 法條) -> (次數, 罰鍰)
+
+維護方式:
+- 同步時以 `track_violation_stats(session)` 監聽 flush，依新增、刪除或變更的
+  違規紀錄計算差額，於同一交易內以 UPSERT 增量更新
+- 資料表新建時由原始資料表重建；`materialize --full` 也會整個重建
+"""
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, extract, insert, literal, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, SQLModel, select, delete, col, func
+
+from app.db.history import previous_value
+from app.models.environmental_violation import EnvironmentalViolation
+from app.models.violation import Violation
+from app.models.violation_facet import ViolationFacet
+from app.models.violation_stat import ViolationStat
+
+logger = logging.getLogger(__name__)
+
+SOURCE_LABOR = "labor"
+SOURCE_ENV = "env"
+
+# 違規類型 -> (模型, 來源類別欄位)
+VIOLATION_SOURCES = {
+    SOURCE_LABOR: (Violation, "data_source"),
+    SOURCE_ENV: (EnvironmentalViolation, "violation_type"),
+}
+
+# 處分日期不明的年度 / 年月值
+UNKNOWN_YEAR = 0
+UNKNOWN_MONTH = 0
+
+# 彙總表 (主鍵欄位即彙總維度)
+ROLLUP_MODELS = (ViolationStat, ViolationFacet)
+
+# 紀錄欄位 (category 依違規類型對應到 data_source / violation_type)
+RECORD_FIELDS = ("company_code", "penalty_date", "category", "authority", "law_article", "fine_amount")
+
+
+def _date_part(part: str, model):
+    return extract(part, model.penalty_date)
+
+
+# 彙總維度 -> (由紀錄值計算, SQL 運算式)
+DIMENSIONS: Dict[str, Tuple[Callable[[dict, str], object], Callable[[type, str], object]]] = {
+    "company_code": (
+        lambda record, source: record["company_code"],
+        lambda model, source: model.company_code,
+    ),
+    "source": (
+        lambda record, source: source,
+        lambda model, source: literal(source),
+    ),
+    "year": (
+        lambda record, source: record["penalty_date"].year if record["penalty_date"] else UNKNOWN_YEAR,
+        lambda model, source: func.coalesce(_date_part("year", model), UNKNOWN_YEAR),
+    ),
+    "month": (
+        lambda record, source: (
+            record["penalty_date"].year * 100 + record["penalty_date"].month
+            if record["penalty_date"] else UNKNOWN_MONTH
+        ),
+        lambda model, source: func.coalesce(
+            _date_part("year", model) * 100 + _date_part("month", model), UNKNOWN_MONTH
+        ),
+    ),
+    "category": (
+        lambda record, source: record["category"] or "",
+        lambda model, source: func.coalesce(getattr(model, VIOLATION_SOURCES[source][1]), ""),
+    ),
+    "authority": (
+        lambda record, source: record["authority"] or "",
+        lambda model, source: func.coalesce(model.authority, ""),
+    ),
+    "law_article": (
+        lambda record, source: record["law_article"] or "",
+        lambda model, source: func.coalesce(model.law_article, ""),
+    ),
+}
+
+RollupKey = Tuple
+Deltas = Dict[type, Dict[RollupKey, List[int]]]
+
+
+def _key_columns(rollup) -> List[str]:
+    return [c.name for c in rollup.__table__.primary_key]
+
+
+def _source_of(obj) -> Optional[str]:
+    for source, (model, _) in VIOLATION_SOURCES.items():
+        if isinstance(obj, model):
+            return source
+    return None
+
+
+def _record(obj, source: str, value=getattr) -> Optional[dict]:
+    """紀錄的彙總欄位值；未關聯公司的紀錄不列入統計 (回傳 None)"""
+    category_field = VIOLATION_SOURCES[source][1]
+    record = {
+        field: value(obj, category_field if field == "category" else field)
+        for field in RECORD_FIELDS
+    }
+    return record if record["company_code"] else None
+
+
+def track_violation_stats(session: Session):
+    """
+    監聽此 Session 的 flush，依違規紀錄的變更增量更新彙總表。
+    (僅用於主資料庫的 Session)
+    """
+    deltas: Deltas = {rollup: defaultdict(lambda: [0, 0]) for rollup in ROLLUP_MODELS}
+
+    def add(record: Optional[dict], source: str, sign: int):
+        if record is None:
+            return
+        for rollup, rollup_deltas in deltas.items():
+            key = tuple(DIMENSIONS[name][0](record, source) for name in _key_columns(rollup))
+            rollup_deltas[key][0] += sign
+            rollup_deltas[key][1] += sign * (record["fine_amount"] or 0)
+
+    @event.listens_for(session, "before_flush")
+    def collect(session, flush_context, instances):
+        for obj in session.new:
+            source = _source_of(obj)
+            if source:
+                add(_record(obj, source), source, 1)
+        for obj in session.deleted:
+            source = _source_of(obj)
+            if source:
+                add(_record(obj, source, previous_value), source, -1)
+        for obj in session.dirty:
+            source = _source_of(obj)
+            if source:
+                old, new = _record(obj, source, previous_value), _record(obj, source)
+                if old != new:
+                    add(old, source, -1)
+                    add(new, source, 1)
+
+    @event.listens_for(session, "after_flush")
+    def apply(session, flush_context):
+        for rollup, rollup_deltas in deltas.items():
+            if rollup_deltas:
+                apply_deltas(session.connection(), rollup, rollup_deltas)
+                rollup_deltas.clear()
+
+    @event.listens_for(session, "after_rollback")
+    def discard(session):
+        for rollup_deltas in deltas.values():
+            rollup_deltas.clear()
+
+
+def apply_deltas(connection: Connection, rollup, deltas: Dict[RollupKey, List[int]]):
+    """將差額 UPSERT 至彙總表，次數歸零的列刪除 (不 commit)"""
+    names = _key_columns(rollup)
+    rows = [
+        {**dict(zip(names, key)), "count": count, "fine": fine}
+        for key, (count, fine) in deltas.items()
+        if count or fine
+    ]
+    if not rows:
+        return
+    table = rollup.__table__
+    statement = sqlite_insert(table)
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=names,
+            set_={
+                "count": table.c["count"] + statement.excluded["count"],
+                "fine": table.c["fine"] + statement.excluded["fine"],
+            },
+        ),
+        rows,
+    )
+    emptied = [key for key, (count, _) in deltas.items() if count < 0]
+    if emptied:
+        keys = tuple_(*table.primary_key.columns)
+        for i in range(0, len(emptied), 500):
+            connection.execute(
+                delete(table).where(keys.in_(emptied[i:i + 500]), table.c["count"] <= 0)
+            )
+
+
+def rebuild_rollup(connection: Connection, rollup):
+    """以原始違規資料表重建單一彙總表"""
+    names = _key_columns(rollup)
+    connection.execute(delete(rollup))
+    for source, (model, _) in VIOLATION_SOURCES.items():
+        dimensions = [DIMENSIONS[name][1](model, source) for name in names]
+        query = (
+            select(*dimensions, func.count(model.id), func.coalesce(func.sum(model.fine_amount), 0))
+            .where(col(model.company_code).is_not(None))
+            .group_by(*[d for name, d in zip(names, dimensions) if name != "source"])
+        )
+        connection.execute(insert(rollup).from_select([*names, "count", "fine"], query))
+    logger.info(f"Rebuilt {rollup.__tablename__}")
+
+
+def rebuild_violation_stats(connection: Connection):
+    """以原始違規資料表重建所有彙總表"""
+    for rollup in ROLLUP_MODELS:
+        rebuild_rollup(connection, rollup)
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def _backfill_violation_stats(target, connection: Connection, tables=(), **kw):
+    # 彙總表新建時 (既有資料庫升級) 以現有違規紀錄回填
+    for rollup in ROLLUP_MODELS:
+        if rollup.__table__ in tables:
+            rebuild_rollup(connection, rollup)
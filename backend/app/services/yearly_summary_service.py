@@ -0,0 +1,206 @@
+"""
+Yearly Summary Service - 公司年度摘要 (公司×年份矩陣)
+
+以單一 SQL 完成過濾、排序與分頁:
+- 驅動集合: 四個 MOPS 資料表中出現過的 (公司代號, 民國年)，年份限定於
+  員工福利資料已有的年度
+- LEFT JOIN 違規統計 (violation_stats，僅 include 或排序需要時)
+- ORDER BY + LIMIT/OFFSET 後，只為該頁的列載入 MOPS 完整物件
+"""
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import union
+from sqlmodel import Session, asc, col, desc, func, select
+
+from app.db.pagination import count_total
+from app.models.company import Company
+from app.models.employee_benefit import EmployeeBenefit
+from app.models.non_manager_salary import NonManagerSalary
+from app.models.salary_adjustment import SalaryAdjustment
+from app.models.violation_stat import ViolationStat
+from app.models.welfare_policy import WelfarePolicy
+from app.schemas.aggregation import YearlySummaryItem
+from app.schemas.mops import (
+    EmployeeBenefitResponse,
+    NonManagerSalaryResponse,
+    SalaryAdjustmentResponse,
+    WelfarePolicyResponse,
+)
+from app.services.violation_stats_service import SOURCE_ENV, SOURCE_LABOR, UNKNOWN_YEAR
+
+logger = logging.getLogger(__name__)
+
+MOPS_MODELS = (EmployeeBenefit, NonManagerSalary, WelfarePolicy, SalaryAdjustment)
+
+INCLUDE_OPTIONS = (
+    "violations",
+    "env_violations",
+    "employee_benefit",
+    "non_manager_salary",
+    "welfare_policy",
+    "salary_adjustment",
+)
+
+# include 名稱 -> (MOPS 模型, 回應 schema)
+MOPS_INCLUDES = {
+    "employee_benefit": (EmployeeBenefit, EmployeeBenefitResponse),
+    "non_manager_salary": (NonManagerSalary, NonManagerSalaryResponse),
+    "welfare_policy": (WelfarePolicy, WelfarePolicyResponse),
+    "salary_adjustment": (SalaryAdjustment, SalaryAdjustmentResponse),
+}
+
+# include 名稱 (亦為統計欄位前綴) -> violation_stats 的違規類型
+VIOLATION_INCLUDES = {
+    "violations": SOURCE_LABOR,
+    "env_violations": SOURCE_ENV,
+}
+
+
+def _violation_aggregates(source: str, prefix: str):
+    """違規彙總子查詢 (讀取 violation_stats): (歷年累計, 按民國年)"""
+    total = (
+        select(
+            ViolationStat.company_code.label("company_code"),
+            func.sum(ViolationStat.count).label(f"{prefix}_total_count"),
+            func.sum(ViolationStat.fine).label(f"{prefix}_total_fine"),
+        )
+        .where(ViolationStat.source == source)
+        .group_by(ViolationStat.company_code)
+        .subquery(f"{prefix}_total")
+    )
+    roc_year = ViolationStat.year - 1911  # 西元轉民國
+    yearly = (
+        select(
+            ViolationStat.company_code.label("company_code"),
+            roc_year.label("year"),
+            func.sum(ViolationStat.count).label(f"{prefix}_year_count"),
+            func.sum(ViolationStat.fine).label(f"{prefix}_year_fine"),
+        )
+        .where(ViolationStat.source == source, ViolationStat.year != UNKNOWN_YEAR)
+        .group_by(ViolationStat.company_code, ViolationStat.year)
+        .subquery(f"{prefix}_year")
+    )
+    return total, yearly
+
+
+class YearlySummaryService:
+    def __init__(self):
+        pass
+
+    def get_yearly_summary(
+        self,
+        session: Session,
+        page: int = 1,
+        size: Optional[int] = 20,
+        sorts: Optional[List[str]] = None,
+        filters: Optional[dict] = None,
+        include: Optional[Set[str]] = None,
+    ) -> Tuple[List[YearlySummaryItem], int]:
+        """
+        取得公司年度摘要。
+
+        Args:
+            session: 資料庫 Session
+            page: 頁碼 (從 1 開始)
+            size: 每頁筆數 (None 表示不分頁)
+            sorts: 排序欄位 (e.g. -violations_total_count, year)；NULL 一律排在最後
+            filters: year / company_code / market_type / industry
+            include: 要包含的資料 (見 INCLUDE_OPTIONS，"all" 表示全部)
+
+        Returns:
+            (該頁項目, 總筆數)
+        """
+        filters = filters or {}
+        include = set(include or ())
+        if "all" in include:
+            include = set(INCLUDE_OPTIONS)
+
+        # 驅動集合: 有 MOPS 資料的 (公司, 年度)，年度限定於員工福利已有的年份
+        years = select(EmployeeBenefit.year).distinct()
+        if filters.get("year"):
+            years = years.where(col(EmployeeBenefit.year).in_(filters["year"]))
+        keys = union(*[
+            select(model.company_code.label("company_code"), model.year.label("year"))
+            .where(col(model.company_code).is_not(None))
+            .where(col(model.year).in_(years.scalar_subquery()))
+            for model in MOPS_MODELS
+        ]).subquery("keys")
+
+        columns = {
+            "company_code": keys.c.company_code,
+            "company_name": Company.name,
+            "market_type": Company.market_type,
+            "industry": Company.industry,
+            "year": keys.c.year,
+        }
+        query = select(*[c.label(name) for name, c in columns.items()]).select_from(keys).join(
+            Company, Company.code == keys.c.company_code
+        )
+
+        # 違規統計: 僅在 include 或排序需要時 JOIN
+        sort_fields = [s.lstrip("-") for s in sorts or []]
+        for prefix, source in VIOLATION_INCLUDES.items():
+            if prefix not in include and not any(f.startswith(f"{prefix}_") for f in sort_fields):
+                continue
+            total, yearly = _violation_aggregates(source, prefix)
+            query = query.outerjoin(total, total.c.company_code == keys.c.company_code).outerjoin(
+                yearly, (yearly.c.company_code == keys.c.company_code) & (yearly.c.year == keys.c.year)
+            )
+            for sub, period in ((yearly, "year"), (total, "total")):
+                for metric in ("count", "fine"):
+                    column_name = f"{prefix}_{period}_{metric}"
+                    columns[column_name] = func.coalesce(sub.c[column_name], 0)
+                    if prefix in include:
+                        query = query.add_columns(columns[column_name].label(column_name))
+
+        # 過濾
+        if filters.get("company_code"):
+            query = query.where(col(keys.c.company_code).in_(filters["company_code"]))
+        if filters.get("market_type"):
+            query = query.where(col(Company.market_type).in_(filters["market_type"]))
+        if filters.get("industry"):
+            query = query.where(col(Company.industry).in_(filters["industry"]))
+
+        total_count = count_total(session, query)
+
+        # 排序 (NULL 排最後)，最後以年度新到舊、公司代號作為穩定次序
+        order_by = []
+        for sort_field in sorts or []:
+            column = columns.get(sort_field.lstrip("-"))
+            if column is None:
+                continue
+            direction = desc if sort_field.startswith("-") else asc
+            order_by.extend([column.is_(None), direction(column)])
+        order_by.extend([desc(keys.c.year), asc(keys.c.company_code)])
+        query = query.order_by(*order_by)
+
+        if size is not None:
+            query = query.offset((page - 1) * size).limit(size)
+
+        rows = session.exec(query).all()
+        items = [YearlySummaryItem(**row._mapping) for row in rows]
+        self._attach_mops(session, items, include)
+        return items, total_count
+
+    def _attach_mops(self, session: Session, items: List[YearlySummaryItem], include: Set[str]):
+        """只為此頁的 (公司, 年度) 載入 MOPS 完整物件"""
+        if not items:
+            return
+        codes = {item.company_code for item in items}
+        years = {item.year for item in items}
+        for name, (model, schema) in MOPS_INCLUDES.items():
+            if name not in include:
+                continue
+            records: Dict[Tuple[str, int], object] = {}
+            for record in session.exec(
+                select(model)
+                .where(col(model.company_code).in_(codes))
+                .where(col(model.year).in_(years))
+                .order_by(model.id)
+            ).all():
+                records[(record.company_code, record.year)] = record
+            for item in items:
+                record = records.get((item.company_code, item.year))
+                if record is not None:
+                    setattr(item, name, schema.model_validate(record))
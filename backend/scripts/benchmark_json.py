@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: 公司目錄 (/companies/catalog) 的 JSON 序列化成本
+
+比較:
+- default: FastAPI 預設流程 (response_model 驗證 + jsonable_encoder + json.dumps)
+- fast:    FastJSONResponse (原始列直接以 orjson 編碼)
+- http:    經由 ASGI 的完整請求 (每次清空回應快取)
+
+用法:
+    uv run python scripts/benchmark_json.py --repeat 50
+    uv run python scripts/benchmark_json.py --scale 10   # 目錄列複製 10 倍，模擬更大的資料量
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add the project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlmodel import Session
+
+from app.api.cache import cache
+from app.api.responses import FastJSONResponse
+from app.db.session import engine
+from app.main import app
+from app.schemas.company import CompanyCatalogItem
+from app.services.company_service import CompanyService
+
+
+def timeit(func, repeat: int) -> List[float]:
+    func()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: List[float], size: int):
+    print(
+        f"{name:<8} median {statistics.median(timings):8.2f} ms"
+        f"  p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.2f} ms"
+        f"  body {size / 1024:8.1f} KiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=30, help="每種方式的執行次數")
+    parser.add_argument("--scale", type=int, default=1, help="將目錄列複製 N 倍")
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        rows = CompanyService().get_catalog(session) * args.scale
+    print(f"Catalog rows: {len(rows)}")
+
+    adapter = TypeAdapter(List[CompanyCatalogItem])
+
+    def default_path() -> bytes:
+        validated = adapter.validate_python(rows)
+        return JSONResponse(jsonable_encoder(adapter.dump_python(validated, mode="json"))).body
+
+    def fast_path() -> bytes:
+        return FastJSONResponse(rows).body
+
+    assert adapter.validate_json(default_path()) == adapter.validate_json(fast_path())
+
+    report("default", timeit(default_path, args.repeat), len(default_path()))
+    report("fast", timeit(fast_path, args.repeat), len(fast_path()))
+
+    if args.scale == 1:
+        with TestClient(app) as client:
+            def http_path() -> bytes:
+                cache.clear()
+                return client.get("/api/v1/companies/catalog").content
+
+            report("http", timeit(http_path, args.repeat), len(http_path()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Check: CLI / API 的 import 時間 (python -X importtime)
+
+CLI 的每個指令 (以及 sync_all 的每個子行程) 與每個 uvicorn worker 啟動時都要付出
+import 成本。此檢查以獨立的子行程量測:
+- 進入點的累計 import 時間 (取多次中最快的一次) 是否超過預算
+- 進入點是否載入了不該在啟動時載入的重量級模組 (e.g. CLI 的 pandas / SQLModel)
+
+違反時以 exit code 1 結束，可直接接在 CI 或 pre-commit。
+
+用法:
+    uv run python scripts/check_import_time.py
+    uv run python scripts/check_import_time.py --repeat 5 --top 15
+    uv run python scripts/check_import_time.py --budget-scale 2   # 較慢的機器放寬時間預算
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# 進入點 -> (時間預算 ms, 啟動時不應載入的模組)
+TARGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    # CLI 只載入 typer；服務於各指令內 import
+    "app.cli.main": (200, ("sqlmodel", "sqlalchemy", "pandas", "numpy", "httpx", "requests", "bs4")),
+    # API 需要 FastAPI / SQLModel，但 pandas / numpy 只在 materialize 或第一次讀取分析快照時載入
+    "app.main": (1500, ("pandas", "numpy", "httpx", "requests", "bs4")),
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure(module: str) -> List[ImportRecord]:
+    """於新的直譯器中 import module，回傳 -X importtime 的每一行"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    records = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def check(module: str, budget_ms: float, forbidden: Tuple[str, ...], repeat: int, top: int) -> List[str]:
+    runs = [measure(module) for _ in range(repeat)]
+    best = min(runs, key=lambda records: records[-1].cumulative_us)
+    total_ms = best[-1].cumulative_us / 1000
+    loaded = {record.module for record in best}
+
+    print(f"\n{module}: {total_ms:.1f} ms (best of {repeat}, budget {budget_ms:.0f} ms, {len(loaded)} modules)")
+    # 進入點直接 import 的模組中累計時間最高者 (子模組列在進入點之前，往前取到上一個頂層 import 為止；
+    # 不含直譯器啟動時 site / .pth 的 import)
+    subtree = []
+    for record in reversed(best[:-1]):
+        if record.depth == 0:
+            break
+        subtree.append(record)
+    direct = sorted((r for r in subtree if r.depth == 1), key=lambda r: r.cumulative_us, reverse=True)
+    for record in direct[:top]:
+        print(f"  {record.cumulative_us / 1000:8.1f} ms  {record.module}")
+
+    errors = []
+    if total_ms > budget_ms:
+        errors.append(f"{module}: import took {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    for name in forbidden:
+        if name in loaded:
+            errors.append(f"{module}: imports {name} at startup")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CLI / API import time")
+    parser.add_argument("--repeat", type=int, default=3, help="每個進入點量測次數 (取最快)")
+    parser.add_argument("--top", type=int, default=10, help="列出累計時間最高的直接 import 數")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="時間預算倍率")
+    args = parser.parse_args()
+
+    errors = []
+    for module, (budget_ms, forbidden) in TARGETS.items():
+        errors.extend(check(module, budget_ms * args.budget_scale, forbidden, args.repeat, args.top))
+
+    if errors:
+        print("\nFAILED")
+        for error in errors:
+            print(f"  - {error}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,617 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data: 產生具真實分布的假資料並大量寫入 SQLite，用於放大資料量的效能測試
+
+不連線 MOPS / 勞動部 / 環境部，以固定亂數種子產生:
+- Company: 產業別依 Zipf 分布 (少數產業佔多數公司)、市場別、員工數 (對數常態)、資本額、上市日期
+- Violation: 總筆數依 --scale 放大，分配給公司的權重為 員工數^0.7 × Pareto，
+  少數公司有上千筆違規、多數公司只有零到數筆；處分日期為 107-114 年 (逐年增加)，
+  資料來源、法條、主管機關、罰鍰 (對數常態) 依來源而異，部分為分公司名稱
+- EnvironmentalViolation: 權重另乘上產業的污染係數 (金融業幾乎沒有)
+- EmployeeBenefit / NonManagerSalary / WelfarePolicy: 上市 (sii) / 上櫃 (otc) 公司 107-114 年
+  (上市前的年度不揭露)，薪資依產業倍率與逐年成長，同產業平均以實際產生的資料計算
+- SalaryAdjustment: 113 年起才有的揭露
+
+寫入採 SQLAlchemy Core 的 executemany (不經 ORM，因此 violation_stats 等衍生資料不會即時更新)，
+完成後執行 `materialize --full` 重建統計、搜尋索引、排行榜、profile 等衍生資料。
+
+scale 1 約為目前正式資料量 (2,000 家公司、24,000 筆違規、12,000 筆環境違規)，
+10 / 100 倍用來量測排行榜、yearly-summary、匯出在資料成長後的表現。
+
+用法:
+    uv run python scripts/generate_synthetic_data.py --scale 10
+    uv run python scripts/generate_synthetic_data.py --scale 100 --db data/synthetic_x100.db --force
+    uv run python scripts/generate_synthetic_data.py --scale 1 --seed 7 --no-materialize
+    DATABASE_URL=sqlite:///data/synthetic_x10.db ARCHIVE_DATABASE_URL=sqlite:///data/synthetic_x10_archive.db \
+        ANALYTICS_SNAPSHOT_DIR=data/synthetic_x10_analytics uv run uvicorn app.main:app
+    (完成時會印出此資料庫對應的完整環境變數)
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+# Add the project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, insert
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401  (註冊所有資料表)
+from app.models import (
+    Company,
+    EmployeeBenefit,
+    EnvironmentalViolation,
+    NonManagerSalary,
+    SalaryAdjustment,
+    Violation,
+    WelfarePolicy,
+)
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# scale 1 的資料量
+BASE_COMPANIES = 2000
+VIOLATIONS_PER_COMPANY = 12
+ENV_VIOLATIONS_PER_COMPANY = 6
+
+# 民國年範圍 (MOPS 揭露與違規處分日期)
+FIRST_YEAR = 107
+LAST_YEAR = 114
+SALARY_ADJUSTMENT_FIRST_YEAR = 113
+
+BATCH_SIZE = 20000
+
+SOURCE_MODELS = [Company, Violation, EnvironmentalViolation, EmployeeBenefit, NonManagerSalary, WelfarePolicy, SalaryAdjustment]
+
+# 產業: (名稱, 薪資倍率, EPS 平均, 污染係數)；依公司數由多到少排列，實際比例為 Zipf 分布
+INDUSTRIES = [
+    ("半導體業", 1.6, 6.0, 1.5),
+    ("電子零組件業", 1.2, 3.5, 1.2),
+    ("電腦及週邊設備業", 1.25, 4.0, 0.6),
+    ("光電業", 1.1, 1.5, 1.2),
+    ("其他電子業", 1.1, 2.5, 0.8),
+    ("通信網路業", 1.2, 2.8, 0.5),
+    ("生技醫療業", 1.0, 1.2, 0.8),
+    ("電機機械", 1.0, 2.5, 1.0),
+    ("金融保險業", 1.4, 2.2, 0.0),
+    ("建材營造業", 1.0, 3.0, 0.7),
+    ("電子通路業", 1.05, 3.0, 0.2),
+    ("資訊服務業", 1.15, 3.0, 0.1),
+    ("化學工業", 1.0, 2.0, 2.5),
+    ("塑膠工業", 1.05, 2.0, 2.5),
+    ("紡織纖維", 0.85, 1.5, 1.8),
+    ("食品工業", 0.85, 2.0, 1.5),
+    ("鋼鐵工業", 0.95, 1.5, 3.0),
+    ("航運業", 1.3, 4.0, 0.6),
+    ("汽車工業", 0.95, 2.0, 1.2),
+    ("貿易百貨業", 0.85, 2.5, 0.2),
+    ("觀光餐旅", 0.75, 1.0, 0.4),
+    ("綠能環保", 0.95, 1.5, 1.5),
+    ("橡膠工業", 0.9, 2.0, 2.0),
+    ("數位雲端", 1.15, 2.5, 0.1),
+    ("油電燃氣業", 1.1, 2.0, 2.5),
+    ("水泥工業", 1.0, 2.5, 3.0),
+    ("居家生活", 0.85, 2.0, 0.5),
+    ("運動休閒", 0.9, 3.0, 0.6),
+    ("造紙工業", 0.9, 1.5, 2.5),
+    ("玻璃陶瓷", 0.9, 1.0, 2.0),
+    ("電器電纜", 0.95, 1.5, 1.2),
+    ("其他業", 0.9, 1.5, 0.8),
+]
+INDUSTRY_ZIPF_EXPONENT = 1.1
+
+# 市場別: (Company.market_type, MOPS market_type, 比例)
+MARKETS = [("Listed", "sii", 0.45), ("OTC", "otc", 0.37), ("Emerging", None, 0.13), ("Public", None, 0.05)]
+
+# 違規資料來源: 來源 -> (比例, 罰鍰中位數, [(法條, 內容)])
+VIOLATION_SOURCES = {
+    "LaborStandards": (0.42, 50000, [
+        ("勞動基準法第24條", "延長工時未依規定給付加班費"),
+        ("勞動基準法第32條", "延長工作時間超過法定上限"),
+        ("勞動基準法第30條", "未置備勞工出勤紀錄"),
+        ("勞動基準法第38條", "未依規定給予特別休假"),
+        ("勞動基準法第22條", "工資未全額直接給付勞工"),
+    ]),
+    "OccupationalSafety": (0.18, 60000, [
+        ("職業安全衛生法第6條", "未採取必要之安全衛生設備及措施"),
+        ("職業安全衛生法第23條", "未訂定職業安全衛生管理計畫"),
+    ]),
+    "Insurance": (0.14, 30000, [("勞工保險條例第72條", "未依規定為勞工辦理投保手續")]),
+    "Pension": (0.14, 20000, [
+        ("勞工退休金條例第6條", "未依規定提繳勞工退休金"),
+        ("勞工退休金條例第18條", "未依規定申報提繳"),
+    ]),
+    "EmploymentService": (0.04, 300000, [("就業服務法第5條", "就業歧視")]),
+    "GenderEquality": (0.05, 100000, [("性別平等工作法第13條", "未訂定性騷擾防治措施")]),
+    "MiddleAged": (0.01, 300000, [("中高齡者及高齡者就業促進法第12條", "年齡歧視")]),
+    "Union": (0.02, 100000, [("工會法第35條", "不當勞動行為")]),
+}
+
+# 地方主管機關與比例 (約依人口)
+AUTHORITIES = [
+    ("新北市", 0.17), ("臺北市", 0.14), ("桃園市", 0.12), ("臺中市", 0.15), ("臺南市", 0.09),
+    ("高雄市", 0.12), ("新竹縣", 0.04), ("新竹市", 0.03), ("彰化縣", 0.05), ("苗栗縣", 0.02),
+    ("雲林縣", 0.02), ("屏東縣", 0.02), ("嘉義縣", 0.01), ("宜蘭縣", 0.01), ("基隆市", 0.01),
+]
+
+# 環境違規: 污染類別 -> (比例, 違反法令)
+ENV_VIOLATION_TYPES = {
+    "空氣污染": (0.35, "空氣污染防制法第24條"),
+    "水污染": (0.25, "水污染防治法第18條"),
+    "廢棄物": (0.25, "廢棄物清理法第28條"),
+    "噪音": (0.08, "噪音管制法第9條"),
+    "毒性及關注化學物質": (0.04, "毒性及關注化學物質管理法第12條"),
+    "土壤及地下水污染": (0.03, "土壤及地下水污染整治法第8條"),
+}
+
+NAME_CHARS = list("台新華聯宏鴻元大中興國泰富邦永豐統一長榮陽明友達光寶廣達仁寶緯創和碩英業南亞東亞太平洋精誠瑞昱聯發創意智原信義遠傳世紀")
+NAME_SUFFIXES = ["科技", "電子", "實業", "工業", "企業", "精密", "材料", "國際", "投資", "開發"]
+SURNAMES = list("陳林黃張李王吳劉蔡楊許鄭謝洪郭邱曾廖賴徐")
+GIVEN_CHARS = list("志明俊傑建宏家豪冠宇承恩美玲淑芬雅婷怡君宗翰")
+ALLOCATION_METHODS = ["調整薪資", "分派酬勞", "調整薪資及分派酬勞"]
+
+
+def _weights(values: Iterable[float]) -> np.ndarray:
+    weights = np.asarray(list(values), dtype=float)
+    return weights / weights.sum()
+
+
+def _dates(days: np.ndarray, start: date) -> List[date]:
+    base = start.toordinal()
+    return [date.fromordinal(base + int(d)) for d in days]
+
+
+def _skewed_weights(rng: np.random.Generator, size: np.ndarray, alpha: float) -> np.ndarray:
+    """公司被分配到紀錄的權重: 規模 × Pareto (長尾)"""
+    weights = size * (rng.pareto(alpha, len(size)) + 1)
+    return weights / weights.sum()
+
+
+def _batches(rows: Iterable[dict], size: int = BATCH_SIZE) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_insert(connection, model, rows: Iterable[dict]) -> int:
+    count = 0
+    for batch in _batches(rows):
+        connection.execute(insert(model), batch)
+        count += len(batch)
+    return count
+
+
+# ========== Company ==========
+def generate_companies(rng: np.random.Generator, count: int) -> Dict[str, np.ndarray]:
+    """產生公司屬性 (欄位 -> 陣列)，之後的資料表依此產生"""
+    code_pool = np.arange(1101, 10000)
+    if count <= len(code_pool):
+        codes = np.sort(rng.choice(code_pool, count, replace=False))
+    else:
+        codes = np.concatenate([code_pool, np.arange(10000, 10000 + count - len(code_pool))])
+
+    industry_ranks = np.arange(1, len(INDUSTRIES) + 1)
+    industries = rng.choice(len(INDUSTRIES), count, p=_weights(1 / industry_ranks ** INDUSTRY_ZIPF_EXPONENT))
+    markets = rng.choice(len(MARKETS), count, p=_weights(m[2] for m in MARKETS))
+    employees = np.clip(rng.lognormal(np.log(400), 1.3, count), 10, 200000).astype(int)
+    established = rng.integers(date(1950, 1, 1).toordinal(), date(2015, 1, 1).toordinal(), count)
+    listed = np.minimum(established + rng.integers(5 * 365, 30 * 365, count), date(2025, 6, 30).toordinal())
+
+    # 公司名稱: 兩到三字品牌 + 後綴，重複時加長品牌
+    names, abbreviations, seen = [], [], set()
+    for i in range(count):
+        length = 2
+        while True:
+            brand = "".join(rng.choice(NAME_CHARS, length))
+            name = f"{brand}{NAME_SUFFIXES[rng.integers(len(NAME_SUFFIXES))]}股份有限公司"
+            if name not in seen:
+                break
+            length += 1
+        seen.add(name)
+        names.append(name)
+        abbreviations.append(brand)
+
+    return {
+        "code": codes.astype(str),
+        "name": np.array(names, dtype=object),
+        "abbreviation": np.array(abbreviations, dtype=object),
+        "industry": industries,
+        "market": markets,
+        "employees": employees,
+        "tax_id": (rng.choice(90000000, count, replace=False) + 10000000).astype(str),
+        "established": established,
+        "listed": listed,
+        "capital": (employees * rng.lognormal(np.log(3e6), 0.8, count)).astype(np.int64),
+    }
+
+
+def _person_names(rng: np.random.Generator, count: int) -> List[str]:
+    surnames = rng.choice(SURNAMES, count)
+    given = rng.choice(GIVEN_CHARS, (count, 2))
+    return [surnames[i] + given[i, 0] + given[i, 1] for i in range(count)]
+
+
+def company_rows(rng: np.random.Generator, companies: Dict[str, np.ndarray], now: datetime) -> Iterator[dict]:
+    count = len(companies["code"])
+    chairmen, managers = _person_names(rng, count), _person_names(rng, count)
+    for i in range(count):
+        code = companies["code"][i]
+        yield {
+            "code": code,
+            "name": companies["name"][i],
+            "abbreviation": companies["abbreviation"][i],
+            "market_type": MARKETS[companies["market"][i]][0],
+            "industry": INDUSTRIES[companies["industry"][i]][0],
+            "tax_id": companies["tax_id"][i],
+            "chairman": str(chairmen[i]),
+            "manager": str(managers[i]),
+            "establishment_date": date.fromordinal(int(companies["established"][i])),
+            "listing_date": date.fromordinal(int(companies["listed"][i])),
+            "capital": int(companies["capital"][i]),
+            "address": f"{AUTHORITIES[i % len(AUTHORITIES)][0]}某區某路{i % 300 + 1}號",
+            "website": f"https://www.example-{code}.com.tw",
+            "email": f"ir@example-{code}.com.tw",
+            "stakeholder_url": None,
+            "governance_url": None,
+            "last_updated": now,
+        }
+
+
+# ========== Violation ==========
+def _penalty_days(rng: np.random.Generator, count: int) -> Tuple[np.ndarray, date]:
+    """107-114 年的處分日期 (密度隨時間增加)"""
+    start, end = date(FIRST_YEAR + 1911, 1, 1), date(LAST_YEAR + 1911, 12, 31)
+    span = end.toordinal() - start.toordinal()
+    return (rng.random(count) ** 0.75 * span).astype(int), start
+
+
+def violation_rows(rng: np.random.Generator, companies: Dict[str, np.ndarray], count: int, now: datetime) -> Iterator[dict]:
+    owners = rng.choice(len(companies["code"]), count, p=_skewed_weights(rng, companies["employees"] ** 0.7, 1.3))
+    sources = list(VIOLATION_SOURCES)
+    source_index = rng.choice(len(sources), count, p=_weights(VIOLATION_SOURCES[s][0] for s in sources))
+    authority_index = rng.choice(len(AUTHORITIES), count, p=_weights(a[1] for a in AUTHORITIES))
+    days, start = _penalty_days(rng, count)
+    penalty_dates = _dates(days, start)
+    announcement_dates = _dates(days + rng.integers(7, 60, count), start)
+    fine_scale = rng.lognormal(0, 0.8, count)
+    article_pick = rng.integers(0, 1 << 30, count)
+    branch = rng.random(count) < 0.15
+    unpaid = rng.random(count) < 0.05
+
+    for i in range(count):
+        owner = owners[i]
+        source = sources[source_index[i]]
+        _, median_fine, articles = VIOLATION_SOURCES[source]
+        law_article, content = articles[article_pick[i] % len(articles)]
+        authority = AUTHORITIES[authority_index[i]][0]
+        name = companies["name"][owner]
+        yield {
+            "company_code": companies["code"][owner],
+            "company_name": f"{name}{authority}分公司" if branch[i] else name,
+            "data_source": source,
+            "authority": f"{authority}政府",
+            "penalty_date": penalty_dates[i],
+            "announcement_date": announcement_dates[i],
+            "disposition_no": f"{authority}勞字第{1000000000 + i}號",
+            "law_article": law_article,
+            "violation_content": content,
+            "fine_amount": 0 if unpaid[i] else max(1000, int(round(median_fine * fine_scale[i], -3))),
+            "created_at": now,
+            "last_updated": now,
+        }
+
+
+def environmental_violation_rows(
+    rng: np.random.Generator, companies: Dict[str, np.ndarray], count: int, now: datetime,
+) -> Iterator[dict]:
+    pollution = np.array([industry[3] for industry in INDUSTRIES])[companies["industry"]]
+    owners = rng.choice(len(companies["code"]), count, p=_skewed_weights(rng, companies["employees"] ** 0.5 * pollution, 1.2))
+    types = list(ENV_VIOLATION_TYPES)
+    type_index = rng.choice(len(types), count, p=_weights(ENV_VIOLATION_TYPES[t][0] for t in types))
+    authority_index = rng.choice(len(AUTHORITIES), count, p=_weights(a[1] for a in AUTHORITIES))
+    days, start = _penalty_days(rng, count)
+    violation_dates = _dates(np.maximum(days - rng.integers(10, 90, count), 0), start)
+    penalty_dates = _dates(days, start)
+    limit_dates = _dates(days + rng.integers(30, 180, count), start)
+    fines = np.maximum(1000, np.round(rng.lognormal(np.log(100000), 1.0, count), -3)).astype(np.int64)
+    flags = rng.random((count, 4))
+
+    for i in range(count):
+        owner = owners[i]
+        violation_type = types[type_index[i]]
+        authority = AUTHORITIES[authority_index[i]][0]
+        address = f"{authority}某區工業路{i % 500 + 1}號"
+        appeal = bool(flags[i, 1] < 0.08)
+        yield {
+            "company_code": companies["code"][owner],
+            "tax_id": companies["tax_id"][owner],
+            "control_no": f"E{int(owner):07d}",
+            "disposition_no": f"{authority}環字第{2000000000 + i}號",
+            "company_name": f"{companies['name'][owner]}{authority}廠",
+            "company_address": address,
+            "violation_address": address,
+            "violation_type": violation_type,
+            "violation_date": violation_dates[i],
+            "violation_reason": f"違反{violation_type}管制規定",
+            "law_article": ENV_VIOLATION_TYPES[violation_type][1],
+            "authority": authority,
+            "penalty_date": penalty_dates[i],
+            "fine_amount": int(fines[i]),
+            "penalty_reason": ENV_VIOLATION_TYPES[violation_type][1],
+            "limit_date": limit_dates[i],
+            "is_improved": bool(flags[i, 0] < 0.85),
+            "is_appeal": appeal,
+            "appeal_result": ("駁回" if flags[i, 3] < 0.7 else "撤銷") if appeal else None,
+            "is_paid": bool(flags[i, 2] < 0.9),
+            "illegal_profit": None,
+            "other_penalty": "環境講習" if flags[i, 3] < 0.3 else None,
+            "is_serious": bool(flags[i, 3] < 0.03),
+            "created_at": now,
+            "last_updated": now,
+        }
+
+
+# ========== MOPS ==========
+def _group_mean(keys: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """每列所屬群組 (產業 × 市場) 的平均值"""
+    sums = np.bincount(keys, weights=values)
+    counts = np.bincount(keys)
+    return (sums / np.maximum(counts, 1))[keys]
+
+
+def insert_mops(connection, rng: np.random.Generator, companies: Dict[str, np.ndarray], now: datetime) -> Dict[str, int]:
+    """逐年產生 MOPS 四張表 (只保留前一年度的狀態，記憶體用量與年數無關)"""
+    disclosing = np.array([MARKETS[m][1] is not None for m in companies["market"]])
+    index = np.flatnonzero(disclosing)
+    industry = companies["industry"][index]
+    salary_factor = np.array([i[1] for i in INDUSTRIES])[industry]
+    eps_mean = np.array([i[2] for i in INDUSTRIES])[industry]
+    market = companies["market"][index]
+    group = industry * len(MARKETS) + market
+    listing_year = np.array([date.fromordinal(int(d)).year - 1911 for d in companies["listed"][index]])
+
+    employees = companies["employees"][index].astype(float)
+    salary = rng.lognormal(np.log(700), 0.35, len(index)) * salary_factor  # 仟元
+    eps = rng.normal(eps_mean, 2.5)
+    counts = {model.__tablename__: 0 for model in (EmployeeBenefit, NonManagerSalary, WelfarePolicy, SalaryAdjustment)}
+
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        previous_salary, previous_eps = salary, eps
+        employees = np.maximum(10, employees * rng.normal(1.03, 0.08, len(index)))
+        salary = previous_salary * rng.normal(1.03, 0.05, len(index))
+        eps = previous_eps * 0.6 + rng.normal(eps_mean, 2.5) * 0.4
+        active = np.flatnonzero(listing_year <= year)
+        if not len(active):
+            continue
+
+        avg_salary = np.round(salary).astype(int)
+        avg_benefit = np.round(salary * rng.normal(1.18, 0.05, len(index))).astype(int)
+        non_manager_avg = np.round(salary * 0.92).astype(int)
+        non_manager_median = np.round(non_manager_avg * rng.normal(0.82, 0.05, len(index))).astype(int)
+        previous_non_manager = np.round(previous_salary * 0.92).astype(int)
+        headcount = np.round(employees).astype(int)
+        eps_rounded = np.round(eps, 2)
+
+        industry_benefit = _group_mean(group[active], avg_benefit[active])
+        industry_salary = _group_mean(group[active], avg_salary[active])
+        industry_eps = _group_mean(group[active], eps_rounded[active])
+        industry_nm_avg = _group_mean(group[active], non_manager_avg[active])
+        industry_nm_median = _group_mean(group[active], non_manager_median[active])
+
+        def base(i: int) -> dict:
+            company = index[i]
+            return {
+                "company_code": companies["code"][company],
+                "raw_company_code": companies["code"][company],
+                "company_name": companies["name"][company],
+                "year": year,
+                "market_type": MARKETS[market[i]][1],
+                "created_at": now,
+                "last_updated": now,
+            }
+
+        def employee_benefits():
+            for k, i in enumerate(active):
+                yield {
+                    **base(i),
+                    "industry": INDUSTRIES[industry[i]][0],
+                    "company_category": None,
+                    "employee_benefit_expense": int(avg_benefit[i] * headcount[i]),
+                    "employee_salary_expense": int(avg_salary[i] * headcount[i]),
+                    "employee_count": int(headcount[i]),
+                    "avg_benefit_per_employee": int(avg_benefit[i]),
+                    "avg_salary_current_year": int(avg_salary[i]),
+                    "avg_salary_previous_year": int(round(previous_salary[i])),
+                    "salary_change_rate": round((salary[i] / previous_salary[i] - 1) * 100, 2),
+                    "eps": float(eps_rounded[i]),
+                    "industry_avg_benefit": int(industry_benefit[k]),
+                    "industry_avg_salary": int(industry_salary[k]),
+                    "industry_avg_eps": round(float(industry_eps[k]), 2),
+                }
+
+        def non_manager_salaries():
+            for k, i in enumerate(active):
+                median_previous = int(round(previous_non_manager[i] * 0.82))
+                yield {
+                    **base(i),
+                    "industry": INDUSTRIES[industry[i]][0],
+                    "employee_count": int(headcount[i] * 0.97),
+                    "total_salary": int(non_manager_avg[i] * headcount[i] * 0.97),
+                    "avg_salary": int(non_manager_avg[i]),
+                    "median_salary": int(non_manager_median[i]),
+                    "avg_salary_previous_year": int(previous_non_manager[i]),
+                    "avg_salary_change": round((non_manager_avg[i] / max(previous_non_manager[i], 1) - 1) * 100, 2),
+                    "median_salary_previous_year": median_previous,
+                    "median_salary_change": round((non_manager_median[i] / max(median_previous, 1) - 1) * 100, 2),
+                    "industry_avg_salary": int(industry_nm_avg[k]),
+                    "industry_median_salary": int(industry_nm_median[k]),
+                    "eps": float(eps_rounded[i]),
+                    "industry_avg_eps": round(float(industry_eps[k]), 2),
+                    "is_avg_salary_under_500k": "Y" if non_manager_avg[i] < 500 else "N",
+                    "is_better_eps_lower_salary": "Y" if eps_rounded[i] > industry_eps[k] and non_manager_avg[i] < industry_nm_avg[k] else "N",
+                    "is_eps_growth_salary_decrease": "Y" if eps[i] > previous_eps[i] and non_manager_avg[i] < previous_non_manager[i] else "N",
+                    "performance_salary_relation_note": None,
+                    "improvement_measures_note": None,
+                }
+
+        def welfare_policies():
+            increases = np.clip(rng.normal(3.0, 1.5, (len(active), 4)), 0, None)
+            for k, i in enumerate(active):
+                planned, actual, non_manager, manager = increases[k]
+                bachelor = int(round(36000 * salary_factor[i], -2))
+                yield {
+                    **base(i),
+                    "planned_salary_increase": f"{planned:.2f}",
+                    "planned_salary_increase_note": None,
+                    "actual_salary_increase": f"{actual:.2f}",
+                    "actual_salary_increase_note": None,
+                    "non_manager_salary_increase": f"{non_manager:.2f}",
+                    "non_manager_salary_increase_note": None,
+                    "manager_salary_increase": f"{manager:.2f}",
+                    "manager_salary_increase_note": None,
+                    "entry_salary_master": str(int(round(bachelor * 1.2, -2))),
+                    "entry_salary_bachelor": str(bachelor),
+                    "entry_salary_highschool": str(int(round(bachelor * 0.85, -2))),
+                    "entry_salary_note": None,
+                }
+
+        def salary_adjustments():
+            ratios = rng.choice([0.5, 1.0, 2.0], len(active))
+            methods = rng.integers(len(ALLOCATION_METHODS), size=len(active))
+            for k, i in enumerate(active):
+                company = index[i]
+                profit = int(eps[i] * companies["capital"][company] / 10)
+                basic_count = int(headcount[i] * 0.5)
+                yield {
+                    **base(i),
+                    "industry": INDUSTRIES[industry[i]][0],
+                    "pretax_net_profit": profit,
+                    "allocation_ratio_min": f"{ratios[k]:g}%",
+                    "allocation_ratio_max": f"{ratios[k] * 5:g}%",
+                    "board_resolution_date": f"{year + 1}/03/{k % 28 + 1:02d}",
+                    "actual_allocation_ratio": f"{ratios[k]:g}%" if profit > 0 else None,
+                    "basic_employee_definition": "月薪5萬元以下之非經理人員工",
+                    "basic_employee_count": basic_count,
+                    "total_allocation_amount": int(profit * ratios[k] / 100) if profit > 0 else None,
+                    "allocation_method": ALLOCATION_METHODS[methods[k]] if profit > 0 else None,
+                    "difference_amount": None,
+                    "difference_reason": None,
+                    "difference_handling": None,
+                    "note": None,
+                }
+
+        counts[EmployeeBenefit.__tablename__] += bulk_insert(connection, EmployeeBenefit, employee_benefits())
+        counts[NonManagerSalary.__tablename__] += bulk_insert(connection, NonManagerSalary, non_manager_salaries())
+        counts[WelfarePolicy.__tablename__] += bulk_insert(connection, WelfarePolicy, welfare_policies())
+        if year >= SALARY_ADJUSTMENT_FIRST_YEAR:
+            counts[SalaryAdjustment.__tablename__] += bulk_insert(connection, SalaryAdjustment, salary_adjustments())
+    return counts
+
+
+def generate(database: Path, scale: float, seed: int) -> Dict[str, int]:
+    """建立資料庫並寫入 scale 倍的合成資料，回傳各表筆數"""
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    company_count = max(1, int(BASE_COMPANIES * scale))
+
+    engine = create_engine(f"sqlite:///{database}")
+    SQLModel.metadata.create_all(engine)
+    counts: Dict[str, int] = {}
+    with engine.begin() as connection:
+        # 一次性的大量寫入: 不需要 crash safety
+        connection.exec_driver_sql("PRAGMA synchronous = OFF")
+        connection.exec_driver_sql("PRAGMA journal_mode = MEMORY")
+
+        # 寫入期間先移除索引，完成後一次重建 (比逐筆維護索引快約一倍)
+        indexes = [index for model in SOURCE_MODELS for index in model.__table__.indexes]
+        for index in indexes:
+            index.drop(connection)
+
+        companies = generate_companies(rng, company_count)
+        for model, rows in [
+            (Company, company_rows(rng, companies, now)),
+            (Violation, violation_rows(rng, companies, company_count * VIOLATIONS_PER_COMPANY, now)),
+            (EnvironmentalViolation, environmental_violation_rows(rng, companies, company_count * ENV_VIOLATIONS_PER_COMPANY, now)),
+        ]:
+            started = time.perf_counter()
+            counts[model.__table__.name] = bulk_insert(connection, model, rows)
+            print(f"  {model.__table__.name}: {counts[model.__table__.name]} rows ({time.perf_counter() - started:.1f}s)")
+
+        started = time.perf_counter()
+        mops_counts = insert_mops(connection, rng, companies, now)
+        counts.update(mops_counts)
+        for table, count in mops_counts.items():
+            print(f"  {table}: {count} rows")
+        print(f"  (MOPS tables: {time.perf_counter() - started:.1f}s)")
+
+        started = time.perf_counter()
+        for index in indexes:
+            index.create(connection)
+        print(f"  indexes: {len(indexes)} ({time.perf_counter() - started:.1f}s)")
+    engine.dispose()
+    return counts
+
+
+def database_env(database: Path) -> Dict[str, str]:
+    """合成資料庫對應的設定 (materialize 與 API 必須使用相同的 archive 與分析快照目錄)"""
+    directory = database.resolve().parent
+    return {
+        "DATABASE_URL": f"sqlite:///{database.resolve()}",
+        "ARCHIVE_DATABASE_URL": f"sqlite:///{directory / f'{database.stem}_archive.db'}",
+        "ANALYTICS_SNAPSHOT_DIR": str(directory / f"{database.stem}_analytics"),
+    }
+
+
+def materialize(database: Path):
+    """以子行程執行 `materialize --full` (DATABASE_URL 指向合成資料庫)"""
+    subprocess.run(
+        [sys.executable, "-m", "app.cli.main", "materialize", "--full"],
+        cwd=BACKEND_DIR, env={**os.environ, **database_env(database)}, check=True, stdout=subprocess.DEVNULL,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1, help="資料量倍數 (1 約為目前正式資料量)")
+    parser.add_argument("--db", type=Path, default=None, help="輸出資料庫 (預設 data/synthetic_x{scale}.db)")
+    parser.add_argument("--seed", type=int, default=42, help="亂數種子 (相同種子產生相同資料)")
+    parser.add_argument("--force", action="store_true", help="覆寫已存在的資料庫")
+    parser.add_argument("--no-materialize", action="store_true", help="不重建衍生資料")
+    args = parser.parse_args()
+
+    database = args.db or BACKEND_DIR / "data" / f"synthetic_x{args.scale:g}.db"
+    if database.exists():
+        if not args.force:
+            print(f"{database} already exists (use --force to overwrite)")
+            sys.exit(1)
+        database.unlink()
+    database.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"Generating x{args.scale:g} synthetic data into {database} (seed {args.seed})")
+    started = time.perf_counter()
+    generate(database, args.scale, args.seed)
+    print(f"Loaded in {time.perf_counter() - started:.1f}s")
+
+    if not args.no_materialize:
+        print("Running materialize --full ...")
+        started = time.perf_counter()
+        materialize(database)
+        print(f"Materialized in {time.perf_counter() - started:.1f}s")
+    env_line = " ".join(f"{key}={value}" for key, value in database_env(database).items())
+    print(f"Done. Start the API with:\n  {env_line} uv run uvicorn app.main:app")
+
+
+if __name__ == "__main__":
+    main()
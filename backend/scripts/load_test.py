@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Load Test: 以固定併發量對本機 API 施壓，回報延遲分布與 throughput，並檢查 SLO
+
+流程:
+1. seed: 以 SQLite backup 複製來源資料庫 (預設 DATABASE_URL)，將公司與其所有紀錄
+   (違規、環境違規、MOPS 四張表) 複製成 --scale 倍 (公司代號加上 -R{n} 後綴)，
+   再執行 `materialize --full` 重建衍生資料 (統計彙總、搜尋索引、排行榜、profile ...)；
+   --synthetic 改以 scripts/generate_synthetic_data.py 產生 --scale 倍的合成資料
+2. 以 uvicorn 子行程啟動 API (--workers)；或以 --url 指向已啟動的服務
+3. --concurrency 個 client 依權重隨機送出請求 (catalog / profile / leaderboards /
+   yearly-summary include=all / 篩選後的違規列表)，先熱身 --warmup 秒再量測 --duration 秒
+4. 回報各情境與整體的 p50 / p95 / p99、throughput、錯誤率；違反 SLO 預算時 exit code 1
+
+熱門端點有回應快取，預設量測的是實際流量下的表現；--cold 為每個請求加上隨機參數
+繞過回應快取，量測未快取時的成本。client 與 server 在同一台機器，請留意 CPU 競爭。
+
+用法:
+    uv run python scripts/load_test.py --scale 10 --concurrency 32 --duration 30
+    uv run python scripts/load_test.py --scale 100 --skip-seed --workers 4 --cold
+    uv run python scripts/load_test.py --synthetic --scale 10 --seed 1
+    uv run python scripts/load_test.py --url http://localhost:8000 --slo-file slo.json --report result.json
+
+SLO 檔 (JSON，未列出的項目使用預設值):
+    {"scenarios": {"profile": {"p95": 80, "p99": 200}}, "max_error_rate": 0.001, "min_rps": 300}
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+# Add the project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.models import (
+    Company,
+    EmployeeBenefit,
+    EnvironmentalViolation,
+    NonManagerSalary,
+    SalaryAdjustment,
+    Violation,
+    WelfarePolicy,
+)
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# 以公司為單位複製的原始資料表 (衍生資料由 materialize --full 重建)
+SOURCE_MODELS = [Company, Violation, EnvironmentalViolation, EmployeeBenefit, NonManagerSalary, WelfarePolicy, SalaryAdjustment]
+# 複製時加上後綴的欄位
+CODE_COLUMNS = {"code", "company_code", "raw_company_code"}
+NAME_COLUMNS = {"name", "company_name"}
+
+DEFAULT_SLOS = {
+    # 情境 -> 延遲預算 (ms)
+    "scenarios": {
+        "catalog": {"p95": 100, "p99": 250},
+        "profile": {"p95": 50, "p99": 150},
+        "leaderboards": {"p95": 100, "p99": 250},
+        "yearly_summary": {"p95": 300, "p99": 600},
+        "violations": {"p95": 150, "p99": 400},
+    },
+    "max_error_rate": 0.01,
+    "min_rps": 0,
+}
+
+
+# ========== Seed ==========
+def sqlite_path(database_url: str) -> Path:
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Only SQLite databases are supported: {database_url}")
+    return Path(database_url[len(prefix):])
+
+
+def seed_database(source: Path, target: Path, scale: int):
+    """複製來源資料庫並將原始資料放大為 scale 倍，再重建衍生資料"""
+    if not source.exists():
+        raise FileNotFoundError(f"Source database not found: {source}")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.exists():
+        target.unlink()
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+    connection = sqlite3.connect(target)
+    with connection:
+        for model in SOURCE_MODELS:
+            table = model.__table__
+            columns = [column.name for column in table.columns if column.name != "id"]
+            original_rows = connection.execute(f"SELECT max(rowid) FROM {table.name}").fetchone()[0] or 0
+            for replica in range(1, scale):
+                expressions = []
+                for name in columns:
+                    if name in CODE_COLUMNS:
+                        expressions.append(f"{name} || '-R{replica}'")
+                    elif name in NAME_COLUMNS:
+                        expressions.append(f"{name} || ' R{replica}'")
+                    else:
+                        expressions.append(name)
+                connection.execute(
+                    f"INSERT INTO {table.name} ({', '.join(columns)}) "
+                    f"SELECT {', '.join(expressions)} FROM {table.name} WHERE rowid <= ?",
+                    (original_rows,),
+                )
+            count = connection.execute(f"SELECT count(*) FROM {table.name}").fetchone()[0]
+            print(f"  {table.name}: {original_rows} -> {count} rows")
+    connection.close()
+
+    print("  materialize --full ...")
+    subprocess.run(
+        [sys.executable, "-m", "app.cli.main", "materialize", "--full"],
+        cwd=BACKEND_DIR, env=_server_env(target), check=True, stdout=subprocess.DEVNULL,
+    )
+
+
+# ========== Server ==========
+def _server_env(database: Path) -> Dict[str, str]:
+    return {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database.resolve()}",
+        "ANALYTICS_SNAPSHOT_DIR": str(database.resolve().parent / f"{database.stem}_analytics"),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database: Path, workers: int, timeout: float = 60) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR, env=_server_env(database),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not become ready in time")
+
+
+# ========== Scenarios ==========
+class Fixtures(NamedTuple):
+    company_codes: List[str]
+    roc_years: List[int]
+    ce_years: List[int]
+    data_sources: List[str]
+
+
+def load_fixtures(database: Path) -> Fixtures:
+    """由資料庫取得請求參數的取值範圍"""
+    with sqlite3.connect(database) as connection:
+        def values(sql: str) -> list:
+            return [row[0] for row in connection.execute(sql) if row[0] is not None]
+
+        return Fixtures(
+            company_codes=values("SELECT company_code FROM company_profile"),
+            roc_years=values(f"SELECT DISTINCT year FROM {NonManagerSalary.__table__.name}"),
+            ce_years=[int(y) for y in values(f"SELECT DISTINCT strftime('%Y', penalty_date) FROM {Violation.__table__.name}")],
+            data_sources=values(f"SELECT DISTINCT data_source FROM {Violation.__table__.name}"),
+        )
+
+
+class Scenario(NamedTuple):
+    name: str
+    weight: int
+    build: Callable[[Fixtures, random.Random], str]
+
+
+def _violations_url(fixtures: Fixtures, rng: random.Random) -> str:
+    params = [f"page={rng.randint(1, 5)}", "size=20"]
+    if fixtures.ce_years and rng.random() < 0.7:
+        params.append(f"year={rng.choice(fixtures.ce_years)}")
+    if fixtures.data_sources and rng.random() < 0.5:
+        params.append(f"data_source={rng.choice(fixtures.data_sources)}")
+    if rng.random() < 0.3:
+        params.append("sort=-fine_amount")
+    return "/api/v1/violations/?" + "&".join(params)
+
+
+SCENARIOS = [
+    Scenario("catalog", 15, lambda f, rng: "/api/v1/companies/catalog"),
+    Scenario("profile", 25, lambda f, rng: f"/api/v1/companies/{rng.choice(f.company_codes)}/profile"),
+    Scenario("leaderboards", 15, lambda f, rng: "/api/v1/leaderboards"),
+    Scenario(
+        "yearly_summary", 15,
+        lambda f, rng: f"/api/v1/companies/yearly-summary?include=all&year={rng.choice(f.roc_years)}&page={rng.randint(1, 5)}&size=50",
+    ),
+    Scenario("violations", 30, _violations_url),
+]
+
+
+# ========== Load ==========
+class Result(NamedTuple):
+    latencies: Dict[str, List[float]]  # 情境 -> 延遲 (ms)
+    errors: Dict[str, int]
+    duration: float
+
+
+async def run_load(
+    base_url: str,
+    fixtures: Fixtures,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    cold: bool,
+    seed: Optional[int],
+) -> Result:
+    rng = random.Random(seed)
+    names = [scenario.name for scenario in SCENARIOS]
+    weights = [scenario.weight for scenario in SCENARIOS]
+    builders = {scenario.name: scenario.build for scenario in SCENARIOS}
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+        measure_from = time.perf_counter() + warmup
+        deadline = measure_from + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                url = builders[name](fixtures, rng)
+                if cold:
+                    url += ("&" if "?" in url else "?") + f"_lt={rng.getrandbits(32)}"
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if started < measure_from:
+                    continue
+                latencies[name].append((time.perf_counter() - started) * 1000)
+                if not ok:
+                    errors[name] += 1
+
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return Result(latencies, errors, duration)
+
+
+# ========== Report ==========
+def percentile(sorted_values: List[float], q: float) -> float:
+    """nearest-rank 百分位數"""
+    if not sorted_values:
+        return float("nan")
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(result: Result) -> dict:
+    def stats(values: List[float], errors: int) -> dict:
+        ordered = sorted(values)
+        return {
+            "requests": len(ordered),
+            "errors": errors,
+            "rps": round(len(ordered) / result.duration, 1),
+            "p50": round(percentile(ordered, 50), 2),
+            "p95": round(percentile(ordered, 95), 2),
+            "p99": round(percentile(ordered, 99), 2),
+        }
+
+    scenarios = {
+        scenario.name: stats(result.latencies.get(scenario.name, []), result.errors.get(scenario.name, 0))
+        for scenario in SCENARIOS
+    }
+    overall = stats(
+        [v for values in result.latencies.values() for v in values], sum(result.errors.values())
+    )
+    return {"scenarios": scenarios, "overall": overall}
+
+
+def print_summary(summary: dict):
+    header = f"{'scenario':<16}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in [*summary["scenarios"].items(), ("overall", summary["overall"])]:
+        print(
+            f"{name:<16}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10.1f}"
+            f"{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}"
+        )
+
+
+def load_slos(path: Optional[Path]) -> dict:
+    slos = json.loads(json.dumps(DEFAULT_SLOS))
+    if path is not None:
+        overrides = json.loads(path.read_text(encoding="utf-8"))
+        for name, budget in overrides.get("scenarios", {}).items():
+            slos["scenarios"].setdefault(name, {}).update(budget)
+        for key in ("max_error_rate", "min_rps"):
+            if key in overrides:
+                slos[key] = overrides[key]
+    return slos
+
+
+def check_slos(summary: dict, slos: dict) -> List[str]:
+    violations = []
+    for name, budget in slos["scenarios"].items():
+        stats = summary["scenarios"].get(name)
+        if not stats or not stats["requests"]:
+            continue
+        for metric, limit in budget.items():
+            if stats[metric] > limit:
+                violations.append(f"{name} {metric} {stats[metric]:.2f} ms > {limit} ms")
+    overall = summary["overall"]
+    if overall["requests"]:
+        error_rate = overall["errors"] / overall["requests"]
+        if error_rate > slos["max_error_rate"]:
+            violations.append(f"error rate {error_rate:.2%} > {slos['max_error_rate']:.2%}")
+    if overall["rps"] < slos["min_rps"]:
+        violations.append(f"throughput {overall['rps']:.1f} rps < {slos['min_rps']} rps")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", type=Path, default=None, help="來源資料庫 (預設為 DATABASE_URL)")
+    parser.add_argument("--scale", type=int, default=1, help="原始資料放大倍數 (1 / 10 / 100)")
+    parser.add_argument("--db", type=Path, default=None, help="壓測用資料庫 (預設 data/loadtest_x{scale}.db)")
+    parser.add_argument("--skip-seed", action="store_true", help="沿用已存在的壓測資料庫")
+    parser.add_argument("--synthetic", action="store_true", help="以合成資料 seed (不需要來源資料庫)")
+    parser.add_argument("--url", default=None, help="對已啟動的服務施壓 (不 seed、不啟動 server)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker 數")
+    parser.add_argument("--concurrency", type=int, default=16, help="同時進行的請求數")
+    parser.add_argument("--duration", type=float, default=30, help="量測秒數")
+    parser.add_argument("--warmup", type=float, default=5, help="熱身秒數 (不列入統計)")
+    parser.add_argument("--cold", action="store_true", help="每個請求加上隨機參數以繞過回應快取")
+    parser.add_argument("--seed", type=int, default=None, help="亂數種子 (重現相同的請求序列)")
+    parser.add_argument("--slo-file", type=Path, default=None, help="SLO 預算 (JSON)")
+    parser.add_argument("--report", type=Path, default=None, help="將結果寫入 JSON")
+    args = parser.parse_args()
+
+    database = args.db or BACKEND_DIR / "data" / f"loadtest_x{args.scale}.db"
+    process = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        if args.skip_seed and database.exists():
+            pass
+        elif args.synthetic:
+            command = [
+                sys.executable, str(Path(__file__).parent / "generate_synthetic_data.py"),
+                "--scale", str(args.scale), "--db", str(database), "--force",
+            ]
+            if args.seed is not None:
+                command += ["--seed", str(args.seed)]
+            subprocess.run(command, cwd=BACKEND_DIR, check=True)
+        else:
+            source = args.source or sqlite_path(settings.DATABASE_URL)
+            print(f"Seeding {database} from {source} (x{args.scale})")
+            seed_database(source, database, args.scale)
+        print(f"Starting API ({args.workers} worker(s)) on {database}")
+        process, base_url = start_server(database, args.workers)
+
+    try:
+        fixtures = load_fixtures(database)
+        if not fixtures.company_codes:
+            raise RuntimeError("No company profiles in the database (run `materialize`)")
+        print(
+            f"Load: {args.concurrency} concurrent, {args.warmup:.0f}s warm-up + {args.duration:.0f}s"
+            f"{' (cold: bypassing response cache)' if args.cold else ''}"
+        )
+        result = asyncio.run(run_load(
+            base_url, fixtures, args.concurrency, args.duration, args.warmup, args.cold, args.seed,
+        ))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    summary = summarize(result)
+    print()
+    print_summary(summary)
+
+    slos = load_slos(args.slo_file)
+    violations = check_slos(summary, slos)
+    if args.report:
+        args.report.write_text(json.dumps({
+            "scale": args.scale, "workers": args.workers, "concurrency": args.concurrency,
+            "cold": args.cold, "summary": summary, "slos": slos, "violations": violations,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if violations:
+        print("\nSLO FAILED")
+        for violation in violations:
+            print(f"  - {violation}")
+        sys.exit(1)
+    print("\nSLO OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import type {
   CompanyProfile, 
   PaginatedResponse, 
   Violation, 
+  EnvironmentalViolation,
   YearlySummaryResponse,
   EmployeeBenefit,
   NonManagerSalary,
@@ -43,6 +44,9 @@ export const useApi = () => {
       getCompanies: (params?: any) => api<PaginatedResponse<Company>>('/api/v1/companies/', { params }),
       getCompanyCatalog: () => api<CompanyCatalog[]>('/api/v1/companies/catalog'),
       getCompanyProfile: (companyCode: string) => api<CompanyProfile>(`/api/v1/companies/${companyCode}/profile`),
+      // profile 只附最新 N 筆違規，其餘以游標分頁取得 (params: size, cursor)
+      getCompanyViolations: (companyCode: string, params?: any) => api<PaginatedResponse<Violation>>(`/api/v1/companies/${companyCode}/violations`, { params }),
+      getCompanyEnvironmentalViolations: (companyCode: string, params?: any) => api<PaginatedResponse<EnvironmentalViolation>>(`/api/v1/companies/${companyCode}/environmental-violations`, { params }),
       getYearlySummary: (params?: any) => api<YearlySummaryResponse>('/api/v1/companies/yearly-summary', { params }),
       getYearlySummaryIndex: async () => {
         // Fetch yearly summary without filters to get available years from backend
@@ -3,6 +3,7 @@ import type {
   CompanyProfile, 
   PaginatedResponse, 
   Violation, 
+  EnvironmentalViolation,
   YearlySummaryResponse,
   YearlySummaryIndex,
   EmployeeBenefit,
@@ -81,6 +82,21 @@ export const useStaticApi = () => {
     }
   }
 
+  // Client-side cursor pagination helper (cursor = offset)
+  const cursorPage = <T>(items: T[], params?: any): PaginatedResponse<T> => {
+    const size = Number(params?.size) || 20
+    const start = Number(params?.cursor) || 0
+    const end = start + size
+    return {
+      items: items.slice(start, end),
+      total: null,
+      page: 1,
+      size,
+      total_pages: null,
+      next_cursor: end < items.length ? String(end) : null
+    }
+  }
+
   return {
     // Companies (Client-side Search from Catalog)
     getCompanies: async (params?: any) => {
@@ -180,6 +196,17 @@ export const useStaticApi = () => {
     
     getCompanyProfile: (companyCode: string) => 
       fetchJson<CompanyProfile>(`companies/${companyCode}.json`),
+
+    // 靜態 profile 已含完整違規紀錄，以 offset 作為游標模擬動態 API 的分頁
+    getCompanyViolations: async (companyCode: string, params?: any) => {
+      const profile = await fetchJson<CompanyProfile>(`companies/${companyCode}.json`)
+      return cursorPage<Violation>(profile.violations, params)
+    },
+
+    getCompanyEnvironmentalViolations: async (companyCode: string, params?: any) => {
+      const profile = await fetchJson<CompanyProfile>(`companies/${companyCode}.json`)
+      return cursorPage<EnvironmentalViolation>(profile.environmental_violations, params)
+    },
       
     // Yearly Summaries Index (available years)
     getYearlySummaryIndex: async (): Promise<YearlySummaryIndex> => {
@@ -148,10 +148,25 @@ export interface EnvironmentalViolation {
   last_updated: string;
 }
 
+export interface ViolationYearStat {
+  year: number | null; // 西元年，無處分日期為 null
+  count: number;
+  fine: number;
+}
+
+export interface ViolationSummary {
+  total_count: number;
+  total_fine: number;
+  by_year: ViolationYearStat[];
+}
+
 export interface CompanyProfile {
   company: Company;
+  // 只包含最新 N 筆，完整紀錄請用分頁子資源；次數與罰鍰請用 *_summary
   violations: Violation[];
+  violation_summary: ViolationSummary;
   environmental_violations: EnvironmentalViolation[];
+  environmental_violation_summary: ViolationSummary;
   employee_benefits: EmployeeBenefit[];
   non_manager_salaries: NonManagerSalary[];
   welfare_policies: WelfarePolicy[];
@@ -208,10 +223,11 @@ export interface YearlySummaryResponse {
 
 export interface PaginatedResponse<T> {
   items: T[];
-  total: number;
+  total: number | null; // include_total=false 時為 null
   page: number;
   size: number;
-  total_pages: number;
+  total_pages: number | null;
+  next_cursor?: string | null; // 下一頁游標 (最後一頁為 null)
 }
 
 export interface CategorySyncStatus {